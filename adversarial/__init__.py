@@ -1,5 +1,3 @@
-from adversarial.alpha_beta_pruning import alphabeta
-
 tree = {
     "A": ["B", "C", "D"],
     "B": [9, "F"],
@@ -11,5 +9,10 @@ tree = {
 }
 
 if __name__ == '__main__':
+    # Imported here so that importing the package stays cheap
+    from adversarial.alpha_beta_pruning import alpha_beta
+
+    # Integer leaves are their own static evaluation
+    leaves = {child: child for children in tree.values() for child in children if isinstance(child, int)}
     print("Alpha-Beta Pruning")
-    print("Optimal value:", alphabeta(tree, 'A'))
\ No newline at end of file
+    print("Optimal value:", alpha_beta(tree, leaves, 'A', 3))
@@ -1,85 +1,279 @@
+from array import array
+from heapq import heappop, heappush
+from itertools import count
 from math import inf
 
-import matplotlib.pyplot as plt
-import networkx as nx
-
+from core.plotting import render_tree
+from core.problem import Problem
+from core.results import SearchResult, SearchStats
 from graphs import graph7
+from graphs.compiled import CompiledGraph
 from graphs.heuristics import heuristics7
 from graphs.path_costs import g_costs7
+from informed.bounded_suboptimal import weighted_a_star
+from informed.memory_bounded import sma_star
 
 
-def get_hierarchy_pos(graph, root, width=1., vert_gap=1.):
-    """Compute hierarchical positions for nodes: top-down tree."""
-    def _hierarchy_pos(G, node, left, right, depth=0, pos=None):
-        if pos is None:
-            pos = {}
-        pos[node] = ((left + right) / 2, -depth * vert_gap)
-        children = list(G.neighbors(node))
-        if len(children) > 0:
-            dx = (right - left) / len(children)
-            for i, child in enumerate(children):
-                pos = _hierarchy_pos(G, child, left + i*dx, left + (i+1)*dx, depth+1, pos)
-        return pos
-    return _hierarchy_pos(graph, root, 0, width)
-
-def a_star(graph, heuristics, start, goal, g_costs, drawing=None):
+class SearchObserver:
+    """
+    Hooks called by `a_star` while it runs. All methods are no-ops; override the
+    ones you need. A* never builds anything for visualization unless an observer
+    is passed.
     """
-    A* search with edge costs and automatic tree visualization.
+
+    def on_expand(self, node, g, h):
+        """``node`` was popped from the open set with path cost ``g``."""
+
+    def on_skip(self, node):
+        """An edge into the closed ``node`` did not improve its cost."""
+
+    def on_goal(self, path, cost):
+        """The goal was reached through ``path`` with total ``cost``."""
+
+
+class TreeDrawing(SearchObserver):
+    """
+    Observer that draws the search tree once the goal is reached.
     Node labels: f = g + h
+
+    Args:
+        graph: The adjacency list being searched.
+        root: Root of the drawing; defaults to the first node of ``graph``.
+        output: Image file to write (``.png``, ``.svg``, ...) instead of
+            showing a window, which also works without a display.
+        max_nodes: Node budget of the drawing; larger trees are collapsed
+            (see `core.plotting.collapse_tree`) but keep the solution path.
+    """
+
+    def __init__(self, graph, root=None, output=None, max_nodes=2000):
+        self.graph = graph
+        self.root = root if root is not None else next(iter(graph))
+        self.output = output
+        self.max_nodes = max_nodes
+        self.colors = {}
+        self.labels = {}
+
+    def on_expand(self, node, g, h):
+        self.colors[node] = "#a1d99b"
+        self.labels[node] = f"{node}\nf={g}+{h}\n={g+h}"
+
+    def on_skip(self, node):
+        self.colors[node] = "red"
+        self.labels[node] = f"{node}\nSKIPPED"
+
+    def on_goal(self, path, cost):
+        render_tree(self.graph, self.root, self.output, self.colors, self.labels,
+                    title=f"A* Search Goal Reached! Path: {path}", max_nodes=self.max_nodes, keep=path)
+
+
+def a_star(graph, heuristics, start, goal, g_costs=None, observer=None, budget=None, max_nodes=None, weight=None):
     """
-    import heapq
-
-    if drawing is None:
-        drawing = nx.DiGraph()
-        for parent, children in graph.items():
-            for child in children:
-                drawing.add_edge(parent, child)
-        for n in drawing.nodes:
-            drawing.nodes[n]["color"] = "#d3d3d3"
-            drawing.nodes[n]["label"] = n
-
-    open_set = [(heuristics[start], 0, start, [start])]  # (f, g, node, path)
+    A* search with edge costs on a binary heap.
+
+    - Stale heap entries are skipped on pop (lazy deletion) instead of re-sorting.
+    - Paths are rebuilt from parent pointers only once the goal is popped.
+    - With a consistent heuristic every node is expanded at most once; a closed
+      node is reopened only if a cheaper path to it turns up (inconsistent h).
+
+    Args:
+        graph: Adjacency list mapping a node -> list of neighbors, a `CompiledGraph`,
+            or a `core.problem.Problem`, whose successors, step costs, heuristic and
+            goal test replace ``heuristics``, ``g_costs`` and ``goal``.
+        heuristics: Dict mapping a node -> h(n). For a `CompiledGraph` this may be
+            None to use the heuristic values compiled into it.
+        start: Starting node; for a problem, None starts from its initial state.
+        goal: Target node.
+        g_costs: Dict mapping (u, v) -> edge cost; missing edges cost 1. Ignored for a
+            `CompiledGraph`, which carries its own edge costs.
+        observer: Optional `SearchObserver`, e.g. `TreeDrawing(graph)` to plot the tree.
+        budget: Optional `core.results.Budget`; the search stops with "CUTOFF" when spent.
+        max_nodes: Optional memory cap; runs `informed.memory_bounded.sma_star` with
+            at most this many nodes in memory (``observer`` is not called), and the
+            result's ``optimal`` says whether the cap cut off a path.
+        weight: Optional suboptimality bound w > 1; runs
+            `informed.bounded_suboptimal.weighted_a_star` (``observer`` is not
+            called), which returns a path within w of optimal, with the proven
+            factor in the result's ``bound``.
+
+    Returns:
+        SearchResult: status "SUCCESS" with the path and its cost, "FAIL" if the
+        goal is unreachable, or "CUTOFF".
+    """
+    if weight is not None:
+        return weighted_a_star(graph, heuristics, start, goal, weight, g_costs, budget)
+    if max_nodes is not None:
+        return sma_star(graph, heuristics, start, goal, max_nodes, g_costs, budget)
+    if isinstance(graph, CompiledGraph):
+        return _a_star_compiled(graph, heuristics, start, goal, observer, budget)
+    if isinstance(graph, Problem):
+        return _a_star_problem(graph, graph.initial if start is None else start, observer, budget)
+
+    stats = SearchStats()
+    g_costs = g_costs or {}
+    h = heuristics.get
+    counter = count()
+    open_set = [(h(start, 0), 0, next(counter), start)]  # (f, g, tie-breaker, node)
+    best_g = {start: 0}
+    parent = {start: None}
     closed_set = set()
+    stats.pushes = stats.peak_frontier = 1
 
     while open_set:
-        # Always pick node with smallest f
-        open_set.sort(key=lambda x: x[0])
-        f, g, current, path = open_set.pop(0)
+        f, g, _, current = heappop(open_set)
+        if current in closed_set or g > best_g[current]:
+            stats.stale_pops += 1
+            continue  # stale entry
 
-        # Update node label with f = g + h
-        h = heuristics.get(current, 0)
-        drawing.nodes[current]["color"] = "#a1d99b"
-        drawing.nodes[current]["label"] = f"{current}\nf={g}+{h}\n={g+h}"
+        if observer is not None: observer.on_expand(current, g, h(current, 0))
 
         if current == goal:
-            # Draw tree
-            pos = get_hierarchy_pos(drawing, list(graph.keys())[0])
-            colors = [drawing.nodes[n]["color"] for n in drawing.nodes]
-            labels = {n: drawing.nodes[n]["label"] for n in drawing.nodes}
-
-            plt.figure(figsize=(10, 6))
-            nx.draw(drawing, pos, node_color=colors, with_labels=False, arrows=True, node_size=1500)
-            nx.draw_networkx_labels(drawing, pos, labels, font_size=10, font_weight="bold")
-            plt.title(f"A* Search Goal Reached! Path: {path}", fontsize=14)
-            plt.axis("off")
-            plt.show()
-            return path, g
+            path = []
+            node = current
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            path.reverse()
+            if observer is not None: observer.on_goal(path, g)
+            return SearchResult.success(path, g, stats)
+        if budget is not None and budget.exceeded(stats.expansions):
+            return SearchResult.failure(stats, status="CUTOFF")
 
         closed_set.add(current)
+        stats.expansions += 1
 
         for neighbor in graph.get(current, []):
-            edge_cost = g_costs.get((current, neighbor), 1)  # default cost 1 if not defined
-            tentative_g = g + edge_cost
-            if neighbor in closed_set:
-                drawing.nodes[neighbor]["color"] = "red"
-                drawing.nodes[neighbor]["label"] = f"{neighbor}\nSKIPPED"
+            tentative_g = g + g_costs.get((current, neighbor), 1)  # default cost 1 if not defined
+            if tentative_g >= best_g.get(neighbor, inf):
+                if observer is not None and neighbor in closed_set: observer.on_skip(neighbor)
+                continue
+            closed_set.discard(neighbor)
+            best_g[neighbor] = tentative_g
+            parent[neighbor] = current
+            heappush(open_set, (tentative_g + h(neighbor, 0), tentative_g, next(counter), neighbor))
+            stats.pushes += 1
+        if len(open_set) > stats.peak_frontier:
+            stats.peak_frontier = len(open_set)
+
+    return SearchResult.failure(stats)
+
+
+def _a_star_compiled(graph, heuristics, start, goal, observer, budget):
+    stats = SearchStats()
+    labels = graph.labels
+    if heuristics is None:
+        h = graph.h
+    else:
+        h = array('d', (heuristics.get(label, 0) for label in labels))
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    n = graph.num_nodes
+    if start not in graph or goal not in graph:
+        return SearchResult.failure(stats)  # as on a dict graph, which has no edges to an unknown node
+    s, t = graph.id_of(start), graph.id_of(goal)
+
+    best_g = array('d', [inf]) * n
+    parent = array('q', [-1]) * n
+    closed = bytearray(n)
+    best_g[s] = 0.0
+    open_set = [(h[s], 0.0, s)]  # ids break ties, so no counter is needed
+    expansions, pushes, stale_pops, peak = 0, 1, 0, 1
+    status = "FAIL"
+
+    while open_set:
+        f, g, current = heappop(open_set)
+        if closed[current] or g > best_g[current]:
+            stale_pops += 1
+            continue
+
+        if observer is not None: observer.on_expand(labels[current], g, h[current])
+
+        if current == t:
+            path = [current]
+            while current != s:
+                current = parent[current]
+                path.append(current)
+            path.reverse()
+            path = graph.path_labels(path)
+            if observer is not None: observer.on_goal(path, g)
+            stats.expansions, stats.pushes, stats.stale_pops, stats.peak_frontier = expansions, pushes, stale_pops, peak
+            return SearchResult.success(path, g, stats)
+        if budget is not None and budget.exceeded(expansions):
+            status = "CUTOFF"
+            break
+
+        closed[current] = 1
+        expansions += 1
+
+        for e in range(offsets[current], offsets[current + 1]):
+            neighbor = targets[e]
+            tentative_g = g + weights[e]
+            if tentative_g >= best_g[neighbor]:
+                if observer is not None and closed[neighbor]: observer.on_skip(labels[neighbor])
+                continue
+            closed[neighbor] = 0
+            best_g[neighbor] = tentative_g
+            parent[neighbor] = current
+            heappush(open_set, (tentative_g + h[neighbor], tentative_g, neighbor))
+            pushes += 1
+        if len(open_set) > peak:
+            peak = len(open_set)
+
+    stats.expansions, stats.pushes, stats.stale_pops, stats.peak_frontier = expansions, pushes, stale_pops, peak
+    return SearchResult.failure(stats, status=status)
+
+def _a_star_problem(problem, start, observer, budget):
+    stats = SearchStats()
+    h, is_goal, successors = problem.heuristic, problem.is_goal, problem.successors
+    counter = count()
+    # (f, h, tie-breaker, g, state): on equal f the state nearer the goal goes first
+    h_start = h(start)
+    open_set = [(h_start, h_start, next(counter), 0, start)]
+    best_g = {start: 0}
+    parent = {start: None}
+    closed_set = set()
+    stats.pushes = stats.peak_frontier = 1
+
+    while open_set:
+        f, h_current, _, g, current = heappop(open_set)
+        if current in closed_set or g > best_g[current]:
+            stats.stale_pops += 1
+            continue
+
+        if observer is not None: observer.on_expand(current, g, h_current)
+
+        if is_goal(current):
+            path = []
+            node = current
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            path.reverse()
+            if observer is not None: observer.on_goal(path, g)
+            return SearchResult.success(path, g, stats)
+        if budget is not None and budget.exceeded(stats.expansions):
+            return SearchResult.failure(stats, status="CUTOFF")
+
+        closed_set.add(current)
+        stats.expansions += 1
+
+        for neighbor, cost in successors(current):
+            tentative_g = g + cost
+            if tentative_g >= best_g.get(neighbor, inf):
+                if observer is not None and neighbor in closed_set: observer.on_skip(neighbor)
                 continue
-            heapq.heappush(open_set, (tentative_g + heuristics.get(neighbor, 0), tentative_g, neighbor, path + [neighbor]))
+            closed_set.discard(neighbor)
+            best_g[neighbor] = tentative_g
+            parent[neighbor] = current
+            h_neighbor = h(neighbor)
+            heappush(open_set, (tentative_g + h_neighbor, h_neighbor, next(counter), tentative_g, neighbor))
+            stats.pushes += 1
+        if len(open_set) > stats.peak_frontier:
+            stats.peak_frontier = len(open_set)
 
-    return None, inf
+    return SearchResult.failure(stats)
 
 
 if __name__ == '__main__':
-    path, cost = a_star(graph7, heuristics7, 'S', 'M', g_costs7)
-    print("Path:", path)
-    print("Cost:", cost)
+    result = a_star(graph7, heuristics7, 'S', 'M', g_costs7, observer=TreeDrawing(graph7))
+    print("Path:", result.path)
+    print("Cost:", result.cost)
+    print("Stats:", result.stats)
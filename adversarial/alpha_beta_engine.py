@@ -0,0 +1,245 @@
+from math import inf
+
+from graphs.heuristics import heuristics9
+from graphs.path_costs import graph9
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table.
+
+    Entries live in ``capacity`` slots addressed by ``hash(key) % capacity``, so
+    memory is bounded however large the game tree is. On a collision the slot is
+    overwritten when it belongs to the same position, to an earlier search
+    (older generation), or when the new entry was searched at least as deep
+    (depth-preferred replacement).
+
+    Each entry stores (key, depth, value, flag, best move, generation) where flag is
+    EXACT, LOWER (value is a lower bound, fail-high) or UPPER (fail-low).
+    """
+    __slots__ = ("capacity", "slots", "generation", "stores", "overwrites")
+
+    def __init__(self, capacity=1 << 16):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.generation = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        """Age existing entries so they are replaced before entries of the current search."""
+        self.generation += 1
+
+    def probe(self, key):
+        entry = self.slots[hash(key) % self.capacity]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, value, flag, move):
+        index = hash(key) % self.capacity
+        old = self.slots[index]
+        if old is not None and old[0] != key:
+            if old[5] == self.generation and old[1] > depth:
+                return
+            self.overwrites += 1
+        self.slots[index] = (key, depth, value, flag, move, self.generation)
+        self.stores += 1
+
+    def clear(self):
+        self.slots = [None] * self.capacity
+
+
+class AlphaBetaReport:
+    """Outcome of `AlphaBetaEngine.search` with the counters needed to compare configurations."""
+    __slots__ = ("value", "best_move", "principal_variation", "depth", "nodes", "interior_nodes",
+                 "cutoffs", "first_move_cutoffs", "tt_hits", "iterations")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @property
+    def cutoff_rate(self):
+        """Share of interior nodes where a beta/alpha cutoff pruned the remaining children."""
+        return self.cutoffs / self.interior_nodes if self.interior_nodes else 0.0
+
+    @property
+    def first_move_cutoff_rate(self):
+        """Share of cutoffs produced by the first child searched; near 1.0 means good move ordering."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def __repr__(self):
+        return (f"AlphaBetaReport(value={self.value}, best_move={self.best_move!r}, depth={self.depth}, "
+                f"nodes={self.nodes}, cutoff_rate={self.cutoff_rate:.2f}, "
+                f"first_move_cutoff_rate={self.first_move_cutoff_rate:.2f}, tt_hits={self.tt_hits})")
+
+
+class AlphaBetaEngine:
+    """
+    Alpha-beta search with a transposition table, iterative deepening and move ordering.
+
+    Uses the same inputs as `alpha_beta`: a game tree mapping a node -> list of
+    children and a dict of static evaluations for leaves and depth-limited nodes.
+    Positions reached through different move orders share one table entry, and
+    children are tried in the order: table move (best move of the previous
+    iteration), killer moves for the ply, then by history score, then the
+    original list order.
+
+    With ``transpositions``, ``killers`` and ``history`` all off and
+    ``iterative=False`` it searches exactly like `alpha_beta`, which makes it the
+    baseline for measuring the gain.
+    """
+
+    def __init__(self, graph, heuristics, tt_size=1 << 16, transpositions=True, killers=True, history=True):
+        self.graph = graph
+        self.heuristics = heuristics
+        self.table = TranspositionTable(tt_size) if transpositions else None
+        self.use_killers = killers
+        self.use_history = history
+        self.killers = {}   # ply -> [most recent killer, previous killer]
+        self.history = {}   # move -> accumulated depth^2 of the cutoffs it produced
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.nodes = 0
+        self.interior_nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_hits = 0
+
+    def search(self, root, max_depth, maximizing=True, iterative=True):
+        """
+        Search ``root`` to ``max_depth`` plies.
+
+        With ``iterative`` the depths 1, 2, ..., max_depth are searched in turn,
+        each one ordering its moves from the table filled by the one before.
+
+        Returns:
+            AlphaBetaReport: minimax value, best root move, principal variation and
+            the node/cutoff/table counters summed over all iterations; ``iterations``
+            holds (depth, value, nodes) for each one.
+        """
+        self._reset_counters()
+        if self.table is not None:
+            self.table.new_search()
+        self.killers.clear()
+
+        iterations = []
+        value, best_move = None, None
+        for depth in (range(1, max_depth + 1) if iterative else (max_depth,)):
+            nodes_before = self.nodes
+            value, best_move = self._search(root, depth, -inf, inf, maximizing, 0)
+            iterations.append((depth, value, self.nodes - nodes_before))
+
+        return AlphaBetaReport(
+            value=value, best_move=best_move, principal_variation=self._principal_variation(root, maximizing),
+            depth=max_depth, nodes=self.nodes, interior_nodes=self.interior_nodes, cutoffs=self.cutoffs,
+            first_move_cutoffs=self.first_move_cutoffs, tt_hits=self.tt_hits, iterations=iterations)
+
+    def _search(self, node, depth, alpha, beta, maximizing, ply):
+        self.nodes += 1
+        children = self.graph.get(node, [])
+        if depth == 0 or not children:
+            return self.heuristics.get(node, 0), None
+
+        key = (node, maximizing)
+        table_move = None
+        if self.table is not None:
+            entry = self.table.probe(key)
+            if entry is not None:
+                table_move = entry[4]
+                if entry[1] >= depth:
+                    self.tt_hits += 1
+                    value, flag = entry[2], entry[3]
+                    if flag == EXACT:
+                        return value, table_move
+                    if flag == LOWER:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value, table_move
+
+        self.interior_nodes += 1
+        alpha_orig, beta_orig = alpha, beta
+        best_value, best_move = (-inf if maximizing else inf), None
+
+        for i, child in enumerate(self._order(children, table_move, ply)):
+            value, _ = self._search(child, depth - 1, alpha, beta, not maximizing, ply + 1)
+            if maximizing:
+                if value > best_value:
+                    best_value, best_move = value, child
+                alpha = max(alpha, value)
+            else:
+                if value < best_value:
+                    best_value, best_move = value, child
+                beta = min(beta, value)
+            if alpha >= beta:
+                self._record_cutoff(child, depth, ply, i)
+                break
+
+        if self.table is not None:
+            if best_value <= alpha_orig:
+                flag = UPPER
+            elif best_value >= beta_orig:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.table.store(key, depth, best_value, flag, best_move)
+        return best_value, best_move
+
+    def _order(self, children, table_move, ply):
+        killers = self.killers.get(ply, ()) if self.use_killers else ()
+        history = self.history if self.use_history else None
+        if table_move is None and not killers and not history:
+            return children
+
+        def priority(child):
+            if child == table_move:
+                return 0, 0
+            if child in killers:
+                return 1, killers.index(child)
+            return 2, -history.get(child, 0) if history is not None else 0
+
+        # sorted() is stable, so ties keep the original list order
+        return sorted(children, key=priority)
+
+    def _record_cutoff(self, move, depth, ply, index):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if self.use_killers:
+            slot = self.killers.setdefault(ply, [])
+            if move not in slot:
+                slot.insert(0, move)
+                del slot[2:]
+        if self.use_history:
+            self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def _principal_variation(self, root, maximizing):
+        line = []
+        if self.table is None:
+            return line
+        node, seen = root, set()
+        while node not in seen:
+            seen.add(node)
+            entry = self.table.probe((node, maximizing))
+            if entry is None or entry[4] is None:
+                break
+            node = entry[4]
+            line.append(node)
+            maximizing = not maximizing
+        return line
+
+
+if __name__ == '__main__':
+    baseline = AlphaBetaEngine(graph9, heuristics9, transpositions=False, killers=False, history=False)
+    print("Plain alpha-beta:", baseline.search('A', 4, iterative=False))
+    engine = AlphaBetaEngine(graph9, heuristics9)
+    report = engine.search('A', 4)
+    print("Engine:          ", report)
+    print("Principal variation:", report.principal_variation)
+    print("Iterations (depth, value, nodes):", report.iterations)
@@ -1,116 +1,98 @@
 from math import inf
 
-import matplotlib.pyplot as plt
-import networkx as nx
-
+from core.plotting import render_tree
 from graphs.heuristics import heuristics9
 from graphs.path_costs import graph9
 
 
-def get_hierarchy_pos(graph, root, width=1., vert_gap=1.):
-    """
-    Compute hierarchical positions for nodes: top-down tree.
-    """
-    def _hierarchy_pos(G, node, left, right, depth=0, pos=None):
-        if pos is None:
-            pos = {}
-        pos[node] = ((left + right) / 2, -depth * vert_gap)
-        children = list(G.neighbors(node))
-        if len(children) > 0:
-            dx = (right - left) / len(children)
-            for i, child in enumerate(children):
-                pos = _hierarchy_pos(G, child, left + i*dx, left + (i+1)*dx, depth+1, pos)
-        return pos
-    return _hierarchy_pos(graph, root, 0, width)
-
-def alpha_beta(graph, heuristics, node, depth, maximizing=True, alpha=-inf, beta=inf, visited=None, drawing=None):
+def alpha_beta(graph, heuristics, node, depth, maximizing=True, alpha=-inf, beta=inf, visualize=False, workers=None,
+               max_nodes=2000):
     """
-    Alpha-Beta pruning with automatic tree visualization.
+    Alpha-Beta pruning with optional tree visualization.
+
+    ``visualize`` may be True to show the tree or an image file name (``.png``,
+    ``.svg``, ...) to write it without a display; matplotlib is only imported
+    then, and trees over ``max_nodes`` nodes are drawn collapsed. With
+    ``workers`` the search runs on a process pool (see
+    `adversarial.parallel_alpha_beta`) and returns the same value.
     Colors:
       - Blue: explored internal nodes
       - Green: evaluated leaf nodes
       - Red: pruned nodes
     """
-    # --- Initialize tree graph and visualization ---
-    if drawing is None:
-        drawing = nx.DiGraph()
+    if workers is not None:
+        if visualize:
+            raise ValueError("visualize is not supported with workers")
+        from adversarial.parallel_alpha_beta import parallel_alpha_beta
+        return parallel_alpha_beta(graph, heuristics, node, depth, maximizing, workers, alpha=alpha, beta=beta).value
 
-        # Build graph structure
-        for parent, children in graph.items():
-            for child in children:
-                drawing.add_edge(parent, child)
+    drawing = _Drawing() if visualize else None
 
-        # Default node styles
-        for n in drawing.nodes:
-            drawing.nodes[n]["color"] = "#d3d3d3"  # neutral gray
-            drawing.nodes[n]["label"] = n
+    value = _alpha_beta(graph, heuristics, node, depth, maximizing, alpha, beta, drawing)
 
-        # Track visited nodes
-        visited = set()
+    if drawing is not None:
+        render_tree(graph, node, None if visualize is True else visualize, drawing.colors, drawing.labels,
+                    title=f"Alpha-Beta Pruning Result = {value}", max_nodes=max_nodes)
 
-        # --- Run recursive search ---
-        value = alpha_beta(graph, heuristics, node, depth, maximizing, alpha, beta, visited, drawing)
+    return value
 
-        # --- After recursion, draw a tree ---
-        pos = get_hierarchy_pos(drawing, list(graph.keys())[0])
-        colors = [drawing.nodes[n]["color"] for n in drawing.nodes]
-        labels = {n: drawing.nodes[n]["label"] for n in drawing.nodes}
 
-        plt.figure(figsize=(10, 6))
-        nx.draw(drawing, pos, node_color=colors, with_labels=False, arrows=True, node_size=1500)
-        nx.draw_networkx_labels(drawing, pos, labels, font_size=10, font_weight="bold")
+class _Drawing:
+    """Colors and labels set while searching; unmarked nodes are drawn gray."""
+    __slots__ = ("colors", "labels")
 
-        plt.title(f"Alpha-Beta Pruning Result = {value}", fontsize=14)
-        plt.axis("off")
-        plt.show()
+    def __init__(self):
+        self.colors = {}
+        self.labels = {}
 
-        return value
+    def mark(self, node, color, label):
+        self.colors[node] = color
+        self.labels[node] = label
 
-    # --- Recursive Alpha-Beta pruning ---
-    visited.add(node)
 
+def _alpha_beta(graph, heuristics, node, depth, maximizing, alpha, beta, drawing):
     # Base case: depth limit or terminal node
     if depth == 0 or not graph.get(node, []):
         value = heuristics.get(node, 0)
-        drawing.nodes[node]["color"] = "#a1d99b"  # green for leaf
-        drawing.nodes[node]["label"] = f"{node}\n({value})"
+        if drawing is not None:
+            drawing.mark(node, "#a1d99b", f"{node}\n({value})")  # green for leaf
         return value
 
     if maximizing:  # MAX node
         max_value = -inf
-        for child in graph[node]:
-            value = alpha_beta(graph, heuristics, child, depth - 1, False, alpha, beta, visited, drawing)
+        for i, child in enumerate(graph[node]):
+            value = _alpha_beta(graph, heuristics, child, depth - 1, False, alpha, beta, drawing)
             max_value = max(max_value, value)
             alpha = max(alpha, value)
             if alpha >= beta:
                 # --- Pruning ---
-                for pruned_child in graph[node][graph[node].index(child) + 1:]:
-                    if drawing.has_node(pruned_child):
-                        drawing.nodes[pruned_child]["color"] = "red"
-                        drawing.nodes[pruned_child]["label"] = f"{pruned_child}"
+                if drawing is not None:
+                    _mark_pruned(drawing, graph[node][i + 1:])
                 break
-        drawing.nodes[node]["color"] = "#9ecae1"  # blue for internal (max)
-        drawing.nodes[node]["label"] = f"{max_value}\nɑ={alpha}\nʙ={beta}"
+        if drawing is not None:
+            drawing.mark(node, "#9ecae1", f"{max_value}\nɑ={alpha}\nʙ={beta}")  # blue for internal (max)
         return max_value
 
     else:   # MIN node
         min_value = inf
-        for child in graph[node]:
-            value = alpha_beta(graph, heuristics, child, depth - 1, True, alpha, beta, visited, drawing)
+        for i, child in enumerate(graph[node]):
+            value = _alpha_beta(graph, heuristics, child, depth - 1, True, alpha, beta, drawing)
             min_value = min(min_value, value)
             beta = min(beta, value)
             if alpha >= beta:
                 # --- Pruning ---
-                for pruned_child in graph[node][graph[node].index(child) + 1:]:
-                    if drawing.has_node(pruned_child):
-                        drawing.nodes[pruned_child]["color"] = "red"
-                        drawing.nodes[pruned_child]["label"] = f"{pruned_child}"
+                if drawing is not None:
+                    _mark_pruned(drawing, graph[node][i + 1:])
                 break
-        drawing.nodes[node]["color"] = "#9ecae1"  # blue for internal (min)
-        drawing.nodes[node]["label"] = f"{min_value}\nɑ={alpha}\nʙ={beta}"
+        if drawing is not None:
+            drawing.mark(node, "#9ecae1", f"{min_value}\nɑ={alpha}\nʙ={beta}")  # blue for internal (min)
         return min_value
 
 
+def _mark_pruned(drawing, pruned_children):
+    for pruned_child in pruned_children:
+        drawing.mark(pruned_child, "red", f"{pruned_child}")
+
 if __name__ == '__main__':
-    value = alpha_beta(graph9, heuristics9, 'A', 4)
+    value = alpha_beta(graph9, heuristics9, 'A', 4, visualize=True)
     print("Optimal Value:", value)
\ No newline at end of file
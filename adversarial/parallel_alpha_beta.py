@@ -0,0 +1,269 @@
+"""
+Alpha-beta on a process pool, split by the Young Brothers Wait rule.
+
+At every node above ``split_depth`` plies the first child (the "eldest
+brother") is searched serially, recursively applying the same rule, so the
+window it produces is known before anything runs in parallel. The remaining
+children are then handed to the pool as independent subtree searches. While
+they run, each improvement the parent sees is published in a shared-memory
+slot that the workers re-read every few nodes, so a sibling that finishes early
+narrows the window of the ones still running. A cutoff bumps the slot's
+generation, which makes the remaining siblings stop at their next poll.
+
+Narrowing a window never changes the minimax value, only how much is pruned,
+so the result equals `alpha_beta`. What parallelism does cost is extra nodes:
+siblings start with the window of the eldest brother alone and miss the
+cutoffs a serial search would have found; `speedup_report` measures both sides.
+"""
+import os
+import time
+from collections import namedtuple
+from math import inf
+
+from graphs.heuristics import heuristics9
+from graphs.path_costs import graph9
+
+# Nodes a worker searches between two reads of its shared window
+POLL_INTERVAL = 32
+
+# Outcome of `parallel_alpha_beta`: only what a split search can count. Unlike
+# `AlphaBetaReport` it has no cutoff or table counters.
+ParallelReport = namedtuple("ParallelReport", "value best_move depth nodes")
+
+# Per-worker state set by _init_worker, and only there: searches run from the
+# calling process get their graph as arguments, so concurrent calls stay apart
+_graph = None
+_heuristics = None
+_bounds = None
+_generations = None
+
+
+class _Aborted(Exception):
+    pass
+
+
+def _init_worker(graph, heuristics, bounds, generations):
+    global _graph, _heuristics, _bounds, _generations
+    _graph, _heuristics, _bounds, _generations = graph, heuristics, bounds, generations
+
+
+def _run_subtree(node, depth, alpha, beta, maximizing, slot, generation):
+    """Pool task: `_search_subtree` over the worker's graph and shared window."""
+    return _search_subtree(_graph, _heuristics, node, depth, alpha, beta, maximizing, slot, generation)
+
+
+def _search_subtree(graph, heuristics, node, depth, alpha, beta, maximizing, slot=None, generation=None):
+    """
+    Fail-soft alpha-beta of one subtree, counting the nodes it visits.
+
+    In a worker, the parent of ``node`` owns shared ``slot``: its best value so
+    far, which bounds every node below from beneath when the parent maximizes
+    (``maximizing`` is False here) and from above otherwise. Without a slot the
+    window is only the one passed in.
+
+    Returns:
+        (value, nodes), or (None, nodes) if the parent's generation moved on.
+    """
+    bounds, generations = _bounds, _generations
+    parent_max = not maximizing
+    shared = slot is not None
+    nodes = 0
+    bound = bounds[slot] if shared else (-inf if parent_max else inf)
+
+    def search(node, depth, alpha, beta, maximizing):
+        nonlocal nodes, bound
+        nodes += 1
+        if shared and nodes % POLL_INTERVAL == 0:
+            if generations[slot] != generation:
+                raise _Aborted
+            bound = bounds[slot]
+        if parent_max:
+            alpha = max(alpha, bound)
+        else:
+            beta = min(beta, bound)
+
+        children = graph.get(node, [])
+        if depth == 0 or not children:
+            return heuristics.get(node, 0)
+        if maximizing:
+            best = -inf
+            for child in children:
+                value = search(child, depth - 1, alpha, beta, False)
+                if value > best:
+                    best = value
+                    alpha = max(alpha, value)
+                    if alpha >= beta:
+                        break
+        else:
+            best = inf
+            for child in children:
+                value = search(child, depth - 1, alpha, beta, True)
+                if value < best:
+                    best = value
+                    beta = min(beta, value)
+                    if alpha >= beta:
+                        break
+        return best
+
+    try:
+        return search(node, depth, alpha, beta, maximizing), nodes
+    except _Aborted:
+        return None, nodes
+
+
+def parallel_alpha_beta(graph, heuristics, node, depth, maximizing=True, workers=None, split_depth=1,
+                        alpha=-inf, beta=inf):
+    """
+    Alpha-beta search of ``node`` on ``workers`` processes; same value as `alpha_beta`.
+
+    Args:
+        graph: Game tree mapping a node -> list of children.
+        heuristics: Static evaluation of leaves and depth-limited nodes.
+        node: Root node.
+        depth: Plies to search.
+        maximizing: Whether the root is a MAX node.
+        workers: Number of processes; defaults to the CPU count. With 1 the
+            search runs serially in this process, which is the baseline for
+            `speedup_report`.
+        split_depth: Plies at which the tree is split. 1 splits only the root,
+            so at most ``len(graph[node]) - 1`` subtrees run at once; deeper
+            splits expose more parallelism along the leftmost path at the price
+            of more synchronization.
+        alpha, beta: Initial window, as for `alpha_beta`. A value outside it is a
+            bound, which may differ from the serial one as siblings finish in a
+            different order.
+
+    Returns:
+        ParallelReport: ``value``, the root's ``best_move``, ``depth`` and ``nodes``
+        visited by all processes, including work abandoned after a cutoff.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or split_depth < 1:
+        return _serial(graph, heuristics, node, depth, maximizing, alpha, beta)
+
+    # Imported here so that the serial path does not pay for the process machinery
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from multiprocessing import RawArray
+
+    bounds, generations = RawArray('d', split_depth), RawArray('q', split_depth)
+    nodes = 0
+    stopped = []
+
+    def split(node, depth, alpha, beta, maximizing, ply):
+        # (value, best child) of a node on the leftmost path, searched from this process
+        nonlocal nodes
+        children = graph.get(node, [])
+        if ply >= split_depth or depth == 0 or len(children) < 2:
+            value, count = _search_subtree(graph, heuristics, node, depth, alpha, beta, maximizing)
+            nodes += count
+            return value, None
+
+        nodes += 1
+        value, _ = split(children[0], depth - 1, alpha, beta, not maximizing, ply + 1)
+        best, best_move = value, children[0]
+        if maximizing:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return best, best_move
+
+        generations[ply] += 1
+        bounds[ply] = alpha if maximizing else beta
+        pending = {pool.submit(_run_subtree, child, depth - 1, alpha, beta, not maximizing,
+                               ply, generations[ply]): child
+                   for child in children[1:]}
+        while pending and alpha < beta:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                child = pending.pop(future)
+                value, count = future.result()
+                nodes += count
+                if value is not None and ((value > best) if maximizing else (value < best)):
+                    best, best_move = value, child
+                    if maximizing:
+                        alpha = bounds[ply] = max(alpha, value)
+                    else:
+                        beta = bounds[ply] = min(beta, value)
+        # Cutoff: stop the siblings still running at their next poll
+        generations[ply] += 1
+        stopped.extend(future for future in pending if not future.cancel())
+        return best, best_move
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(graph, heuristics, bounds, generations)) as pool:
+        value, best_move = split(node, depth, alpha, beta, maximizing, 0)
+        # Their work was spent too, so it counts towards the search overhead
+        nodes += sum(future.result()[1] for future in wait(stopped).done)
+    return ParallelReport(value, best_move, depth, nodes)
+
+
+def _serial(graph, heuristics, node, depth, maximizing, alpha, beta):
+    children = graph.get(node, [])
+    if depth == 0 or not children:
+        return ParallelReport(heuristics.get(node, 0), None, depth, 1)
+    best, best_move, nodes = (-inf if maximizing else inf), None, 1
+    for child in children:
+        value, count = _search_subtree(graph, heuristics, child, depth - 1, alpha, beta, not maximizing)
+        nodes += count
+        if (value > best) if maximizing else (value < best):
+            best, best_move = value, child
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+    return ParallelReport(best, best_move, depth, nodes)
+
+
+def speedup_report(graph, heuristics, node, depth, worker_counts=(1, 2, 4), maximizing=True, split_depth=1, repeat=1):
+    """
+    Time `parallel_alpha_beta` for each worker count against the serial search.
+
+    Times include starting the pool, which is what a caller pays per search;
+    the best of ``repeat`` runs is kept.
+
+    Returns:
+        list: One dict per worker count with ``workers``, ``seconds``, ``speedup``
+        (serial time / time), ``efficiency`` (speedup / workers), ``nodes`` and
+        ``overhead``, the share of nodes searched beyond the serial count.
+
+    Raises:
+        AssertionError: If a parallel search disagrees with the serial value.
+    """
+    def timed(workers):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            report = parallel_alpha_beta(graph, heuristics, node, depth, maximizing, workers, split_depth)
+            seconds = time.perf_counter() - started
+            if best is None or seconds < best[0]:
+                best = seconds, report
+        return best
+
+    serial_seconds, serial = timed(1)
+    rows = []
+    for workers in worker_counts:
+        seconds, report = (serial_seconds, serial) if workers == 1 else timed(workers)
+        assert report.value == serial.value, f"{workers} workers found {report.value}, serial {serial.value}"
+        speedup = serial_seconds / seconds if seconds else inf
+        rows.append({"workers": workers, "seconds": seconds, "speedup": speedup, "efficiency": speedup / workers,
+                     "nodes": report.nodes, "overhead": report.nodes / serial.nodes - 1})
+    return rows
+
+
+if __name__ == '__main__':
+    # Imported here: the generators are a benchmark helper, not a dependency of the search
+    from adversarial.alpha_beta_pruning import alpha_beta
+    from benchmarks.generators import game_tree
+
+    print("Serial alpha-beta on graph9:", alpha_beta(graph9, heuristics9, 'A', 4))
+    print("Parallel, 2 workers:        ", parallel_alpha_beta(graph9, heuristics9, 'A', 4, workers=2))
+
+    tree, _, evaluations, root, _ = game_tree(300_000, branching=8, seed=1)
+    print("\nGame tree of 300000 nodes, branching 8, root split:")
+    print(f"{'workers':>7} {'seconds':>8} {'speedup':>7} {'efficiency':>10} {'nodes':>8} {'overhead':>8}")
+    for row in speedup_report(tree, evaluations, root, 7, worker_counts=(1, 2, 4)):
+        print(f"{row['workers']:>7} {row['seconds']:>8.3f} {row['speedup']:>7.2f} {row['efficiency']:>10.2f} "
+              f"{row['nodes']:>8} {row['overhead']:>8.1%}")
@@ -0,0 +1,117 @@
+"""
+CSP solver benchmark: plain backtracking against MRV, LCV, forward checking and AC-3.
+
+Solves a few Sudoku puzzles and N-queens instances with each configuration
+of `uninformed.csp.CSP.solve`. The "naive" configuration (static orders, no
+inference) is plain chronological backtracking inside the solver; it is capped
+at ``--max-assignments`` and reported as CUTOFF when it runs out.
+
+Small N-queens instances are also solved by the graph search of
+`uninformed.backtrack` (the "backtrack" rows). It can only search an explicit
+adjacency list, so every consistent partial placement is generated first; its
+time includes that step, and "assigned" counts the states it expanded. Run from
+the repository root:
+
+    python -m benchmarks.csp
+    python -m benchmarks.csp --queens 8 64 256 512 --max-assignments 100000
+"""
+import argparse
+import sys
+import time
+
+from core.results import Budget
+from uninformed.backtrack import backtrack
+from uninformed.csp import n_queens, sudoku
+
+PUZZLES = {
+    "easy": "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79",
+    "hard": "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "hardest": "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+}
+
+# name -> CSP.solve options
+CONFIGS = {
+    "naive": dict(variable_order="static", value_order="static", inference="none"),
+    "fc": dict(variable_order="static", value_order="static", inference="forward"),
+    "mrv+fc": dict(variable_order="mrv", value_order="static", inference="forward"),
+    "mrv+lcv+fc": dict(variable_order="mrv", value_order="lcv", inference="forward"),
+    "mrv+lcv+ac3": dict(variable_order="mrv", value_order="lcv", inference="ac3"),
+}
+
+
+# Goal node of `queens_graph`, after every complete placement
+SOLVED = "solved"
+
+
+def queens_graph(n):
+    """
+    N-queens as the adjacency list `uninformed.backtrack` searches: a state is the
+    tuple of queen columns for the rows filled so far, linked to its consistent
+    one-row extensions, and every complete placement to `SOLVED`.
+    """
+    graph = {}
+    stack = [()]
+    while stack:
+        state = stack.pop()
+        row = len(state)
+        if row == n:
+            graph[state] = [SOLVED]
+            continue
+        graph[state] = [state + (col,) for col in range(n)
+                        if all(col != c and abs(col - c) != row - r for r, c in enumerate(state))]
+        stack.extend(graph[state])
+    graph[SOLVED] = []
+    return graph
+
+
+def measure_backtrack(n):
+    """Build the state graph and search it; returns (status, seconds, states expanded)."""
+    started = time.perf_counter()
+    result = backtrack(queens_graph(n), SOLVED, ())
+    return result.status, time.perf_counter() - started, result.stats.expansions
+
+
+def measure(csp, options, max_assignments):
+    """Solve once; returns (status, seconds, assignments, backtracks)."""
+    started = time.perf_counter()
+    result = csp.solve(budget=Budget(max_assignments), **options)
+    seconds = time.perf_counter() - started
+    return result.status, seconds, result.stats.expansions, result.stats.stale_pops
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--puzzles", nargs="+", choices=sorted(PUZZLES), default=list(PUZZLES))
+    parser.add_argument("--queens", type=int, nargs="+", default=[8, 16, 32, 64, 128, 256])
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--max-assignments", type=int, default=200000, help="per-run cap")
+    parser.add_argument("--backtrack-max", type=int, default=10,
+                        help="largest N-queens also solved with uninformed.backtrack (its state graph grows ~N!)")
+    parser.add_argument("--no-restarts", action="store_true",
+                        help="disable randomized restarts for N-queens (seed 0, restart after 2N assignments; "
+                             "MRV configurations only, static orders have no ties to break)")
+    args = parser.parse_args(argv)
+
+    print(f"{'instance':<16}{'config':<14}{'status':>8}{'seconds':>11}{'assigned':>11}{'backtracks':>12}")
+    instances = [(f"sudoku/{name}", sudoku(PUZZLES[name]), {}) for name in args.puzzles]
+    for n in args.queens:
+        extra = {} if args.no_restarts else dict(seed=0, restart_after=2 * n)
+        instances.append((f"queens/{n}", n_queens(n), extra))
+
+    for label, csp, extra in instances:
+        if label.startswith("queens/") and len(csp.variables) <= args.backtrack_max:
+            status, seconds, expanded = measure_backtrack(len(csp.variables))
+            print(f"{label:<16}{'backtrack':<14}{status:>8}{seconds:>11.4f}{expanded:>11}{'-':>12}")
+        for name in args.configs:
+            options = {**CONFIGS[name], **extra}
+            # LCV and AC-3 scan every value of every neighbor: quadratic per step on large boards
+            if label.startswith("queens/") and options["value_order"] == "lcv" and len(csp.variables) > 64:
+                print(f"{label:<16}{name:<14}{'skipped':>8}")
+                continue
+            status, seconds, assigned, backtracks = measure(csp, options, args.max_assignments)
+            print(f"{label:<16}{name:<14}{status:>8}{seconds:>11.4f}{assigned:>11}{backtracks:>12}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Seeded synthetic workloads in the repository's dict formats.
+
+Every generator returns ``(graph, g_costs, heuristics, start, goal)`` where
+``graph`` maps a node -> list of neighbors, ``g_costs`` maps (u, v) -> cost
+(see `graphs.path_costs`) and ``heuristics`` maps a node -> h (see
+`graphs.heuristics`). Nodes are the integers ``0 .. n-1``. The same seed always
+produces the same workload.
+"""
+import random
+
+
+def grid(n, seed=0, max_cost=9):
+    """
+    4-connected square grid of about ``n`` cells with random edge costs in 1..max_cost.
+
+    Goes from the top-left to the bottom-right corner; the heuristic is the
+    Manhattan distance to the goal, which is admissible because every edge costs
+    at least 1.
+    """
+    rng = random.Random(seed)
+    width = max(2, int(n ** 0.5))
+    graph, g_costs = {}, {}
+    for y in range(width):
+        for x in range(width):
+            node = y * width + x
+            children = []
+            if x > 0: children.append(node - 1)
+            if x < width - 1: children.append(node + 1)
+            if y > 0: children.append(node - width)
+            if y < width - 1: children.append(node + width)
+            graph[node] = children
+            for child in children:
+                g_costs[(node, child)] = rng.randint(1, max_cost)
+    goal = width * width - 1
+    heuristics = {node: (width - 1 - node % width) + (width - 1 - node // width) for node in graph}
+    return graph, g_costs, heuristics, 0, goal
+
+
+def random_digraph(n, degree=3, seed=0, max_cost=9):
+    """
+    Random directed graph with ``degree`` out-edges per node and random costs.
+
+    A Hamiltonian-ish backbone ``i -> i + 1`` is always included so the goal
+    ``n - 1`` is reachable from ``0``. Use a small degree for sparse and a large
+    one for dense graphs. Heuristics are all zero (no domain knowledge).
+    """
+    rng = random.Random(seed)
+    graph, g_costs = {}, {}
+    for node in range(n):
+        children = [rng.randrange(n) for _ in range(degree - 1)]
+        if node + 1 < n:
+            children.append(node + 1)
+        graph[node] = children
+        for child in children:
+            g_costs[(node, child)] = rng.randint(1, max_cost)
+    heuristics = dict.fromkeys(graph, 0)
+    return graph, g_costs, heuristics, 0, n - 1
+
+
+def bary_tree(n, branching=2, seed=0, max_value=20):
+    """
+    Complete ``branching``-ary tree of ``n`` nodes, laid out like `graphs.path_costs.graph9`.
+
+    Children of node i are ``branching * i + 1 .. branching * i + branching``.
+    Heuristics are random static values in 0..max_value; the goal is the last leaf.
+    """
+    rng = random.Random(seed)
+    graph = {node: [child for child in range(branching * node + 1, branching * node + branching + 1) if child < n]
+             for node in range(n)}
+    g_costs = {(node, child): 1 for node, children in graph.items() for child in children}
+    heuristics = {node: rng.randint(0, max_value) for node in graph}
+    return graph, g_costs, heuristics, 0, n - 1
+
+
+def game_tree(n, branching=3, seed=0, max_value=100):
+    """
+    Random game tree of about ``n`` nodes for `alpha_beta`.
+
+    A complete ``branching``-ary tree whose leaves carry random evaluations in
+    -max_value..max_value; interior nodes have no static value. ``goal`` is unused
+    (None).
+    """
+    rng = random.Random(seed)
+    graph, _, _, root, _ = bary_tree(n, branching, seed)
+    heuristics = {node: rng.randint(-max_value, max_value) for node, children in graph.items() if not children}
+    return graph, {}, heuristics, root, None
+
+
+GENERATORS = {
+    "grid": grid,
+    "sparse": random_digraph,
+    "dense": lambda n, seed=0: random_digraph(n, degree=min(32, max(1, n - 1)), seed=seed),
+    "tree": bary_tree,
+    "game_tree": game_tree,
+}
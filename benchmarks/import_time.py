@@ -0,0 +1,81 @@
+"""
+Cold-start import benchmark.
+
+Imports each search module in a fresh interpreter, keeps the best of several
+runs and fails (exit status 1) if a module exceeds its time budget or drags in
+the plotting stack. Run from the repository root:
+
+    python -m benchmarks.import_time [--repeat N] [--budget-ms MS]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODULES = [
+    "graphs",
+    "graphs.compiled",
+    "graphs.storage",
+    "core.tracing",
+    "uninformed.backtrack",
+    "uninformed.breadth_first_search",
+    "uninformed.depth_first_search",
+    "informed",
+    "informed.best_first_search",
+    "informed.hill_climbing",
+    "informed.local_search",
+    "informed.memory_bounded",
+    "informed.incremental",
+    "informed.bounded_suboptimal",
+    "informed.grid_search",
+    "informed.uniform_cost_search",
+    "adversarial",
+    "adversarial.a_star",
+    "adversarial.alpha_beta_pruning",
+    "adversarial.parallel_alpha_beta",
+]
+
+# Modules that must only be loaded when a visualization is requested
+HEAVY = ("matplotlib", "networkx")
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"ms": elapsed * 1000, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat=5):
+    """Best-of-``repeat`` import time in milliseconds and the heavy modules it loaded."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best, heavy = float('inf'), []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY)],
+                             cwd=root, capture_output=True, text=True, check=True).stdout
+        sample = json.loads(out)
+        best = min(best, sample["ms"])
+        heavy = sample["heavy"]
+    return best, heavy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in MODULES:
+        ms, heavy = measure(module, args.repeat)
+        ok = ms <= args.budget_ms and not heavy
+        failed |= not ok
+        note = f" loads {', '.join(heavy)}" if heavy else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<36} {ms:8.2f} ms{note}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Scaling benchmark for the search strategies on seeded synthetic graphs.
+
+For every workload (algorithm on a generated graph) and size it reports wall
+time, nodes expanded per second and peak traced memory. Results can be saved as
+a baseline and later runs compared against it. Run from the repository root:
+
+    python -m benchmarks.run --sizes 1000 10000 100000 --save baseline.json
+    python -m benchmarks.run --sizes 1000 10000 100000 --compare baseline.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+from adversarial.a_star import a_star
+from adversarial.alpha_beta_engine import AlphaBetaEngine
+from benchmarks.generators import GENERATORS
+from informed.best_first_search import best_first_search
+from informed.uniform_cost_search import uniform_cost_search
+from uninformed.backtrack import backtrack
+from uninformed.breadth_first_search import breadth_first_path
+from uninformed.depth_first_search import depth_first_path
+
+
+def _weighted(graph, g_costs):
+    return {node: [(child, g_costs[(node, child)]) for child in children] for node, children in graph.items()}
+
+
+# prepare(graph, g_costs, heuristics, start, goal) -> zero-argument search call
+Workload = namedtuple("Workload", "generator max_size prepare")
+
+
+def _bfs(graph, g_costs, heuristics, start, goal):
+    return lambda: breadth_first_path(graph, goal, start)
+
+
+def _dfs(graph, g_costs, heuristics, start, goal):
+    return lambda: depth_first_path(graph, start, goal)
+
+
+def _backtrack(graph, g_costs, heuristics, start, goal):
+    return lambda: backtrack(graph, goal, start)
+
+
+def _best_first(graph, g_costs, heuristics, start, goal):
+    return lambda: best_first_search(graph, goal, lambda node, _goal: heuristics[node], start)
+
+
+def _ucs(graph, g_costs, heuristics, start, goal):
+    weighted = _weighted(graph, g_costs)
+    return lambda: uniform_cost_search(weighted, start, goal)
+
+
+def _a_star(graph, g_costs, heuristics, start, goal):
+    return lambda: a_star(graph, heuristics, start, goal, g_costs)
+
+
+def _alpha_beta(graph, g_costs, heuristics, start, goal):
+    # With every enhancement off the engine searches exactly like `alpha_beta`,
+    # and unlike the bare value `alpha_beta` returns, its report counts nodes
+    engine = AlphaBetaEngine(graph, heuristics, transpositions=False, killers=False, history=False)
+    return lambda: engine.search(start, 64, iterative=False)
+
+
+def _expansions(result):
+    """Nodes whose successors were generated: `SearchStats` counters, or an `AlphaBetaReport`'s interior nodes."""
+    stats = getattr(result, "stats", None)
+    return stats.expansions if stats is not None else result.interior_nodes
+
+
+WORKLOADS = {
+    "bfs/sparse": Workload("sparse", None, _bfs),
+    "bfs/dense": Workload("dense", 10 ** 5, _bfs),
+    "dfs/sparse": Workload("sparse", None, _dfs),
+    "backtrack/tree": Workload("tree", 10 ** 4, _backtrack),  # quadratic list scans
+    "best_first/grid": Workload("grid", None, _best_first),
+    "ucs/sparse": Workload("sparse", None, _ucs),
+    "ucs/dense": Workload("dense", 10 ** 5, _ucs),
+    "a_star/grid": Workload("grid", None, _a_star),
+    "alpha_beta/game_tree": Workload("game_tree", None, _alpha_beta),
+}
+
+
+def measure(workload, size, seed=0, memory=True):
+    """Run one workload once; returns a dict of seconds, expansions, expansions_per_sec and peak_bytes."""
+    data = GENERATORS[workload.generator](size, seed=seed)
+
+    call = workload.prepare(*data)
+    gc.collect()
+    started = time.perf_counter()
+    result = call()
+    seconds = time.perf_counter() - started
+    expansions = _expansions(result)
+
+    peak = None
+    if memory:
+        call = workload.prepare(*data)
+        gc.collect()
+        tracemalloc.start()
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "seconds": seconds,
+        "expansions": expansions,
+        "expansions_per_sec": expansions / seconds if seconds else None,
+        "peak_bytes": peak,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Workload/size pairs whose time grew by more than ``threshold`` times the baseline."""
+    regressions = []
+    for name, sizes in results.items():
+        for size, sample in sizes.items():
+            old = baseline.get(name, {}).get(size)
+            if old is None:
+                continue
+            # Ignore sub-millisecond noise
+            if sample["seconds"] > old["seconds"] * threshold and sample["seconds"] - old["seconds"] > 1e-3:
+                regressions.append((name, size, old["seconds"], sample["seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="graph sizes in nodes (10^3 .. 10^7)")
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=sorted(WORKLOADS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the (slower) traced-memory run")
+    parser.add_argument("--save", metavar="PATH", help="write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown factor")
+    args = parser.parse_args(argv)
+
+    # alpha_beta recursion follows tree depth; backtrack-style scans need no extra stack
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    results = {}
+    print(f"{'workload':<22}{'nodes':>10}{'seconds':>12}{'expanded':>12}{'exp/s':>14}{'peak MiB':>11}")
+    for name in args.workloads:
+        workload = WORKLOADS[name]
+        for size in args.sizes:
+            if workload.max_size is not None and size > workload.max_size:
+                print(f"{name:<22}{size:>10}{'skipped (max ' + str(workload.max_size) + ')':>59}")
+                continue
+            sample = measure(workload, size, args.seed, memory=not args.no_memory)
+            results.setdefault(name, {})[str(size)] = sample
+            rate = f"{sample['expansions_per_sec']:,.0f}" if sample["expansions_per_sec"] else "-"
+            peak = f"{sample['peak_bytes'] / 2 ** 20:.2f}" if sample["peak_bytes"] is not None else "-"
+            print(f"{name:<22}{size:>10}{sample['seconds']:>12.4f}{sample['expansions']:>12}{rate:>14}{peak:>11}")
+
+    if args.save:
+        meta = {"python": platform.python_version(), "machine": platform.machine(), "seed": args.seed}
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, size, old, new in regressions:
+            print(f"REGRESSION {name} @ {size}: {old:.4f}s -> {new:.4f}s ({new / old:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+
+from adversarial.a_star import a_star
+from graphs import graph8
+from graphs.compiled import CompiledGraph, compile_graph
+from graphs.heuristics import heuristics8
+from graphs.path_costs import g_costs8
+from informed.best_first_search import best_first_search
+from informed.uniform_cost_search import uniform_cost_search
+from uninformed.breadth_first_search import breadth_first_path
+
+_ARRAYS = ("offsets", "targets", "weights", "h")
+
+
+class SharedGraph:
+    """
+    Copy of a `CompiledGraph` whose arrays live in shared memory.
+
+    The owning process creates it once; workers rebuild a zero-copy
+    `CompiledGraph` over the same pages with `attach`, so the adjacency and costs
+    are never pickled per task. Only the node labels travel to each worker, once.
+    Use as a context manager, or call `close` to release the blocks.
+    """
+
+    def __init__(self, graph):
+        self._blocks = []
+        arrays = {}
+        for name in _ARRAYS:
+            data = memoryview(getattr(graph, name))
+            block = SharedMemory(create=True, size=max(data.nbytes, 1))
+            block.buf[:data.nbytes] = data.cast('B')
+            self._blocks.append(block)
+            arrays[name] = (block.name, data.format, len(data))
+        self.spec = (graph.labels, arrays)
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach(spec):
+    """Rebuild a `CompiledGraph` over the shared blocks described by `SharedGraph.spec`."""
+    labels, arrays = spec
+    blocks, views = [], {}
+    for name, (block_name, fmt, length) in arrays.items():
+        block = SharedMemory(name=block_name)
+        blocks.append(block)
+        views[name] = block.buf.cast('B')[:length * _itemsize(fmt)].cast(fmt)
+    graph = CompiledGraph(labels, views["offsets"], views["targets"], views["weights"], views["h"])
+    return graph, blocks
+
+
+def _itemsize(fmt):
+    return memoryview(bytes(8)).cast(fmt).itemsize
+
+
+def _edge_path_cost(graph, path):
+    ids = [graph.id_of(node) for node in path]
+    return sum(graph.edge_cost(u, v) for u, v in zip(ids, ids[1:]))
+
+
+def _bfs(graph, start, goal, heuristic_goal):
+    result = breadth_first_path(graph, goal, start)
+    return result.path, result.cost
+
+
+def _ucs(graph, start, goal, heuristic_goal):
+    result = uniform_cost_search(graph, start, goal)
+    return result.path, result.cost
+
+
+def _best_first(graph, start, goal, heuristic_goal):
+    if goal == heuristic_goal:
+        h, index = graph.h, graph.index
+        estimate = lambda node, _goal: h[index[node]]
+    else:
+        estimate = lambda node, _goal: 0  # the compiled table is about another goal
+    path = best_first_search(graph, goal, estimate, start).path
+    if path is None:
+        return None, float('inf')
+    return path, _edge_path_cost(graph, path)
+
+
+def _a_star(graph, start, goal, heuristic_goal):
+    if goal != heuristic_goal:
+        # The compiled table may overestimate the distance to any other goal;
+        # A* without an estimate is uniform-cost search
+        return _ucs(graph, start, goal, heuristic_goal)
+    result = a_star(graph, None, start, goal)
+    return result.path, result.cost
+
+
+# name -> f(compiled graph, start, goal, heuristic goal) -> (path or None, cost)
+ALGORITHMS = {
+    "bfs": _bfs,
+    "ucs": _ucs,
+    "best_first": _best_first,
+    "a_star": _a_star,
+}
+
+# Per-worker state set by _init_worker
+_worker_graph = None
+_worker_blocks = None
+
+
+def _init_worker(spec):
+    global _worker_graph, _worker_blocks
+    _worker_graph, _worker_blocks = attach(spec)
+
+
+def _run_chunk(algorithm, chunk, heuristic_goal):
+    search = ALGORITHMS[algorithm]
+    return [(start, goal, *search(_worker_graph, start, goal, heuristic_goal)) for start, goal in chunk]
+
+
+def batch_search(graph, queries, algorithm="ucs", workers=None, chunk_size=64, g_costs=None, heuristics=None,
+                 heuristic_goal=None):
+    """
+    Answer many (start, goal) queries against one graph on a process pool.
+
+    The graph is compiled (if needed) and placed in shared memory once; each
+    worker maps it at start-up. Queries are sent in chunks of ``chunk_size`` and
+    at most ``4 * workers`` chunks are in flight, so ``queries`` may be a lazy
+    iterable of any length.
+
+    Args:
+        graph: A `CompiledGraph`, or an adjacency list compiled with ``g_costs``
+            and ``heuristics`` (see `compile_graph`).
+        queries: Iterable of (start, goal) pairs.
+        algorithm: One of ``ALGORITHMS``: "bfs", "ucs", "best_first" or "a_star".
+        workers: Number of processes; defaults to the CPU count.
+        chunk_size: Queries per task.
+        heuristic_goal: The goal the compiled heuristic values estimate the
+            distance to. "best_first" and "a_star" use them only for queries
+            towards it; for other goals "best_first" has no estimate and
+            "a_star" runs as "ucs", so its costs stay optimal.
+
+    Yields:
+        (start, goal, path, cost) tuples in completion order; path is None and
+        cost inf when the goal is unreachable.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {sorted(ALGORITHMS)}")
+    if not isinstance(graph, CompiledGraph):
+        graph = compile_graph(graph, g_costs, heuristics)
+    workers = workers or os.cpu_count() or 1
+    queries = iter(queries)
+
+    def next_chunk():
+        chunk = []
+        for query in queries:
+            chunk.append(query)
+            if len(chunk) == chunk_size:
+                break
+        return chunk
+
+    with SharedGraph(graph) as shared, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared.spec,)) as pool:
+        pending = set()
+        chunk = next_chunk()
+        while chunk or pending:
+            while chunk and len(pending) < 4 * workers:
+                pending.add(pool.submit(_run_chunk, algorithm, chunk, heuristic_goal))
+                chunk = next_chunk()
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+if __name__ == '__main__':
+    queries = [(start, goal) for start in graph8 for goal in graph8]
+    for start, goal, path, cost in batch_search(graph8, queries, "ucs", workers=2, g_costs=g_costs8):
+        print(f"{start} -> {goal}: {path} (cost {cost})")
+    for start, goal, path, cost in batch_search(graph8, [(s, 'J') for s in graph8], "a_star", workers=2,
+                                                g_costs=g_costs8, heuristics=heuristics8, heuristic_goal='J'):
+        print(f"A* {start} -> {goal}: {path} (cost {cost})")
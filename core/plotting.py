@@ -0,0 +1,210 @@
+import os
+import sys
+
+
+def load_pyplot():
+    """
+    Import and return ``matplotlib.pyplot``, choosing a non-interactive backend on headless machines.
+
+    Search modules call this only when a visualization is actually requested, so
+    importing them never pulls in matplotlib.
+    """
+    import matplotlib
+
+    if "MPLBACKEND" not in os.environ and sys.platform.startswith("linux") \
+            and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def load_networkx():
+    """Import and return ``networkx`` on first use."""
+    import networkx as nx
+
+    return nx
+
+
+def _children_getter(children):
+    if callable(children):
+        return children
+    if hasattr(children, "get"):
+        return lambda node: children.get(node, ())
+    return lambda node: children[node] if node in children else ()
+
+
+def _spanning_tree(children, root):
+    """Breadth-first tree from ``root``: (node -> tree children, nodes in BFS order, node -> parent)."""
+    children = _children_getter(children)
+    tree, parent, order = {root: []}, {root: None}, [root]
+    for node in order:   # grows while iterating: an iterative BFS
+        kids = tree[node]
+        for child in children(node):
+            if child not in parent:
+                parent[child] = node
+                tree[child] = []
+                kids.append(child)
+                order.append(child)
+    return tree, order, parent
+
+
+def collapse_tree(children, root, max_nodes, keep=()):
+    """
+    Cut the tree reachable from ``root`` down to about ``max_nodes`` visible nodes.
+
+    Nodes are kept level by level from the root, so what survives is the top of
+    the tree; every node in ``keep`` (a solution path, say) stays visible along
+    with its ancestors, even past the budget. A node reachable along several
+    paths belongs to the first parent that reaches it breadth-first.
+
+    Args:
+        children: Mapping node -> iterable of children (a networkx graph works
+            too) or a callable returning them.
+
+    Returns:
+        tuple: (node -> list of visible children, node -> number of descendants
+        hidden below it). The second dict only lists collapsed nodes.
+    """
+    tree, order, parent = _spanning_tree(children, root)
+    if max_nodes is None or len(order) <= max_nodes:
+        return tree, {}
+
+    visible = {root}
+    for node in keep:
+        while node in parent and node not in visible:
+            visible.add(node)
+            node = parent[node]
+    for node in order:
+        if len(visible) >= max_nodes:
+            break
+        if node in visible:
+            for child in tree[node]:
+                if len(visible) >= max_nodes:
+                    break
+                visible.add(child)
+
+    size = {}
+    for node in reversed(order):
+        size[node] = 1 + sum(size[child] for child in tree[node])
+    shown, hidden = {}, {}
+    for node in order:
+        if node in visible:
+            shown[node] = [child for child in tree[node] if child in visible]
+            count = size[node] - 1 - sum(size[child] for child in shown[node])
+            if count:
+                hidden[node] = count
+    return shown, hidden
+
+
+def tree_layout(children, root, width=1., vert_gap=1.):
+    """
+    Top-down positions for the tree reachable from ``root``.
+
+    Each node gets horizontal room in proportion to the number of leaves below
+    it, so wide subtrees do not squash their neighbours. Iterative and linear in
+    the size of the tree, so deep or very large trees are fine.
+
+    Args:
+        children: Mapping node -> iterable of children (a networkx graph works
+            too) or a callable returning them. Cycles and shared children are
+            handled as in `collapse_tree`.
+
+    Returns:
+        dict: node -> (x, y) with x in [0, width] and the root at y = 0.
+    """
+    tree, order, parent = _spanning_tree(children, root)
+    leaves = dict.fromkeys(order, 0)
+    for node in reversed(order):
+        count = leaves[node] or 1
+        leaves[node] = count
+        if node != root:
+            leaves[parent[node]] += count
+
+    # Children share their parent's span in order; ``left`` is each span's left edge
+    scale = width / leaves[root]
+    pos = {root: (width / 2, 0.)}
+    left = {root: 0.}
+    for node in order:
+        edge = left.pop(node)
+        y = pos[node][1] - vert_gap
+        for child in tree[node]:
+            room = leaves[child] * scale
+            left[child] = edge
+            pos[child] = (edge + room / 2, y)
+            edge += room
+    return pos
+
+
+def render_tree(children, root, output=None, colors=None, labels=None, title=None, max_nodes=2000, keep=(),
+                label_limit=100, figsize=None):
+    """
+    Draw the tree reachable from ``root``, to a file or on screen.
+
+    Trees larger than ``max_nodes`` are cut with `collapse_tree`; a collapsed
+    node is annotated with the number of nodes hidden below it, or just ringed
+    when the tree is too big for labels. Node labels are
+    only drawn while at most ``label_limit`` nodes are visible. Edges and nodes
+    are drawn as one collection each, so rendering stays fast for big trees.
+
+    Args:
+        children: Mapping node -> iterable of children, or a callable.
+        output: File to write, in the format given by its extension (``.png``,
+            ``.svg``, ``.pdf``). It is rendered without pyplot, so no display is
+            needed; None shows the figure with pyplot instead.
+        colors: Mapping node -> matplotlib color; light gray by default.
+        labels: Mapping node -> label text; ``str(node)`` by default.
+        keep: Nodes that must stay visible, e.g. a solution path.
+
+    Returns:
+        The ``output`` path, or None when shown.
+    """
+    tree, hidden = collapse_tree(children, root, max_nodes, keep)
+    pos = tree_layout(tree, root)
+    colors, labels = colors or {}, labels or {}
+    get_children = _children_getter(children)
+    small = len(pos) <= label_limit
+
+    if figsize is None:
+        leaves = sum(1 for kids in tree.values() if not kids)
+        depth = -min(y for _, y in pos.values())
+        figsize = (min(60., max(10., 0.25 * leaves)), min(40., max(6., 0.6 * depth)))
+    if output is None:
+        plt = load_pyplot()
+        figure = plt.figure(figsize=figsize)
+    else:
+        from matplotlib.figure import Figure
+        figure = Figure(figsize=figsize)
+    from matplotlib.collections import LineCollection
+
+    axes = figure.add_subplot()
+    segments = [(pos[node], pos[child]) for node in pos for child in get_children(node) if child in pos]
+    axes.add_collection(LineCollection(segments, colors="#999999", linewidths=1. if small else .3, zorder=1))
+    nodes = list(pos)
+    axes.scatter([pos[n][0] for n in nodes], [pos[n][1] for n in nodes],
+                 c=[colors.get(n, "#d3d3d3") for n in nodes],
+                 s=1500 if small else max(2., 40000. / len(nodes)), zorder=2)
+    if small:
+        for node in nodes:
+            x, y = pos[node]
+            axes.text(x, y, labels.get(node, str(node)), fontsize=10, fontweight="bold",
+                      ha="center", va="center", zorder=3)
+    if small:
+        for node, count in hidden.items():
+            x, y = pos[node]
+            axes.text(x, y - .3, f"+{count}", fontsize=8, color="#636363", ha="center", va="top", zorder=3)
+    elif hidden:
+        # Too many to annotate: ring the collapsed nodes instead
+        collapsed = list(hidden)
+        axes.scatter([pos[n][0] for n in collapsed], [pos[n][1] for n in collapsed], s=max(8., 80000. / len(nodes)),
+                     facecolors="none", edgecolors="#636363", linewidths=.5, zorder=3)
+
+    if title:
+        axes.set_title(title, fontsize=14)
+    axes.margins(.05, .1)
+    axes.axis("off")
+    if output is None:
+        plt.show()
+        return None
+    figure.savefig(output, bbox_inches="tight")
+    return output
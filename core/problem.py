@@ -0,0 +1,41 @@
+"""
+Implicit state spaces for problems too large to store as a graph dict.
+
+A `Problem` generates the successors of a state only when the search expands
+it, so memory holds just the states a search has actually reached. States are
+the search keys themselves and should be compact hashables, ideally packed
+ints: a 15-puzzle board fits in one int instead of a tuple of 16 objects, which
+keeps parent maps and visited sets several times smaller.
+
+`breadth_first_search`, `breadth_first_path`, `uniform_cost_search`,
+`best_first_search`, `a_star` and `hill_climbing` accept a problem in place of
+the graph. The problem then supplies the start (unless one is passed), the
+goal test, the step costs and the heuristic, and the returned path is a list
+of states; `Problem.decode` turns one back into a readable form. See
+`graphs.puzzles.SlidingPuzzle` for an example.
+"""
+
+
+class Problem:
+    """
+    Search problem given by a successor function.
+
+    Subclasses set ``initial`` and implement `successors` and `is_goal`;
+    `heuristic` defaults to 0 and `decode` to the state itself.
+    """
+    initial = None
+
+    def successors(self, state):
+        """Iterable of ``(next_state, step_cost)`` pairs; may be a generator."""
+        raise NotImplementedError
+
+    def is_goal(self, state):
+        raise NotImplementedError
+
+    def heuristic(self, state):
+        """Estimated cost from ``state`` to the nearest goal."""
+        return 0
+
+    def decode(self, state):
+        """Human-readable form of a state."""
+        return state
@@ -0,0 +1,104 @@
+from math import inf
+from time import perf_counter
+
+
+class SearchStats:
+    """
+    Performance counters of one search run.
+
+    - expansions: nodes whose successors were generated
+    - pushes: entries added to the frontier (queue, stack or heap)
+    - stale_pops: frontier entries popped and discarded as already visited/outdated
+    - peak_frontier: largest frontier size observed
+    - elapsed: wall-clock seconds from the start of the search to its result
+
+    Every search creates its own instance, so concurrent searches in threads or
+    tasks never share counters.
+    """
+    __slots__ = ("expansions", "pushes", "stale_pops", "peak_frontier", "elapsed", "_started")
+
+    def __init__(self):
+        self.expansions = 0
+        self.pushes = 0
+        self.stale_pops = 0
+        self.peak_frontier = 0
+        self.elapsed = 0.0
+        self._started = perf_counter()
+
+    def stop(self):
+        self.elapsed = perf_counter() - self._started
+        return self
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__[:-1]}
+
+    def __repr__(self):
+        return "SearchStats(" + ", ".join(f"{k}={v!r}" for k, v in self.as_dict().items()) + ")"
+
+
+class SearchResult:
+    """
+    Outcome of a search.
+
+    - status: "SUCCESS", "FAIL", or "CUTOFF" when a depth, iteration or `Budget` limit stopped it
+    - path: start-to-goal path (None when not found; for local search, the path walked)
+    - cost: path cost (edge count for unweighted searches), inf when not found
+    - stats: `SearchStats` counters
+    - visited_order: expansion order, for searches that record it
+    - iterations: expansions per iteration, for iterative-deepening searches
+    - optimal: for searches that may trade optimality for memory or speed, whether
+      the returned cost is still guaranteed optimal (None when not reported)
+    - bound: for bounded-suboptimal searches, the factor the cost is proven to be
+      within: cost <= bound * optimal cost (None when not reported)
+    """
+    __slots__ = ("status", "path", "cost", "stats", "visited_order", "iterations", "optimal", "bound")
+
+    def __init__(self, status, path, cost, stats, visited_order=None, iterations=None, optimal=None, bound=None):
+        self.status = status
+        self.path = path
+        self.cost = cost
+        self.stats = stats
+        self.visited_order = visited_order
+        self.iterations = iterations
+        self.optimal = optimal
+        self.bound = bound
+
+    @classmethod
+    def success(cls, path, cost, stats, **extra):
+        return cls("SUCCESS", path, cost, stats.stop(), **extra)
+
+    @classmethod
+    def failure(cls, stats, status="FAIL", **extra):
+        return cls(status, None, inf, stats.stop(), **extra)
+
+    @property
+    def found(self):
+        return self.status == "SUCCESS"
+
+    def as_dict(self):
+        return {"status": self.status, "path": self.path, "cost": self.cost, "stats": self.stats.as_dict(),
+                "visited_order": self.visited_order, "iterations": self.iterations, "optimal": self.optimal,
+                "bound": self.bound}
+
+    def __repr__(self):
+        return f"SearchResult(status={self.status!r}, path={self.path!r}, cost={self.cost!r}, stats={self.stats!r})"
+
+
+class Budget:
+    """
+    Node and wall-clock limits for one search.
+
+    Searches that accept ``budget`` call `exceeded` once per expansion and stop
+    with status "CUTOFF" when it returns True. The clock is read only every 256
+    expansions, so the deadline may be overrun by that much work.
+    """
+    __slots__ = ("max_expansions", "deadline")
+
+    def __init__(self, max_expansions=None, seconds=None):
+        self.max_expansions = inf if max_expansions is None else max_expansions
+        self.deadline = inf if seconds is None else perf_counter() + seconds
+
+    def exceeded(self, expansions):
+        if expansions >= self.max_expansions:
+            return True
+        return not expansions & 255 and perf_counter() >= self.deadline
@@ -0,0 +1,492 @@
+"""
+Long-running asyncio query service that keeps graphs and their indexes warm.
+
+Graphs are loaded by name the first time they are used; the compiled CSR form
+and derived structures (landmark tables, contraction hierarchies, the reverse
+graph) are built once and reused by every later request. Searches run in an
+executor so the event loop only moves bytes.
+
+The protocol is one JSON object per line in each direction::
+
+    -> {"id": 1, "graph": "graph8", "algorithm": "a_star", "start": "A", "goal": "J",
+        "options": {"max_expansions": 10000, "timeout": 0.5}}
+    <- {"id": 1, "status": "SUCCESS", "path": [...], "cost": 10.0, "stats": {...}}
+
+``{"op": "graphs"}`` lists the graph names and ``{"op": "ping"}`` answers
+``{"pong": true}``. Failures come back as ``{"id": ..., "error": "..."}``.
+Responses on one connection may arrive out of order; match them by ``id``.
+Replies are strict JSON: an unreachable goal has ``"cost": null``.
+Run from the repository root:
+
+    python -m core.service --port 8765
+    python -m core.service --unix /tmp/search.sock --processes --workers 4
+    python -m core.service --graph roads=/data/roads.csr
+    python -m core.service --check    # a_star/alt/ch costs against ucs
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from adversarial.a_star import a_star
+from core.results import Budget
+from graphs.compiled import CompiledGraph, compile_graph
+from graphs.storage import load
+from informed.best_first_search import best_first_search
+from informed.contraction_hierarchy import ContractionHierarchy
+from informed.landmarks import LandmarkHeuristic
+from informed.uniform_cost_search import uniform_cost_search
+from uninformed.breadth_first_search import breadth_first_path
+
+# name -> ("module:attribute" of the graph, of its g_costs, of its heuristics)
+BUILTIN_GRAPHS = {
+    "graph1": ("graphs:graph1", None, "graphs.heuristics:heuristics2"),
+    "graph2": ("graphs:graph2", "graphs.path_costs:g_costs2", "graphs.heuristics:heuristics2"),
+    "graph3": ("graphs:graph3", "graphs.path_costs:g_cost3", None),
+    "graph4": ("graphs:graph4", "graphs.path_costs:g_cost4", None),
+    "graph5": ("graphs:graph5", "graphs.path_costs:g_cost5", None),
+    "graph6": ("graphs:graph6", None, "graphs.heuristics:heuristics2"),
+    "graph7": ("graphs:graph7", "graphs.path_costs:g_costs7", "graphs.heuristics:heuristics7"),
+    "graph8": ("graphs:graph8", "graphs.path_costs:g_costs8", "graphs.heuristics:heuristics8"),
+    "graph9": ("graphs.path_costs:graph9", None, "graphs.heuristics:heuristics9"),
+}
+
+# name -> the goal its heuristic table estimates distances to, for tables that
+# are admissible towards it; queries for any other goal cannot use the table
+HEURISTIC_GOALS = {
+    "graph8": "J",
+}
+
+
+def _resolve(ref):
+    if ref is None or not isinstance(ref, str):
+        return ref
+    if ref.endswith(".csr"):
+        return load(ref)
+    module, _, attribute = ref.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+def _build_source(store, name):
+    graph, g_costs, heuristics = (_resolve(ref) for ref in store.sources[name])
+    return graph, g_costs, heuristics
+
+
+def _build_compiled(store, name):
+    graph, g_costs, heuristics = store.get(name, "source")
+    if isinstance(graph, CompiledGraph):
+        return graph
+    return compile_graph(graph, g_costs, heuristics)
+
+
+def _build_reverse(store, name):
+    return store.get(name).reverse()
+
+
+def _build_landmarks(store, name):
+    return LandmarkHeuristic.build(store.get(name), seed=0)
+
+
+def _build_hierarchy(store, name):
+    return ContractionHierarchy.build(store.get(name))
+
+
+# kind -> builder(store, graph name); every result is cached per graph
+DERIVED = {
+    "source": _build_source,
+    "compiled": _build_compiled,
+    "reverse": _build_reverse,
+    "landmarks": _build_landmarks,
+    "hierarchy": _build_hierarchy,
+}
+
+
+class GraphStore:
+    """
+    Named graphs plus a cache of structures derived from them.
+
+    ``sources`` maps a name to (graph, g_costs, heuristics), each either the
+    object itself or a "module:attribute" reference imported on first use; a
+    graph may also be the path of a ``.csr`` file (see `graphs.storage`), which
+    every process memory-maps instead of compiling. ``heuristic_goals`` maps a
+    name to the goal its heuristics are an admissible estimate for. `get`
+    builds a `DERIVED` structure at most once per graph, even when several
+    threads ask for it at the same time. Only the sources are pickled, so a
+    store can be handed to worker processes, which then fill their own caches.
+    """
+
+    def __init__(self, sources=None, heuristic_goals=None):
+        self.sources = dict(BUILTIN_GRAPHS if sources is None else sources)
+        if heuristic_goals is None:
+            heuristic_goals = HEURISTIC_GOALS if sources is None else {}
+        self.heuristic_goals = dict(heuristic_goals)
+        self._cache = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, graph, g_costs=None, heuristics=None, heuristic_goal=None):
+        """
+        Add (or replace) a graph; cached structures of an old graph of that name are dropped.
+
+        ``heuristics`` only serve "a_star" queries towards ``heuristic_goal``,
+        and must never overestimate the cost to it.
+        """
+        with self._lock:
+            self.sources[name] = (graph, g_costs, heuristics)
+            self.heuristic_goals.pop(name, None)
+            if heuristic_goal is not None:
+                self.heuristic_goals[name] = heuristic_goal
+            for key in [key for key in self._cache if key[0] == name]:
+                del self._cache[key]
+
+    def names(self):
+        return sorted(self.sources)
+
+    def get(self, name, kind="compiled"):
+        if name not in self.sources:
+            raise KeyError(f"unknown graph {name!r}")
+        key = (name, kind)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        # Per-key lock: a slow build of one structure does not stall the others
+        with lock:
+            if key not in self._cache:
+                self._cache[key] = DERIVED[kind](self, name)
+            return self._cache[key]
+
+    def __getstate__(self):
+        return {"sources": self.sources, "heuristic_goals": self.heuristic_goals}
+
+    def __setstate__(self, state):
+        self.__init__(state["sources"], state["heuristic_goals"])
+
+
+def _best_first(store, name, start, goal, budget):
+    graph = store.get(name)
+    h, index = graph.h, graph.index
+    return best_first_search(graph, goal, lambda node, _goal: h[index[node]], start, budget)
+
+
+def _a_star(store, name, start, goal, budget):
+    graph = store.get(name)
+    if name in store.heuristic_goals and goal == store.heuristic_goals[name]:
+        return a_star(graph, None, start, goal, budget=budget)
+    # The compiled table estimates distances to one goal only; towards any
+    # other it may overestimate, so use the landmark bound, admissible for all
+    return a_star(graph, store.get(name, "landmarks").for_goal(goal), start, goal, budget=budget)
+
+
+# name -> f(store, graph name, start, goal, budget) -> SearchResult
+ALGORITHMS = {
+    "bfs": lambda store, name, start, goal, budget: breadth_first_path(store.get(name), goal, start, budget),
+    "ucs": lambda store, name, start, goal, budget: uniform_cost_search(store.get(name), start, goal, budget),
+    "best_first": _best_first,
+    "a_star": _a_star,
+    "alt": lambda store, name, start, goal, budget: a_star(store.get(name), store.get(name, "landmarks").for_goal(goal),
+                                                           start, goal, budget=budget),
+    # Hierarchy queries settle a few dozen nodes, so they are not budgeted
+    "ch": lambda store, name, start, goal, budget: store.get(name, "hierarchy").query(start, goal),
+}
+
+
+def run_search(store, name, algorithm, start, goal, max_expansions=None, timeout=None):
+    """Answer one query against ``store``; returns the `SearchResult` as a dict."""
+    graph = store.get(name)
+    for node in (start, goal):
+        if node not in graph:
+            raise KeyError(f"unknown node {node!r} in graph {name!r}")
+    # The deadline starts here, in the worker, so queueing time is not charged
+    budget = Budget(max_expansions, timeout) if max_expansions is not None or timeout is not None else None
+    result = ALGORITHMS[algorithm](store, name, start, goal, budget)
+    response = result.as_dict()
+    del response["visited_order"], response["iterations"]
+    if response["cost"] is not None and not math.isfinite(response["cost"]):
+        response["cost"] = None  # JSON has no Infinity
+    return response
+
+
+def check_optimal(store, names=None, algorithms=("a_star", "alt", "ch"), pairs=1000, seed=0):
+    """
+    Compare the costs the optimal algorithms return with "ucs", the reference.
+
+    Every start/goal pair is tried on graphs with at most ``pairs`` of them,
+    otherwise ``pairs`` random ones.
+
+    Returns:
+        list: (graph, algorithm, start, goal, cost, optimal cost) for each disagreement.
+    """
+    rng = random.Random(seed)
+    mismatches = []
+    for name in names or store.names():
+        nodes = list(store.get(name))
+        if len(nodes) ** 2 <= pairs:
+            queries = [(start, goal) for start in nodes for goal in nodes]
+        else:
+            queries = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(pairs)]
+        for start, goal in queries:
+            optimal = run_search(store, name, "ucs", start, goal)["cost"]
+            for algorithm in algorithms:
+                cost = run_search(store, name, algorithm, start, goal)["cost"]
+                if (cost is None) != (optimal is None) or \
+                        cost is not None and not math.isclose(cost, optimal, rel_tol=1e-9):
+                    mismatches.append((name, algorithm, start, goal, cost, optimal))
+    return mismatches
+
+
+# Store of a worker process, set by _init_worker
+_worker_store = None
+
+
+def _init_worker(store):
+    global _worker_store
+    _worker_store = store
+
+
+def _run_in_worker(*args):
+    return run_search(_worker_store, *args)
+
+
+class QueryService:
+    """
+    Serves search requests over a TCP or Unix socket.
+
+    - At most ``max_pending`` searches are queued or running at once. When the
+      limit is hit the service stops reading from its sockets, so clients are
+      slowed by ordinary TCP flow control instead of requests piling up in memory.
+    - ``max_expansions`` and ``timeout`` are server-wide caps; a request may ask
+      for less through its options, never more. A search that runs out of budget
+      answers with status "CUTOFF".
+    - With ``processes=True`` searches run on a process pool (real parallelism,
+      one cache per worker); otherwise on a thread pool sharing one cache.
+    """
+
+    def __init__(self, store=None, workers=None, processes=False, max_pending=64, max_expansions=None, timeout=None):
+        self.store = store or GraphStore()
+        self.max_pending = max_pending
+        self.max_expansions = max_expansions
+        self.timeout = timeout
+        self.processes = processes
+        workers = workers or os.cpu_count() or 1
+        if processes:
+            self.executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self.store,))
+        else:
+            self.executor = ThreadPoolExecutor(workers, thread_name_prefix="search")
+        self._slots = None
+
+    async def search(self, request):
+        """Answer one request dict (see the module docstring) without blocking the loop."""
+        name, algorithm = request.get("graph"), request.get("algorithm", "a_star")
+        if name not in self.store.sources:
+            raise KeyError(f"unknown graph {name!r}")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {algorithm!r}; expected one of {sorted(ALGORITHMS)}")
+        options = request.get("options") or {}
+        args = (name, algorithm, request.get("start"), request.get("goal"),
+                _cap(options.get("max_expansions"), self.max_expansions), _cap(options.get("timeout"), self.timeout))
+        call = partial(_run_in_worker, *args) if self.processes else partial(run_search, self.store, *args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+
+    async def respond(self, request):
+        """Answer any request dict, turning errors into ``{"error": ...}`` responses."""
+        op = request.get("op", "search")
+        try:
+            if op == "ping":
+                response = {"pong": True}
+            elif op == "graphs":
+                response = {"graphs": self.store.names()}
+            elif op == "search":
+                response = await self.search(request)
+            else:
+                raise ValueError(f"unknown op {op!r}")
+        except Exception as error:
+            response = {"error": f"{type(error).__name__}: {error}"}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def handle(self, reader, writer):
+        """Connection callback for `asyncio.start_server` / `asyncio.start_unix_server`."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(request):
+            try:
+                if isinstance(request, Exception):
+                    response = {"error": f"{type(request).__name__}: {request}"}
+                else:
+                    response = await self.respond(request)
+                try:
+                    # Strict JSON: parsers outside Python reject NaN and Infinity
+                    data = json.dumps(response, default=str, allow_nan=False)
+                except ValueError as error:
+                    failure = {"error": f"ValueError: {error}"}
+                    if "id" in response:
+                        failure["id"] = response["id"]
+                    data = json.dumps(failure, default=str)
+                async with write_lock:
+                    writer.write(data.encode() + b"\n")
+                    await writer.drain()
+            finally:
+                self._slots.release()
+
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                await self._slots.acquire()
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as error:
+                    request = error
+                task = asyncio.create_task(answer(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        """Start listening on ``path`` (Unix socket) if given, else on ``host:port``."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def warm(self, names=None, kinds=("compiled",)):
+        """Build structures ahead of the first request (in this process's cache)."""
+        for name in names or self.store.names():
+            for kind in kinds:
+                self.store.get(name, kind)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+def _cap(requested, limit):
+    if requested is None:
+        return limit
+    return requested if limit is None else min(requested, limit)
+
+
+class ServiceClient:
+    """Minimal client: ``await client.search("graph8", "a_star", "A", "J")`` returns the response dict."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._ids = 0
+        self._waiting = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, payload):
+        self._ids += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[self._ids] = future
+        self.writer.write(json.dumps({**payload, "id": self._ids}).encode() + b"\n")
+        await self.writer.drain()
+        return await future
+
+    async def search(self, graph, algorithm, start, goal, **options):
+        return await self.request({"graph": graph, "algorithm": algorithm, "start": start, "goal": goal,
+                                   "options": options})
+
+    async def _receive(self):
+        while line := await self.reader.readline():
+            response = json.loads(line)
+            future = self._waiting.pop(response.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self._waiting.values():
+            future.set_exception(ConnectionError("service closed the connection"))
+        self._waiting.clear()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._receiver.cancel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+async def _serve(args):
+    store = GraphStore()
+    for spec in args.graph:
+        name, _, path = spec.partition("=")
+        store.register(name, path)
+    service = QueryService(store, workers=args.workers, processes=args.processes, max_pending=args.max_pending,
+                           max_expansions=args.max_expansions, timeout=args.timeout)
+    if args.warm:
+        service.warm()
+    server = await service.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving {len(service.store.names())} graphs on {where}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="executor size (default: CPU count)")
+    parser.add_argument("--processes", action="store_true", help="run searches on a process pool")
+    parser.add_argument("--max-pending", type=int, default=64, help="queued + running searches before reads pause")
+    parser.add_argument("--max-expansions", type=int, help="per-request node budget cap")
+    parser.add_argument("--timeout", type=float, help="per-request time budget cap in seconds")
+    parser.add_argument("--graph", action="append", default=[], metavar="NAME=PATH.csr",
+                        help="serve a graph file written by graphs.storage (repeatable)")
+    parser.add_argument("--warm", action="store_true", help="compile every graph before accepting requests")
+    parser.add_argument("--check", action="store_true",
+                        help="check a_star, alt and ch costs against ucs on every graph, then exit")
+    args = parser.parse_args(argv)
+    if args.check:
+        store = GraphStore()
+        for spec in args.graph:
+            name, _, path = spec.partition("=")
+            store.register(name, path)
+        mismatches = check_optimal(store)
+        for name, algorithm, start, goal, cost, optimal in mismatches:
+            print(f"{name}: {algorithm} {start!r} -> {goal!r} cost {cost}, optimal {optimal}")
+        print(f"{len(mismatches)} non-optimal answers")
+        return 1 if mismatches else 0
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
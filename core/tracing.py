@@ -0,0 +1,107 @@
+import json
+import sys
+from collections import deque
+
+_SEQUENCES = (list, tuple, set, frozenset, deque)
+
+
+class Tracer:
+    """
+    Receives one record per search iteration.
+
+    Searches take ``tracer=None`` and only touch the tracer behind an
+    ``if tracer is not None`` guard, so the default costs one comparison per
+    iteration and no snapshots of the open/closed lists are ever built.
+    Fields are passed as the live search structures; a tracer must copy what it
+    wants to keep.
+    """
+
+    def record(self, iteration, **fields):
+        raise NotImplementedError
+
+    def finish(self, result):
+        """Called once when the search returns, with its result."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _format(value, sep):
+    if value is None:
+        return ""
+    if isinstance(value, _SEQUENCES):
+        return "[" + sep.join(map(str, value)) + "]"
+    return value
+
+
+class TableTracer(Tracer):
+    """
+    Collects iterations and prints them as a `tabulate` grid when the search finishes.
+
+    This is the original teaching output: it snapshots the whole open/closed lists
+    every iteration, so it is O(n) per step and meant for small graphs only.
+    """
+
+    def __init__(self, sep=",", tablefmt="grid", out=None):
+        self.sep = sep
+        self.tablefmt = tablefmt
+        self.out = out
+        self.headers = None
+        self.rows = []
+
+    def record(self, iteration, **fields):
+        if self.headers is None:
+            self.headers = ["Iter", *fields]
+        self.rows.append([iteration, *(_format(v, self.sep) for v in fields.values())])
+
+    def render(self):
+        from tabulate import tabulate
+
+        return tabulate(self.rows, headers=self.headers or [], tablefmt=self.tablefmt)
+
+    def finish(self, result):
+        print(self.render(), file=self.out or sys.stdout)
+        self.headers = None
+        self.rows = []
+
+
+class JsonLinesTracer(Tracer):
+    """
+    Streams each iteration to a file as one JSON object per line.
+
+    Nothing is retained in memory between records. ``target`` is a path (opened
+    and owned by the tracer) or an already open text file.
+    """
+
+    def __init__(self, target, flush_every=1000):
+        self._owns = isinstance(target, (str, bytes)) or hasattr(target, "__fspath__")
+        self.file = open(target, "w", encoding="utf-8") if self._owns else target
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def record(self, iteration, **fields):
+        snapshot = {k: list(v) if isinstance(v, _SEQUENCES) else v for k, v in fields.items()}
+        self.file.write(json.dumps({"iter": iteration, **snapshot}, default=str))
+        self.file.write("\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.file.flush()
+            self._pending = 0
+
+    def finish(self, result):
+        if hasattr(result, "as_dict"):
+            result = result.as_dict()
+        self.file.write(json.dumps({"result": result}, default=str))
+        self.file.write("\n")
+        self.file.flush()
+        self._pending = 0
+
+    def close(self):
+        if self._owns and not self.file.closed:
+            self.file.close()
@@ -0,0 +1,252 @@
+from array import array
+from collections.abc import Mapping
+
+from graphs import graph7
+from graphs.heuristics import heuristics7
+from graphs.path_costs import g_costs7
+
+
+class CompiledGraph(Mapping):
+    """
+    Integer-indexed graph stored in compressed sparse row (CSR) form.
+
+    Node labels are interned to ids ``0 .. n-1``. The out-edges of node ``i`` are
+    ``targets[offsets[i]:offsets[i + 1]]`` with matching costs in ``weights`` and
+    the heuristic value of node ``i`` is ``h[i]``. All four are flat typed arrays,
+    so an edge costs 16 bytes instead of a list slot plus a tuple-keyed dict entry.
+
+    The mapping interface (label -> list of neighbour labels) together with the
+    ``costs``, ``heuristics`` and ``weighted`` views lets every search written
+    against the dict-of-lists graphs run on a compiled graph unchanged, while
+    hot loops can work on the integer arrays directly.
+    """
+    __slots__ = ("labels", "index", "offsets", "targets", "weights", "h", "_reverse", "_min_weight")
+
+    def __init__(self, labels, offsets, targets, weights, h, index=None):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)} if index is None else index
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.h = h
+        self._reverse = None
+        self._min_weight = None
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def min_weight(self):
+        """Cheapest edge cost (inf without edges); scanned once, then cached."""
+        if self._min_weight is None:
+            self._min_weight = min(self.weights, default=float('inf'))
+        return self._min_weight
+
+    def id_of(self, label):
+        return self.index[label]
+
+    def label_of(self, i):
+        return self.labels[i]
+
+    def neighbors(self, i):
+        """Neighbour ids of node id ``i``."""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def edges(self, i):
+        """``(neighbour id, cost)`` pairs for the out-edges of node id ``i``."""
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def edge_cost(self, u, v, default=float('inf')):
+        """Cost of the cheapest edge ``u -> v`` between node ids, or ``default``."""
+        targets, weights = self.targets, self.weights
+        best = default
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            if targets[e] == v and (best is default or weights[e] < best):
+                best = weights[e]
+        return best
+
+    def reverse(self):
+        """
+        The transposed graph (every edge ``u -> v`` becomes ``v -> u`` with the same
+        cost), sharing labels and heuristics. Built once with a counting sort and cached.
+        """
+        if self._reverse is None:
+            n, offsets, targets, weights = self.num_nodes, self.offsets, self.targets, self.weights
+            counts = array('q', bytes(8 * (n + 1)))
+            for v in targets:
+                counts[v + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            rev_offsets = array('q', counts)
+            rev_targets = array('q', bytes(8 * len(targets)))
+            rev_weights = array('d', bytes(8 * len(targets)))
+            for u in range(n):
+                for e in range(offsets[u], offsets[u + 1]):
+                    slot = counts[targets[e]]
+                    counts[targets[e]] = slot + 1
+                    rev_targets[slot] = u
+                    rev_weights[slot] = weights[e]
+            rev = CompiledGraph.__new__(CompiledGraph)
+            rev.labels, rev.index, rev.h = self.labels, self.index, self.h
+            rev.offsets, rev.targets, rev.weights = rev_offsets, rev_targets, rev_weights
+            rev._reverse, rev._min_weight = self, self._min_weight
+            self._reverse = rev
+        return self._reverse
+
+    def path_labels(self, ids):
+        """Translate a sequence of node ids back into labels."""
+        labels = self.labels
+        return [labels[i] for i in ids]
+
+    # --- Mapping interface: label -> list of neighbour labels ---
+    def __getitem__(self, label):
+        labels = self.labels
+        return [labels[t] for t in self.neighbors(self.index[label])]
+
+    def __contains__(self, label):
+        return label in self.index
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def costs(self):
+        """Read-only ``{(u, v): cost}`` view, the ``g_costs`` format."""
+        return _CostView(self)
+
+    @property
+    def heuristics(self):
+        """Read-only ``{node: h}`` view, the ``heuristics`` format."""
+        return _HeuristicView(self)
+
+    @property
+    def weighted(self):
+        """Read-only ``{node: [(neighbour, cost), ...]}`` view, the `uniform_cost_search` format."""
+        return _WeightedView(self)
+
+    def __repr__(self):
+        return f"CompiledGraph(nodes={self.num_nodes}, edges={self.num_edges})"
+
+
+class _CostView(Mapping):
+    __slots__ = ("_g",)
+
+    def __init__(self, compiled):
+        self._g = compiled
+
+    def __getitem__(self, edge):
+        g = self._g
+        u, v = edge
+        if u not in g.index or v not in g.index:
+            raise KeyError(edge)
+        cost = g.edge_cost(g.index[u], g.index[v], None)
+        if cost is None:
+            raise KeyError(edge)
+        return cost
+
+    def __iter__(self):
+        g = self._g
+        labels, targets = g.labels, g.targets
+        for u in range(g.num_nodes):
+            for e in range(g.offsets[u], g.offsets[u + 1]):
+                yield labels[u], labels[targets[e]]
+
+    def __len__(self):
+        return self._g.num_edges
+
+
+class _HeuristicView(Mapping):
+    __slots__ = ("_g",)
+
+    def __init__(self, compiled):
+        self._g = compiled
+
+    def __getitem__(self, label):
+        return self._g.h[self._g.index[label]]
+
+    def __iter__(self):
+        return iter(self._g.labels)
+
+    def __len__(self):
+        return self._g.num_nodes
+
+
+class _WeightedView(Mapping):
+    __slots__ = ("_g",)
+
+    def __init__(self, compiled):
+        self._g = compiled
+
+    def __getitem__(self, label):
+        g = self._g
+        labels = g.labels
+        return [(labels[t], w) for t, w in g.edges(g.index[label])]
+
+    def __iter__(self):
+        return iter(self._g.labels)
+
+    def __len__(self):
+        return self._g.num_nodes
+
+
+def compile_graph(graph, g_costs=None, heuristics=None, weighted=False, default_cost=1, default_heuristic=0.0):
+    """
+    Convert the dict forms used across this repo into a `CompiledGraph`.
+
+    Args:
+        graph: Adjacency list mapping a node -> list of neighbours, or, with
+            ``weighted=True``, a node -> list of ``(neighbour, cost)`` pairs.
+        g_costs: Optional ``{(u, v): cost}`` dict (see `graphs.path_costs`).
+        heuristics: Optional ``{node: h}`` dict (see `graphs.heuristics`).
+        weighted: Whether adjacency entries already carry their cost.
+        default_cost: Cost of an edge missing from ``g_costs``.
+        default_heuristic: Heuristic value of a node missing from ``heuristics``.
+
+    Returns:
+        CompiledGraph: Nodes keep the order in which they first appear, keys first.
+    """
+    g_costs = g_costs or {}
+    labels = list(graph.keys())
+    index = {label: i for i, label in enumerate(labels)}
+
+    def intern(label):
+        i = index.get(label)
+        if i is None:
+            i = index[label] = len(labels)
+            labels.append(label)
+        return i
+
+    offsets = array('q', [0])
+    targets = array('q')
+    weights = array('d')
+    for u in list(labels):
+        for entry in graph[u]:
+            if weighted:
+                v, cost = entry
+            else:
+                v, cost = entry, g_costs.get((u, entry), default_cost)
+            targets.append(intern(v))
+            weights.append(cost)
+        offsets.append(len(targets))
+    # Nodes that only appear as neighbours have no out-edges
+    offsets.extend([len(targets)] * (len(labels) + 1 - len(offsets)))
+
+    heuristics = heuristics or {}
+    h = array('d', (heuristics.get(label, default_heuristic) for label in labels))
+    return CompiledGraph(labels, offsets, targets, weights, h)
+
+
+if __name__ == '__main__':
+    compiled = compile_graph(graph7, g_costs7, heuristics7)
+    print(compiled)
+    for node in compiled:
+        print(node, "->", compiled.weighted[node], "h =", compiled.heuristics[node])
@@ -0,0 +1,123 @@
+"""
+Puzzle state spaces for the implicit-graph searches (see `core.problem`).
+"""
+import random
+
+from core.problem import Problem
+
+
+class SlidingPuzzle(Problem):
+    """
+    The (n*n - 1)-puzzle: slide tiles into the blank until the board is solved.
+
+    A board packs into one int: 4 bits per cell in row-major order (cell ``i``
+    at bits ``4 * i + 4`` upwards) and the blank's cell in the low 4 bits, so a
+    move is a couple of shifts and masks and never builds a tuple. Boards up to
+    4x4 (the 15-puzzle) fit. Every move costs 1 and the heuristic is the sum of
+    the tiles' Manhattan distances to their goal cells, which is admissible.
+    """
+
+    def __init__(self, tiles, goal=None):
+        """
+        Args:
+            tiles: Board in row-major order, 0 for the blank.
+            goal: Solved board; defaults to 1, 2, ..., n*n - 1 followed by the blank.
+        """
+        size = len(tiles)
+        width = int(round(size ** 0.5))
+        if width * width != size or not 2 <= width <= 4:
+            raise ValueError("SlidingPuzzle supports 2x2 to 4x4 boards")
+        if sorted(tiles) != list(range(size)):
+            raise ValueError(f"Tiles must be a permutation of 0..{size - 1}")
+        goal = list(range(1, size)) + [0] if goal is None else list(goal)
+        self.width = width
+        self.size = size
+        self.initial = self.encode(tiles)
+        self.goal = self.encode(goal)
+        # Cells the blank can swap with, per blank cell
+        self._moves = [
+            [cell + step for step, ok in ((-width, cell >= width), (width, cell < size - width),
+                                          (-1, cell % width > 0), (1, cell % width < width - 1)) if ok]
+            for cell in range(size)
+        ]
+        # _distance[tile][cell]: Manhattan distance from cell to the tile's goal cell
+        home = {tile: cell for cell, tile in enumerate(goal)}
+        self._distance = [
+            [0] * size if tile == 0 else
+            [abs(cell // width - home[tile] // width) + abs(cell % width - home[tile] % width) for cell in range(size)]
+            for tile in range(size)
+        ]
+
+    def encode(self, tiles):
+        state = tiles.index(0)
+        for cell, tile in enumerate(tiles):
+            state |= tile << (4 * cell + 4)
+        return state
+
+    def decode(self, state):
+        return tuple((state >> (4 * cell + 4)) & 15 for cell in range(self.size))
+
+    def successors(self, state):
+        blank = state & 15
+        for cell in self._moves[blank]:
+            tile = (state >> (4 * cell + 4)) & 15
+            # Move the tile into the blank's cell and record the new blank cell
+            yield (state - (tile << (4 * cell + 4)) + (tile << (4 * blank + 4))) & ~15 | cell, 1
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def heuristic(self, state):
+        distance = self._distance
+        total = 0
+        state >>= 4
+        for cell in range(self.size):
+            total += distance[state & 15][cell]
+            state >>= 4
+        return total
+
+    def is_solvable(self):
+        """Whether the goal is reachable: the two boards must have the same permutation parity."""
+        return _parity(self.decode(self.initial), self.width) == _parity(self.decode(self.goal), self.width)
+
+    def show(self, state):
+        tiles = self.decode(state)
+        return "\n".join(" ".join(f"{t:>2}" if t else " ." for t in tiles[row:row + self.width])
+                         for row in range(0, self.size, self.width))
+
+    @classmethod
+    def scrambled(cls, width, moves, seed=None):
+        """A puzzle made by ``moves`` random slides from the solved board, so always solvable."""
+        rng = random.Random(seed)
+        puzzle = cls(list(range(1, width * width)) + [0])
+        state, previous = puzzle.goal, None
+        for _ in range(moves):
+            options = [s for s, _ in puzzle.successors(state) if s != previous]
+            previous, state = state, rng.choice(options)
+        puzzle.initial = state
+        return puzzle
+
+
+def _parity(tiles, width):
+    tiles = list(tiles)
+    numbers = [t for t in tiles if t]
+    inversions = sum(a > b for i, a in enumerate(numbers) for b in numbers[i + 1:])
+    if width % 2:
+        return inversions % 2
+    # On even widths a vertical move also changes the blank's row, so count that too
+    return (inversions + tiles.index(0) // width) % 2
+
+
+if __name__ == '__main__':
+    from adversarial.a_star import a_star
+    from uninformed.breadth_first_search import breadth_first_path
+
+    puzzle = SlidingPuzzle([1, 2, 3, 4, 0, 6, 7, 5, 8])
+    print(puzzle.show(puzzle.initial), "\nsolvable:", puzzle.is_solvable())
+    result = breadth_first_path(puzzle, None)
+    print("BFS:", result.cost, "moves,", result.stats)
+
+    puzzle = SlidingPuzzle.scrambled(4, 60, seed=3)
+    result = a_star(puzzle, None, None, None)
+    print(puzzle.show(puzzle.initial))
+    print("A*:", result.cost, "moves,", result.stats)
@@ -0,0 +1,49 @@
+from graphs.compiled import CompiledGraph
+
+# id(graph) -> (graph, weighted, signature, reverse); small so that cached
+# graphs are not kept alive indefinitely
+_CACHE = {}
+_CACHE_SIZE = 8
+
+
+def reverse_adjacency(graph, weighted=False):
+    """
+    Reverse adjacency list of ``graph`` (every edge ``u -> v`` becomes ``v -> u``).
+
+    The result is cached per graph object and rebuilt when the number of nodes or
+    edges changes; mutate a graph in place without changing those counts and you
+    must call `clear_reverse_cache`. A `CompiledGraph` caches its own reverse.
+
+    Args:
+        graph: Adjacency list mapping a node -> list of neighbors, or with
+            ``weighted=True`` a node -> list of (neighbor, cost) pairs.
+        weighted: Whether adjacency entries carry their cost.
+
+    Returns:
+        dict: Same format as ``graph``, with every node of ``graph`` as a key.
+    """
+    if isinstance(graph, CompiledGraph):
+        return graph.reverse()
+
+    signature = (len(graph), sum(len(children) for children in graph.values()))
+    hit = _CACHE.get(id(graph))
+    if hit is not None and hit[0] is graph and hit[1] == weighted and hit[2] == signature:
+        return hit[3]
+
+    reverse = {node: [] for node in graph}
+    for node, children in graph.items():
+        for entry in children:
+            if weighted:
+                child, cost = entry
+                reverse.setdefault(child, []).append((node, cost))
+            else:
+                reverse.setdefault(entry, []).append(node)
+
+    if len(_CACHE) >= _CACHE_SIZE:
+        _CACHE.pop(next(iter(_CACHE)))
+    _CACHE[id(graph)] = (graph, weighted, signature, reverse)
+    return reverse
+
+
+def clear_reverse_cache():
+    _CACHE.clear()
@@ -1,42 +1,60 @@
 import heapq
 from typing import List, Callable, Optional, Tuple
-from tabulate import tabulate
 
+from core.problem import Problem
+from core.results import SearchResult, SearchStats
+from core.tracing import TableTracer
 from graphs import graph2
 from graphs.heuristics import heuristics2
+from informed.memory_bounded import beam_search
 
-# Public module-level state (used by callers to inspect results)
-visited_order = []  # Records node expansion order
-found_path = []     # Holds the path to goal when found
 
-def best_first_search(graph, goal, heuristic: Callable, start = None):
+def best_first_search(graph, goal, heuristic: Callable, start = None, budget=None, beam_width=None):
     """
     Greedy Best-First Search (GBFS).
 
     - Expands the node with the lowest heuristic value h(n) at each step.
     - Not guaranteed to find the shortest path, only a path guided by the heuristic.
-    - Updates `visited_order` with the order nodes are expanded.
-    - When the goal is found, updates `found_path` with the reconstructed path.
-    - Returns True if the goal is found, else False.
+    - Records the order nodes are expanded in the result's ``visited_order``.
+    - Keeps all state local, so concurrent calls do not interfere.
 
     Args:
-        graph: Adjacency list mapping a node -> list of neighbors.
-        start: Starting node.
+        graph: Adjacency list mapping a node -> list of neighbors, or a
+            `core.problem.Problem`; a problem's goal test replaces ``goal``, and its
+            own heuristic is used when ``heuristic`` is None.
+        start: Starting node; for a problem, None starts from its initial state.
         goal: Target node to find.
         heuristic: Function h(n, goal) -> non-negative estimate of "distance" from n to goal.
+        budget: Optional `core.results.Budget`; the search stops with "CUTOFF" when spent.
+        beam_width: Optional frontier cap; runs a greedy
+            `informed.memory_bounded.beam_search` keeping this many nodes per layer
+            (no ``visited_order``).
 
     Returns:
-        bool: True if goal found, otherwise False.
+        SearchResult: status "SUCCESS" with the path and its length in edges, "FAIL",
+        or "CUTOFF".
     """
-    # Reset the observable state for a clean run
-    visited_order.clear()
-    found_path.clear()
+    if beam_width is not None:
+        return beam_search(graph, heuristic, start, goal, beam_width, greedy=True, budget=budget)
+    stats = SearchStats()
+    visited_order = []
+    if isinstance(graph, Problem):
+        successors = lambda node: (child for child, _ in graph.successors(node))
+        is_goal = graph.is_goal
+        if heuristic is None:
+            heuristic = lambda node, _: graph.heuristic(node)
+        if start is None:
+            start = graph.initial
+    else:
+        successors = lambda node: graph.get(node, [])
+        is_goal = lambda node: node == goal
 
     # Priority queue of (heuristic_value, tie_breaker, node)
     # tie_breaker prevents comparison of nodes when heuristic ties occur
     pq: List[Tuple] = []
     counter = 0
     heapq.heappush(pq, (heuristic(start, goal), counter, start))
+    stats.pushes = stats.peak_frontier = 1
 
     parent = {start: None}
     visited = set()
@@ -44,13 +62,14 @@ def best_first_search(graph, goal, heuristic: Callable, start = None):
     while pq:
         _, _, node = heapq.heappop(pq)
         if node in visited:
+            stats.stale_pops += 1
             continue
         visited.add(node)
 
         # Record expansion order
         visited_order.append(node)
 
-        if node == goal:
+        if is_goal(node):
             # Reconstruct a path
             path = []
             cur: Optional = node
@@ -58,63 +77,85 @@ def best_first_search(graph, goal, heuristic: Callable, start = None):
                 path.append(cur)
                 cur = parent[cur]
             path.reverse()
+            return SearchResult.success(path, len(path) - 1, stats, visited_order=visited_order)
+        if budget is not None and budget.exceeded(stats.expansions):
+            return SearchResult.failure(stats, status="CUTOFF", visited_order=visited_order)
 
-            # Mutate in place so external references see the update
-            found_path.extend(path)
-            return True
-
-        for neighbor in graph.get(node, []):
+        stats.expansions += 1
+        for neighbor in successors(node):
             if neighbor not in visited and neighbor not in parent:
                 parent[neighbor] = node
                 counter += 1
                 heapq.heappush(pq, (heuristic(neighbor, goal), counter, neighbor))
+                stats.pushes += 1
+        stats.peak_frontier = max(stats.peak_frontier, len(pq))
 
-    return False
+    return SearchResult.failure(stats, visited_order=visited_order)
 
 
-def bfs(graph, goal, heuristic, start):
-    heuristic = lambda node: heuristic.get(node, float('inf'))
-    open_l = [(start, heuristic(start))]
+def bfs(graph, goal, heuristic, start, tracer=None):
+    """
+    Greedy best-first search over a heuristic table, traced like the uninformed searches.
+
+    Args:
+        graph: Adjacency list mapping a node -> list of neighbors.
+        goal: Target node to find.
+        heuristic: Dict mapping a node -> heuristic value (see `graphs.heuristics`).
+        start: Starting node.
+        tracer: Optional `core.tracing.Tracer` receiving X/Open/Closed every iteration,
+            e.g. `TableTracer()` for the grid table.
+
+    Returns:
+        SearchResult: status "SUCCESS" with the path and its length in edges, or "FAIL";
+        ``visited_order`` is the closed list.
+    """
+    stats = SearchStats()
+    h = lambda node: heuristic.get(node, float('inf'))
+    open_l = [(h(start), start)]
+    stats.pushes = stats.peak_frontier = 1
     closed_list = []
     came_from = {start: None}
     cost_so_far = {start: 0}
     X = None
     iteration = 0
-    log = []
 
     while open_l:
-        log.append([
-            iteration, X,
-            "[" + ",".join(f"{node}{h}" for node, h in open_l) + "]",
-            "[" + ",".join(closed_list) + "]"
-        ])
+        if tracer is not None:
+            tracer.record(iteration, X=X, Open=[f"{node}{h_value}" for h_value, node in open_l], Closed=closed_list)
         iteration += 1
-        X, _ = heapq.heappop(open_l)
+        _, X = heapq.heappop(open_l)
 
 
         if X == goal:
             # Reconstruct path
             path = []
-            while X:
+            while X is not None:
                 path.append(X)
                 X = came_from[X]
             path.reverse()
-            print(tabulate(log, headers=["Iter", "X", "Open", "Closed"], tablefmt="grid"))
-            return "[" + "".join(path) + "]"
+            result = SearchResult.success(path, len(path) - 1, stats, visited_order=closed_list)
+            if tracer is not None: tracer.finish(result)
+            return result
 
         closed_list.append(X)
+        stats.expansions += 1
 
         for neighbor in graph.get(X, []):
             new_cost = cost_so_far[X] + 1  # assuming uniform cost
             if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                 cost_so_far[neighbor] = new_cost
                 came_from[neighbor] = X
-                heapq.heappush(open_l, (neighbor, heuristic(neighbor)))
-
-    log.append([iteration + 1, X, "[" + "".join(node for node, _ in open_l) + "]", "[" + "".join(closed_list) + "]"])
-    print(tabulate(log, headers=["Iter", "X", "Open", "Closed"], tablefmt="grid"))
-    return "FAIL"
+                heapq.heappush(open_l, (h(neighbor), neighbor))
+                stats.pushes += 1
+        stats.peak_frontier = max(stats.peak_frontier, len(open_l))
 
+    result = SearchResult.failure(stats, visited_order=closed_list)
+    if tracer is not None:
+        tracer.record(iteration + 1, X=X, Open=[node for _, node in open_l], Closed=closed_list)
+        tracer.finish(result)
+    return result
 
 if __name__ == '__main__':
-    result = bfs(graph2, 'A', 'P', heuristics2)
\ No newline at end of file
+    result = bfs(graph2, 'P', heuristics2, 'A', tracer=TableTracer())
+    print("Result:", "[" + "".join(result.path) + "]" if result.found else result.status)
+    print("Stats:", result.stats)
\ No newline at end of file
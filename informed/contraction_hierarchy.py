@@ -0,0 +1,347 @@
+import heapq
+import pickle
+from array import array
+from math import inf
+
+from core.results import SearchResult, SearchStats
+from graphs import graph7, graph8
+from graphs.compiled import CompiledGraph
+from graphs.path_costs import g_costs7, g_costs8
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy index for repeated shortest-path queries on a static weighted graph.
+
+    Preprocessing contracts the nodes one at a time in order of importance.
+    Removing node v adds a shortcut u -> w (cost c(u, v) + c(v, w)) for every pair
+    of neighbors whose shortest connection ran through v. A query then runs a
+    bidirectional Dijkstra that only climbs to more important nodes, which
+    settles a few dozen nodes instead of a large part of the graph.
+
+    The index is a pair of CSR "upward" graphs over node ranks: ``up`` holds
+    every edge u -> w with rank[w] > rank[u] at u, ``down`` every edge u -> v
+    with rank[u] > rank[v] at v. ``*_middle`` gives the contracted node of a
+    shortcut (or -1 for an original edge) so paths can be unpacked. Build it with
+    `build`, persist it with `save` / `load`.
+    """
+
+    def __init__(self, labels, rank, up, down):
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.rank = rank
+        self.up_offsets, self.up_targets, self.up_weights, self.up_middle = up
+        self.down_offsets, self.down_targets, self.down_weights, self.down_middle = down
+
+    @classmethod
+    def build(cls, graph, g_costs=None, settle_limit=200):
+        """
+        Contract ``graph`` and return the index.
+
+        Args:
+            graph: Adjacency list mapping a node -> list of neighbors (costs from
+                ``g_costs``, default 1), or a `CompiledGraph`.
+            g_costs: Dict mapping (u, v) -> non-negative edge cost.
+            settle_limit: Nodes a witness search may settle before it gives up and
+                the shortcut is added anyway. Lower builds faster but adds more
+                (harmless) shortcuts.
+        """
+        if isinstance(graph, CompiledGraph):
+            labels = list(graph.labels)
+            edges = ((u, v, w) for u in range(graph.num_nodes) for v, w in graph.edges(u))
+        else:
+            g_costs = g_costs or {}
+            labels = list(graph.keys())
+            index = {label: i for i, label in enumerate(labels)}
+            for children in graph.values():
+                for child in children:
+                    if child not in index:
+                        index[child] = len(labels)
+                        labels.append(child)
+            edges = ((index[u], index[v], g_costs.get((u, v), 1)) for u in graph for v in graph[u])
+
+        n = len(labels)
+        out_edges = [dict() for _ in range(n)]  # u -> {w: cost}
+        in_edges = [dict() for _ in range(n)]   # w -> {u: cost}
+        middle = {}  # (u, w) -> contracted node, for shortcuts
+        for u, v, w in edges:
+            if w < 0:
+                raise ValueError("Contraction hierarchies require non-negative edge costs.")
+            if u != v and w < out_edges[u].get(v, inf):
+                out_edges[u][v] = in_edges[v][u] = w
+
+        rank = array('q', [-1]) * n
+        contracted_neighbors = [0] * n
+        level = [0] * n
+        # Edges present when a node is contracted are exactly the ones the query needs
+        up = [[] for _ in range(n)]
+        down = [[] for _ in range(n)]
+
+        builder = _Contractor(out_edges, in_edges, settle_limit)
+        current = [builder.estimate(v, 0, 0) for v in range(n)]
+        queue = [(priority, v) for v, priority in enumerate(current)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            priority, v = heapq.heappop(queue)
+            if rank[v] != -1 or priority != current[v]:
+                continue  # contracted, or superseded by a newer estimate
+            # The queue orders by a cheap estimate; the witness searches run only
+            # for the node about to be contracted. If it no longer comes first it
+            # goes back, otherwise it is contracted with the shortcuts just found
+            priority, shortcuts = builder.priority(v, contracted_neighbors[v], level[v])
+            if queue and priority > queue[0][0]:
+                current[v] = priority
+                heapq.heappush(queue, (priority, v))
+                continue
+
+            get_middle = middle.get
+            for w, cost in out_edges[v].items():
+                up[v].append((w, cost, get_middle((v, w), -1)))
+            for u, cost in in_edges[v].items():
+                down[v].append((u, cost, get_middle((u, v), -1)))
+            for u, w, cost in shortcuts:
+                if cost < out_edges[u].get(w, inf):
+                    out_edges[u][w] = in_edges[w][u] = cost
+                    middle[u, w] = v
+            rank[v] = order
+            order += 1
+            for u in in_edges[v]:
+                del out_edges[u][v]
+            for w in out_edges[v]:
+                del in_edges[w][v]
+            neighbors = in_edges[v].keys() | out_edges[v].keys()
+            out_edges[v], in_edges[v] = {}, {}
+            # Only the neighbors' edges changed, so only their estimates move
+            for x in neighbors:
+                contracted_neighbors[x] += 1
+                level[x] = max(level[x], level[v] + 1)
+                current[x] = builder.estimate(x, contracted_neighbors[x], level[x])
+                heapq.heappush(queue, (current[x], x))
+
+        return cls(labels, rank, _to_csr(up), _to_csr(down))
+
+    def query(self, start, goal):
+        """
+        Shortest path from ``start`` to ``goal``.
+
+        Returns:
+            SearchResult: like `uniform_cost_search`; the counters cover the
+            upward searches on the hierarchy.
+        """
+        stats = SearchStats()
+        if start not in self.index or goal not in self.index:
+            return SearchResult.failure(stats)
+        s, t = self.index[start], self.index[goal]
+        cost, meet, parent_f, parent_b = self._search(s, t, stats)
+        if meet is None:
+            return SearchResult.failure(stats)
+
+        nodes = []
+        node = meet
+        while node != -1:
+            nodes.append(node)
+            node = parent_f[node]
+        nodes.reverse()
+        node = parent_b[meet]
+        while node != -1:
+            nodes.append(node)
+            node = parent_b[node]
+
+        path = [nodes[0]]
+        for u, w in zip(nodes, nodes[1:]):
+            self._unpack(u, w, path)
+        return SearchResult.success([self.labels[i] for i in path], cost, stats)
+
+    def cost(self, start, goal):
+        """Shortest-path cost only (skips path unpacking)."""
+        if start not in self.index or goal not in self.index:
+            return inf
+        return self._search(self.index[start], self.index[goal], SearchStats())[0]
+
+    def _search(self, s, t, stats):
+        dist_f, dist_b = {s: 0.0}, {t: 0.0}
+        parent_f, parent_b = {s: -1}, {t: -1}
+        queue_f, queue_b = [(0.0, s)], [(0.0, t)]
+        best, meet = (0.0, s) if s == t else (inf, None)
+        # Each side relaxes edges towards higher ranks; the opposite CSR lists the
+        # edges into ``node`` from higher ranks, which stall-on-demand checks
+        up = self.up_offsets, self.up_targets, self.up_weights
+        down = self.down_offsets, self.down_targets, self.down_weights
+        sides = ((queue_f, dist_f, parent_f, dist_b, up, down), (queue_b, dist_b, parent_b, dist_f, down, up))
+        heappush, heappop = heapq.heappush, heapq.heappop
+        expansions, pushes, stale_pops, peak = 0, 2, 0, 2
+        while queue_f or queue_b:
+            for queue, dist, parent, other, (offsets, targets, weights), (in_offsets, in_targets, in_weights) in sides:
+                # Each side stops on its own once its queue top can no longer improve `best`
+                if queue and queue[0][0] >= best:
+                    queue.clear()
+                if not queue:
+                    continue
+                d, node = heappop(queue)
+                if d > dist[node]:
+                    stale_pops += 1
+                    continue
+                if node in other and d + other[node] < best:
+                    best, meet = d + other[node], node
+                # Stall-on-demand: a higher node already reached gives a shorter way
+                # here, so ``d`` is not this side's distance and relaxing from it is wasted
+                stalled = False
+                get = dist.get
+                for e in range(in_offsets[node], in_offsets[node + 1]):
+                    if get(in_targets[e], inf) + in_weights[e] < d:
+                        stalled = True
+                        break
+                if stalled:
+                    continue
+                expansions += 1
+                for e in range(offsets[node], offsets[node + 1]):
+                    child, nd = targets[e], d + weights[e]
+                    if nd < get(child, inf):
+                        dist[child] = nd
+                        parent[child] = node
+                        heappush(queue, (nd, child))
+                        pushes += 1
+            if len(queue_f) + len(queue_b) > peak:
+                peak = len(queue_f) + len(queue_b)
+        stats.expansions, stats.pushes, stats.stale_pops, stats.peak_frontier = expansions, pushes, stale_pops, peak
+        return best, meet, parent_f, parent_b
+
+    def _unpack(self, u, w, path):
+        """Append the original nodes of edge u -> w (excluding u) to ``path``."""
+        stack = [(u, w)]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middle(a, b)
+            if middle == -1:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+
+    def _middle(self, a, b):
+        if self.rank[b] > self.rank[a]:
+            offsets, targets, weights, middles, row, other = \
+                self.up_offsets, self.up_targets, self.up_weights, self.up_middle, a, b
+        else:
+            offsets, targets, weights, middles, row, other = \
+                self.down_offsets, self.down_targets, self.down_weights, self.down_middle, b, a
+        best, middle = inf, -1
+        for e in range(offsets[row], offsets[row + 1]):
+            if targets[e] == other and weights[e] < best:
+                best, middle = weights[e], middles[e]
+        return middle
+
+    @property
+    def num_shortcuts(self):
+        return sum(1 for m in self.up_middle if m != -1) + sum(1 for m in self.down_middle if m != -1)
+
+    def save(self, path):
+        """Write the index to ``path`` (arrays are stored as raw bytes)."""
+        state = (self.labels, self.rank,
+                 (self.up_offsets, self.up_targets, self.up_weights, self.up_middle),
+                 (self.down_offsets, self.down_targets, self.down_weights, self.down_middle))
+        with open(path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(*pickle.load(f))
+
+
+class _Contractor:
+    """Witness searches and node priorities on the remaining (uncontracted) graph."""
+
+    def __init__(self, out_edges, in_edges, settle_limit):
+        self.out_edges = out_edges
+        self.in_edges = in_edges
+        self.settle_limit = settle_limit
+
+    def shortcuts(self, v):
+        """Shortcuts (u, w, cost) needed if ``v`` is contracted now."""
+        out_v = self.out_edges[v]
+        needed = []
+        for u, cost_in in self.in_edges[v].items():
+            targets = {w: cost_in + cost_out for w, cost_out in out_v.items() if w != u}
+            if not targets:
+                continue
+            witness = self._witness(u, v, max(targets.values()), targets)
+            for w, cost in targets.items():
+                if witness.get(w, inf) > cost:
+                    needed.append((u, w, cost))
+        return needed
+
+    def _witness(self, source, skip, limit, targets):
+        """Bounded Dijkstra from ``source`` avoiding ``skip``; distances to ``targets`` found."""
+        out_edges = self.out_edges
+        dist = {source: 0.0}
+        queue = [(0.0, source)]
+        settled = 0
+        remaining = len(targets)
+        while queue and settled < self.settle_limit and remaining:
+            d, node = heapq.heappop(queue)
+            if d > dist[node]:
+                continue
+            settled += 1
+            if node in targets:
+                remaining -= 1
+            for child, cost in out_edges[node].items():
+                nd = d + cost
+                # Nothing farther than ``limit`` can witness a shortcut
+                if nd <= limit and child != skip and nd < dist.get(child, inf):
+                    dist[child] = nd
+                    heapq.heappush(queue, (nd, child))
+        return dist
+
+    def priority(self, v, contracted_neighbors, level):
+        """
+        (priority, shortcuts) of contracting ``v`` now, from its edge difference
+        (shortcuts added minus edges removed), its number of already contracted
+        neighbors and the depth ``level`` of the hierarchy below it.
+        """
+        needed = self.shortcuts(v)
+        removed = len(self.out_edges[v]) + len(self.in_edges[v])
+        return _weigh(len(needed) - removed, contracted_neighbors, level), needed
+
+    def estimate(self, v, contracted_neighbors, level):
+        """`priority` with witnesses of at most two edges, found without a search."""
+        out_v, in_v, out_edges, in_edges = self.out_edges[v], self.in_edges[v], self.out_edges, self.in_edges
+        needed = 0
+        for u, cost_in in in_v.items():
+            out_u = out_edges[u]
+            for w, cost_out in out_v.items():
+                cost = cost_in + cost_out
+                if w == u or out_u.get(w, inf) <= cost:
+                    continue
+                # A middle node x with u -> x -> w, scanning the shorter side
+                first, second = (out_u, in_edges[w]) if len(out_u) <= len(in_edges[w]) else (in_edges[w], out_u)
+                for x, c1 in first.items():
+                    if x != v and c1 + second.get(x, inf) <= cost:
+                        break
+                else:
+                    needed += 1
+        return _weigh(needed - len(out_v) - len(in_v), contracted_neighbors, level)
+
+
+def _weigh(edge_difference, contracted_neighbors, level):
+    # Shortcuts dominate; the other two terms spread contractions over the graph
+    return 2 * edge_difference + contracted_neighbors + level
+
+
+def _to_csr(rows):
+    offsets, targets, weights, middles = array('q', [0]), array('q'), array('d'), array('q')
+    for row in rows:
+        for target, cost, middle in row:
+            targets.append(target)
+            weights.append(cost)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return offsets, targets, weights, middles
+
+
+if __name__ == '__main__':
+    for graph, g_costs, start, goal in ((graph7, g_costs7, 'S', 'M'), (graph8, g_costs8, 'A', 'J')):
+        ch = ContractionHierarchy.build(graph, g_costs)
+        result = ch.query(start, goal)
+        print(f"{start} -> {goal}: {result.path} (cost {result.cost}), {ch.num_shortcuts} shortcuts")
@@ -1,3 +1,5 @@
+from core.problem import Problem
+from core.results import SearchResult, SearchStats
 from graphs import graph5
 from graphs.heuristics import heuristics2
 
@@ -13,17 +15,23 @@ def hill_climbing(graph, goal, heuristic, start=None, allow_sideways=True):
     moves if enabled) heuristic value exists, or when the goal state is reached.
 
     :param graph: A dictionary representing the graph, where keys are nodes and values
-        are lists of neighbors.
+        are lists of neighbors, or a `core.problem.Problem`, whose goal test and
+        heuristic replace ``goal`` and ``heuristic``. On a problem the walk also
+        stops when a sideways move would revisit a state, since its plateaus may
+        be unbounded.
     :param goal: The target goal node to stop the search.
     :param heuristic: A dictionary containing heuristic cost values for each node.
     :param start: Optional starting node for the search. If not provided, the first key
         from the graph is taken as the starting node.
     :param allow_sideways: A boolean flag indicating whether sideways moves (when
         heuristic values are equal) are permitted. Defaults to True.
-    :return: A list representing the path from the start node to the goal or to the
-        last reachable node.
+    :return: A `SearchResult` whose path is the walk from the start node to the goal or
+        to the last reachable node; status is 'SUCCESS' only if the goal was reached.
     """
-    if not graph.keys():  return [start]
+    stats = SearchStats()
+    if isinstance(graph, Problem):
+        return _hill_climbing_problem(graph, graph.initial if start is None else start, allow_sideways, stats)
+    if not graph.keys():  return _result([start], goal, stats)
     if not start: start = list(graph.keys())[0]
 
     current = start
@@ -33,6 +41,7 @@ def hill_climbing(graph, goal, heuristic, start=None, allow_sideways=True):
         neighbors = graph.get(current, [])
         if not neighbors:
             break
+        stats.expansions += 1
 
         # Choose a neighbor with the lowest heuristic cost
         next_state = min(neighbors, key=lambda node: heuristic.get(node, float('inf')))
@@ -45,14 +54,51 @@ def hill_climbing(graph, goal, heuristic, start=None, allow_sideways=True):
 
         current = next_state
         path.append(current)
+        stats.pushes += 1
 
         if goal and current == goal:
             break
 
-    return path
+    return _result(path, goal, stats)
 
 
+def _hill_climbing_problem(problem, start, allow_sideways, stats):
+    h = problem.heuristic
+    current, current_h = start, h(start)
+    path, seen = [current], {current}
+
+    while not problem.is_goal(current):
+        best, best_h = None, float('inf')
+        for child, _ in problem.successors(current):
+            child_h = h(child)
+            if child_h < best_h:
+                best, best_h = child, child_h
+        if best is None:
+            break
+        stats.expansions += 1
+
+        if best_h > current_h or (best_h == current_h and (not allow_sideways or best in seen)):
+            break
+
+        current, current_h = best, best_h
+        path.append(current)
+        seen.add(current)
+        stats.pushes += 1
+
+    stats.peak_frontier = 1
+    if problem.is_goal(current):
+        return SearchResult.success(path, len(path) - 1, stats)
+    return SearchResult("FAIL", path, float('inf'), stats.stop())
+
+
+def _result(path, goal, stats):
+    # Local search keeps its walk even when it gets stuck short of the goal
+    stats.peak_frontier = 1
+    if path[-1] == goal:
+        return SearchResult.success(path, len(path) - 1, stats)
+    return SearchResult("FAIL", path, float('inf'), stats.stop())
+
 
 if __name__ == '__main__':
     result = hill_climbing(graph5, '0', heuristics2)
-    print("Path:", result)
+    print("Path:", result.path, result.status)
@@ -0,0 +1,133 @@
+from math import inf
+
+from core.results import SearchResult, SearchStats
+from graphs import graph7, graph8
+from graphs.compiled import CompiledGraph
+from graphs.heuristics import heuristics7, heuristics8
+from graphs.path_costs import g_costs7, g_costs8
+
+_DONE = object()
+
+
+def ida_star(graph, heuristics, start, goal, g_costs=None, max_iterations=None):
+    """
+    Iterative Deepening A* (IDA*).
+
+    Repeats a depth-first search bounded by f = g + h, raising the bound each
+    time to the smallest f that exceeded it. Each pass runs on an explicit stack
+    of neighbor iterators and only remembers the current path, so memory is
+    linear in the solution depth instead of the A* frontier. Optimal when the
+    heuristic is admissible.
+
+    Args:
+        graph: Adjacency list mapping a node -> list of neighbors, or a `CompiledGraph`.
+        heuristics: Dict mapping a node -> h(n) (see `graphs.heuristics`), or a
+            callable h(n, goal) such as `informed.heuristic`. For a `CompiledGraph`
+            it may be None to use the compiled heuristic values.
+        start: Starting node.
+        goal: Target node.
+        g_costs: Dict mapping (u, v) -> edge cost; missing edges cost 1. Ignored for a
+            `CompiledGraph`, which carries its own edge costs.
+        max_iterations: Optional cap on the number of bound increases.
+
+    Returns:
+        SearchResult: status "SUCCESS" with the path and its cost, "FAIL" when the goal
+        is unreachable, or "CUTOFF" when ``max_iterations`` ran out. ``iterations``
+        holds the expansions of each pass.
+    """
+    stats = SearchStats()
+    if isinstance(graph, CompiledGraph):
+        if start not in graph or goal not in graph:
+            if start == goal:
+                return SearchResult.success([start], 0, stats, iterations=[])
+            return SearchResult.failure(stats, iterations=[])
+        if heuristics is None:
+            h = graph.h.__getitem__
+        else:
+            estimate = _estimator(heuristics, goal)
+            h = lambda i: estimate(graph.labels[i])
+        status, path, cost, expansions = _ida_star(graph.edges, h, graph.id_of(start), graph.id_of(goal),
+                                                   max_iterations, stats)
+        if path is not None:
+            path = graph.path_labels(path)
+    else:
+        g_costs = g_costs or {}
+        edges = lambda node: ((child, g_costs.get((node, child), 1)) for child in graph.get(node, []))
+        status, path, cost, expansions = _ida_star(edges, _estimator(heuristics, goal), start, goal,
+                                                   max_iterations, stats)
+
+    if path is None:
+        return SearchResult.failure(stats, status=status, iterations=expansions)
+    return SearchResult.success(path, cost, stats, iterations=expansions)
+
+
+def _estimator(heuristics, goal):
+    if callable(heuristics):
+        return lambda node: heuristics(node, goal)
+    return lambda node: heuristics.get(node, 0)
+
+
+def _ida_star(edges, h, start, goal, max_iterations, stats):
+    bound = h(start)
+    expansions_per_iteration = []
+    while max_iterations is None or len(expansions_per_iteration) < max_iterations:
+        before = stats.expansions
+        path, cost, next_bound = _bounded_search(edges, h, start, goal, bound, stats)
+        expansions_per_iteration.append(stats.expansions - before)
+        if path is not None:
+            return "SUCCESS", path, cost, expansions_per_iteration
+        if next_bound == inf:
+            return "FAIL", None, inf, expansions_per_iteration
+        bound = next_bound
+    return "CUTOFF", None, inf, expansions_per_iteration
+
+
+def _bounded_search(edges, h, start, goal, bound, stats):
+    """One depth-first pass pruned at f > bound; returns (path, cost, next_bound)."""
+    if start == goal:
+        return [start], 0, inf
+
+    path = [start]
+    g_path = [0]
+    on_path = {start}
+    stack = [iter(edges(start))]
+    stats.expansions += 1
+    stats.pushes += 1
+    stats.peak_frontier = max(stats.peak_frontier, 1)
+    next_bound = inf
+
+    while stack:
+        entry = next(stack[-1], _DONE)
+        if entry is _DONE:
+            stack.pop()
+            on_path.discard(path.pop())
+            g_path.pop()
+            continue
+
+        child, cost = entry
+        if child in on_path:
+            continue
+        g = g_path[-1] + cost
+        f = g + h(child)
+        if f > bound:
+            next_bound = min(next_bound, f)
+            continue
+        if child == goal:
+            path.append(child)
+            return path, g, next_bound
+
+        path.append(child)
+        g_path.append(g)
+        on_path.add(child)
+        stack.append(iter(edges(child)))
+        stats.expansions += 1
+        stats.pushes += 1
+        if len(stack) > stats.peak_frontier:
+            stats.peak_frontier = len(stack)
+
+    return None, inf, next_bound
+
+
+if __name__ == '__main__':
+    for result in (ida_star(graph7, heuristics7, 'S', 'M', g_costs7), ida_star(graph8, heuristics8, 'A', 'J', g_costs8)):
+        print("Path:", result.path, "Cost:", result.cost, "Expansions per iteration:", result.iterations)
@@ -0,0 +1,252 @@
+import heapq
+from itertools import count
+from math import inf
+
+from adversarial.a_star import a_star
+from core.results import SearchResult, SearchStats
+from graphs import graph8
+from graphs.compiled import CompiledGraph
+from graphs.heuristics import heuristics8
+from graphs.path_costs import g_costs8
+
+
+class LPAStar:
+    """
+    Lifelong Planning A* (LPA*): a start-to-goal search that is repaired, not rerun,
+    after edge changes.
+
+    Every node keeps g, its cost the last time it was expanded, and rhs, the
+    one-step lookahead min over predecessors p of g(p) + c(p, n). Nodes where the two
+    differ are "inconsistent" and wait in a priority queue keyed like A*
+    ([min(g, rhs) + h, min(g, rhs)]). `plan` expands inconsistent nodes until the
+    goal is consistent and no queued key beats its own, which on the first call is
+    exactly an A* search. After `set_cost`, `add_edge` or `remove_edge`, only the
+    nodes whose shortest path ran through the changed edges become inconsistent,
+    so the next `plan` touches the affected part of the search tree and nothing else.
+
+    The graph is held as successor and predecessor dicts, so the caller's graph and
+    cost table are never modified. Edge costs must be positive and the heuristic
+    consistent (as for `a_star` without reopening).
+
+    Example::
+
+        planner = LPAStar(graph8, 'A', 'J', g_costs8, heuristics8)
+        planner.plan()
+        planner.remove_edge('A', 'F')   # road closed
+        planner.set_cost('D', 'E', 2)   # cost updated
+        planner.plan()                  # repairs the previous search
+    """
+
+    def __init__(self, graph, start, goal, g_costs=None, heuristics=None, weighted=False, default_cost=1):
+        """
+        Args:
+            graph: Adjacency list mapping a node -> list of neighbors (costs from
+                ``g_costs``), a node -> list of (neighbor, cost) pairs with
+                ``weighted=True``, or a `CompiledGraph`.
+            start: Start node.
+            goal: Goal node.
+            g_costs: Dict mapping (u, v) -> positive edge cost. A zero-cost cycle would
+                let rhs-values support each other after an edge is removed.
+            heuristics: Dict mapping a node -> consistent estimate of its cost to ``goal``;
+                missing nodes and None mean 0.
+            weighted: Whether adjacency entries carry their cost.
+            default_cost: Cost of an edge missing from ``g_costs``.
+        """
+        self.start = start
+        self.goal = goal
+        self.succ = {}
+        self.pred = {}
+        if isinstance(graph, CompiledGraph):
+            graph, weighted = graph.weighted, True
+        g_costs = g_costs or {}
+        for u, children in graph.items():
+            self.succ.setdefault(u, {})
+            self.pred.setdefault(u, {})
+            for entry in children:
+                v, cost = entry if weighted else (entry, g_costs.get((u, entry), default_cost))
+                if v == u:
+                    continue
+                self._store(u, v, min(cost, self.succ[u].get(v, inf)))
+        for node in (start, goal):
+            self.succ.setdefault(node, {})
+            self.pred.setdefault(node, {})
+        self._h = (heuristics or {}).get
+        self.g = {}
+        self.rhs = {start: 0}
+        self._queue = []
+        self._queued = {}   # node -> key of its live heap entry
+        self._counter = count()
+        self._push(start)
+
+    def _store(self, u, v, cost):
+        if cost <= 0:
+            raise ValueError("LPA* requires positive edge costs.")
+        self.succ.setdefault(u, {})[v] = cost
+        self.pred.setdefault(v, {})[u] = cost
+        self.succ.setdefault(v, {})
+        self.pred.setdefault(u, {})
+
+    def _key(self, node):
+        best = min(self.g.get(node, inf), self.rhs.get(node, inf))
+        return best + self._h(node, 0), best
+
+    def _push(self, node):
+        key = self._key(node)
+        self._queued[node] = key
+        heapq.heappush(self._queue, (key, next(self._counter), node))
+        return key
+
+    def _update(self, node):
+        """Re-queue ``node`` if it is inconsistent, drop it from the queue otherwise."""
+        if self.g.get(node, inf) != self.rhs.get(node, inf):
+            self._push(node)
+            return True
+        self._queued.pop(node, None)
+        return False
+
+    def _recompute_rhs(self, node):
+        if node == self.start:
+            return
+        g = self.g
+        self.rhs[node] = min((g.get(p, inf) + cost for p, cost in self.pred[node].items()), default=inf)
+
+    def set_cost(self, u, v, cost):
+        """
+        Insert edge ``u -> v`` or change its cost; ``cost`` None or inf removes it.
+        Nodes seen for the first time are added to the graph. Self-loops are
+        ignored, as they never lie on a shortest path.
+        """
+        if cost is None:
+            cost = inf
+        if u == v:
+            return
+        old = self.succ.get(u, {}).get(v, inf)
+        if cost == old:
+            return
+        if cost == inf:
+            del self.succ[u][v]
+            del self.pred[v][u]
+        else:
+            self._store(u, v, cost)
+        if v == self.start:
+            return
+        through = self.g.get(u, inf) + cost
+        if cost < old:
+            # Cheaper: the new edge can only lower rhs(v)
+            if through < self.rhs.get(v, inf):
+                self.rhs[v] = through
+                self._update(v)
+        elif self.rhs.get(v, inf) == self.g.get(u, inf) + old:
+            # Dearer or gone: only matters if v's best path used this edge
+            self._recompute_rhs(v)
+            self._update(v)
+
+    def add_edge(self, u, v, cost=1):
+        self.set_cost(u, v, cost)
+
+    def remove_edge(self, u, v):
+        self.set_cost(u, v, None)
+
+    def update_edges(self, changes):
+        """Apply many ``(u, v, cost)`` changes before the next `plan`; cost None removes the edge."""
+        for u, v, cost in changes:
+            self.set_cost(u, v, cost)
+
+    def plan(self, budget=None):
+        """
+        Bring the search up to date and return the current shortest path.
+
+        Args:
+            budget: Optional `core.results.Budget`; the search stops with "CUTOFF"
+                when spent. A later call resumes where it stopped.
+
+        Returns:
+            SearchResult: status "SUCCESS" with the path and its cost, "FAIL" if the
+            goal is unreachable, or "CUTOFF". The stats cover this call only, so
+            they show the work a repair took.
+        """
+        stats = SearchStats()
+        queue, queued, g, rhs = self._queue, self._queued, self.g, self.rhs
+        goal = self.goal
+        stats.peak_frontier = len(queued)
+
+        while queue:
+            key, _, node = queue[0]
+            if queued.get(node) != key:
+                heapq.heappop(queue)
+                stats.stale_pops += 1
+                continue
+            goal_g, goal_rhs = g.get(goal, inf), rhs.get(goal, inf)
+            if key >= self._key(goal) and goal_g == goal_rhs:
+                break
+            if budget is not None and budget.exceeded(stats.expansions):
+                return SearchResult.failure(stats, status="CUTOFF")
+            heapq.heappop(queue)
+            del queued[node]
+            stats.expansions += 1
+
+            if g.get(node, inf) > rhs.get(node, inf):
+                # Overconsistent: settle it, as A* would
+                g[node] = rhs[node]
+                through = g[node]
+                for child, cost in self.succ[node].items():
+                    if child != self.start and through + cost < rhs.get(child, inf):
+                        rhs[child] = through + cost
+                        stats.pushes += self._update(child)
+            else:
+                # Underconsistent: its old g no longer holds, so everything that relied on it is redone
+                old = g.pop(node, inf)
+                for child, cost in self.succ[node].items():
+                    if rhs.get(child, inf) == old + cost:
+                        self._recompute_rhs(child)
+                        stats.pushes += self._update(child)
+                self._recompute_rhs(node)
+                stats.pushes += self._update(node)
+            if len(queued) > stats.peak_frontier:
+                stats.peak_frontier = len(queued)
+
+        path = self.path()
+        if path is None:
+            return SearchResult.failure(stats)
+        return SearchResult.success(path, g[goal], stats)
+
+    def path(self):
+        """Shortest path from the last `plan`, read off the g-values; None if unreachable."""
+        g, goal = self.g, self.goal
+        if g.get(goal, inf) == inf:
+            return None
+        # Walk back over "tight" edges, g(p) + c(p, n) == g(n). Nodes tied with the goal's
+        # key may still be queued, so search the tight edges instead of taking the argmin
+        parents, stack = {goal: None}, [goal]
+        while stack:
+            node = stack.pop()
+            if node == self.start:
+                break
+            target = g[node]
+            for parent, cost in self.pred[node].items():
+                if parent not in parents and g.get(parent, inf) + cost == target:
+                    parents[parent] = node
+                    stack.append(parent)
+        path = [self.start]
+        while path[-1] != goal:
+            path.append(parents[path[-1]])
+        return path
+
+    def cost(self, u, v):
+        return self.succ.get(u, {}).get(v, inf)
+
+
+if __name__ == '__main__':
+    planner = LPAStar(graph8, 'A', 'J', g_costs8, heuristics8)
+    result = planner.plan()
+    print("Initial plan:", result.path, result.cost, result.stats)
+
+    first, second = result.path[-2], result.path[-1]
+    planner.remove_edge(first, second)
+    result = planner.plan()
+    print(f"Without {first}->{second}:", result.path, result.cost, result.stats)
+
+    costs = {edge: cost for edge, cost in g_costs8.items() if edge != (first, second)}
+    graph = {u: [v for v in children if (u, v) != (first, second)] for u, children in graph8.items()}
+    scratch = a_star(graph, heuristics8, 'A', 'J', costs)
+    print("A* from scratch:", scratch.path, scratch.cost, scratch.stats)
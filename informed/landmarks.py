@@ -0,0 +1,147 @@
+import random
+from array import array
+from collections.abc import Mapping
+from math import inf
+
+from adversarial.a_star import a_star
+from graphs import graph8
+from graphs.compiled import CompiledGraph, compile_graph
+from graphs.path_costs import g_costs8
+from informed.best_first_search import best_first_search
+from informed.uniform_cost_search import shortest_path_tree
+
+
+class LandmarkHeuristic:
+    """
+    ALT (A*, Landmarks, Triangle inequality) heuristic.
+
+    For every landmark L the exact costs d(L, v) and d(v, L) to and from all nodes
+    are precomputed with one forward and one backward Dijkstra sweep and kept in
+    flat ``array('d')`` tables of ``count * n`` doubles. For any goal t the
+    triangle inequality gives
+
+        d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L))
+
+    so the maximum over the landmarks is an admissible (and consistent) estimate
+    for every goal, with no hand-written table. More landmarks cost ``16 * n``
+    bytes each and tighten the bound.
+
+    The object is a callable ``h(node, goal)`` for `best_first_search` and
+    `ida_star`; `for_goal` gives the ``{node: h}`` mapping `a_star` expects.
+    """
+
+    def __init__(self, graph, landmarks, dist_from, dist_to):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.dist_from = dist_from  # dist_from[k * n + v] = d(landmark k, v)
+        self.dist_to = dist_to      # dist_to[k * n + v] = d(v, landmark k)
+
+    @classmethod
+    def build(cls, graph, g_costs=None, count=4, strategy="farthest", seed=None):
+        """
+        Pick landmarks and run the shortest-path sweeps.
+
+        Args:
+            graph: Adjacency list mapping a node -> list of neighbors, or a `CompiledGraph`.
+            g_costs: Dict mapping (u, v) -> edge cost (the `graphs.path_costs` format);
+                missing edges cost 1. Ignored for a `CompiledGraph`.
+            count: Number of landmarks, trading memory for tighter estimates.
+            strategy: "farthest" repeatedly adds the node farthest from the landmarks
+                chosen so far (good spread, needs a sweep per landmark anyway);
+                "random" samples nodes uniformly.
+            seed: Seed for the random choices.
+        """
+        if not isinstance(graph, CompiledGraph):
+            graph = compile_graph(graph, g_costs)
+        n = graph.num_nodes
+        count = min(count, n)
+        rng = random.Random(seed)
+        reverse = graph.reverse()
+
+        if strategy == "random":
+            chosen = rng.sample(range(n), count)
+        elif strategy != "farthest":
+            raise ValueError(f"Unknown landmark strategy {strategy!r}")
+        else:
+            chosen = []
+
+        landmarks, dist_from, dist_to = [], array('d'), array('d')
+        # Distance of every node to its closest landmark so far (farthest strategy)
+        nearest = array('d', [inf]) * n
+        candidate = rng.randrange(n) if n else None
+        for k in range(count):
+            landmark = chosen[k] if chosen else candidate
+            forward = shortest_path_tree(graph, graph.labels[landmark]).dist
+            backward = shortest_path_tree(reverse, graph.labels[landmark]).dist
+            landmarks.append(graph.labels[landmark])
+            dist_from.extend(forward)
+            dist_to.extend(backward)
+            if not chosen:
+                best, candidate = -1.0, None
+                for v in range(n):
+                    d = min(forward[v], backward[v])
+                    if d < nearest[v]:
+                        nearest[v] = d
+                    # unreachable nodes get their own landmark only once reachable ones are covered
+                    score = nearest[v] if nearest[v] < inf else 0.0
+                    if score > best and graph.labels[v] not in landmarks:
+                        best, candidate = score, v
+                if candidate is None:
+                    break
+        return cls(graph, landmarks, dist_from, dist_to)
+
+    @property
+    def nbytes(self):
+        return self.dist_from.itemsize * (len(self.dist_from) + len(self.dist_to))
+
+    def estimate_ids(self, v, t):
+        """Lower bound on d(v, t) for node ids."""
+        n = self.graph.num_nodes
+        dist_from, dist_to = self.dist_from, self.dist_to
+        best = 0.0
+        for base in range(0, len(dist_from), n):
+            lower = dist_from[base + t] - dist_from[base + v]
+            if lower > best:
+                best = lower
+            lower = dist_to[base + v] - dist_to[base + t]
+            if lower > best:
+                best = lower
+        return best  # nan comparisons are False, so inf - inf terms are skipped
+
+    def __call__(self, node, goal):
+        index = self.graph.index
+        if node not in index or goal not in index:
+            return 0.0
+        return self.estimate_ids(index[node], index[goal])
+
+    def for_goal(self, goal):
+        """``{node: h}`` mapping towards ``goal``, computed on demand."""
+        return _GoalHeuristic(self, goal)
+
+
+class _GoalHeuristic(Mapping):
+    __slots__ = ("_alt", "_goal")
+
+    def __init__(self, alt, goal):
+        self._alt = alt
+        self._goal = goal
+
+    def __getitem__(self, node):
+        if node not in self._alt.graph.index:
+            raise KeyError(node)
+        return self._alt(node, self._goal)
+
+    def __iter__(self):
+        return iter(self._alt.graph.labels)
+
+    def __len__(self):
+        return self._alt.graph.num_nodes
+
+
+if __name__ == '__main__':
+    alt = LandmarkHeuristic.build(graph8, g_costs8, count=2, seed=0)
+    print("Landmarks:", alt.landmarks, f"({alt.nbytes} bytes)")
+    print("h(A -> J) =", alt('A', 'J'))
+    result = a_star(graph8, alt.for_goal('J'), 'A', 'J', g_costs8)
+    print("A*:", result.path, result.cost)
+    print("Greedy best-first:", best_first_search(graph8, 'J', alt, 'A').path)
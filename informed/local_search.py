@@ -0,0 +1,518 @@
+"""
+Local search over graph states: hill climbing variants, simulated annealing and
+random restarts.
+
+Every state is a node; its neighbors are its out-edges and the objective is the
+heuristic value h(n), which the search minimizes. A run stops at ``goal`` (or,
+without a goal, at h = 0), at a local minimum, or when its step, sideways or
+time budget runs out. All runs work on a `CompiledGraph` with the heuristic as
+a flat ``array('d')`` indexed by node id, so scoring a neighbor is an array
+read rather than a dict lookup. When NumPy is installed, `random_restart`
+advances a whole batch of walkers per step with vectorized array operations.
+"""
+import os
+import random
+import time
+from array import array
+from collections.abc import Mapping
+from itertools import islice
+from math import exp, inf
+
+from core.results import SearchResult, SearchStats
+from graphs.compiled import CompiledGraph, compile_graph
+
+METHODS = ("steepest", "stochastic", "first_choice", "annealing")
+
+# Largest number of walkers the vectorized engine advances together
+MAX_CHUNK = 1024
+
+
+def _load_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def prepare(graph, heuristic=None):
+    """
+    `CompiledGraph` whose ``h`` holds the objective.
+
+    ``heuristic`` may be a ``{node: h}`` mapping (missing nodes score inf, as in
+    `hill_climbing`), a sequence or NumPy array indexed by node id, or None to
+    keep the heuristic compiled into ``graph``.
+    """
+    if not isinstance(graph, CompiledGraph):
+        if heuristic is None or isinstance(heuristic, Mapping):
+            return compile_graph(graph, heuristics=heuristic, default_heuristic=inf)
+        graph = compile_graph(graph)
+    if heuristic is None:
+        return graph
+    if isinstance(heuristic, Mapping):
+        h = array('d', (heuristic.get(label, inf) for label in graph.labels))
+    else:
+        h = array('d', heuristic)
+        if len(h) != graph.num_nodes:
+            raise ValueError(f"Expected {graph.num_nodes} heuristic values, got {len(h)}")
+    return CompiledGraph(graph.labels, graph.offsets, graph.targets, graph.weights, h)
+
+
+def local_search(graph, heuristic, start, goal=None, method="steepest", sideways=0, max_steps=10000,
+                 temperature=1.0, cooling=0.995, tries=20, seed=None):
+    """
+    One local-search run from ``start``.
+
+    Methods:
+        - "steepest": move to the best neighbor (classic hill climbing).
+        - "stochastic": move to a uniformly random improving neighbor.
+        - "first_choice": sample random neighbors until one improves, giving up
+          after ``tries`` samples; suits states with many neighbors.
+        - "annealing": simulated annealing; a random neighbor that is worse by
+          delta is still accepted with probability exp(-delta / T), with
+          T = temperature * cooling ** step. The best state seen is returned.
+
+    Args:
+        graph: Adjacency list or `CompiledGraph`.
+        heuristic: Objective to minimize (see `prepare`).
+        start: Starting node.
+        goal: Optional goal node; without one, a state with h = 0 is a goal.
+        method: One of ``METHODS``.
+        sideways: How many consecutive moves to equally good neighbors are
+            allowed to cross a plateau (0 stops at the first plateau).
+        max_steps: Cap on the number of states examined.
+        temperature, cooling: Annealing schedule.
+        tries: Samples per step for "first_choice".
+        seed: Seed for the random choices.
+
+    Returns:
+        SearchResult: the walk as ``path`` and the objective of its last state as
+        ``cost``; status "SUCCESS" if it ends at a goal, else "FAIL".
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+    graph = prepare(graph, heuristic)
+    goal_id = -1 if goal is None else graph.id_of(goal)
+    stats = SearchStats()
+    walk = _walk(graph, graph.id_of(start), goal_id, method, sideways, max_steps, temperature, cooling, tries,
+                 random.Random(seed), inf, stats)
+    return _result(graph, walk, goal_id, stats)
+
+
+def _expired(deadline):
+    """Whether a run must stop: past ``deadline``, or, in a pool worker, told to by `random_restart`."""
+    return time.time() >= deadline or (_worker_stop is not None and _worker_stop.value)
+
+
+def _is_goal(h, node, goal_id):
+    return node == goal_id if goal_id >= 0 else h[node] <= 0
+
+
+def _walk(graph, start, goal_id, method, sideways, max_steps, temperature, cooling, tries, rng, deadline, stats):
+    """Scalar engine: one walker, returns the list of node ids visited."""
+    offsets, targets, h = graph.offsets, graph.targets, graph.h
+    current, walk = start, [start]
+    flat = 0
+    best_at, best_h = 0, h[start]
+
+    for step in range(max_steps):
+        if _is_goal(h, current, goal_id):
+            break
+        if not step & 255 and _expired(deadline):
+            break
+        lo, hi = offsets[current], offsets[current + 1]
+        if lo == hi:
+            break
+        stats.expansions += 1
+        h_current = h[current]
+
+        if method == "steepest":
+            nxt = targets[lo]
+            for e in range(lo + 1, hi):
+                if h[targets[e]] < h[nxt]:
+                    nxt = targets[e]
+        elif method == "stochastic":
+            better = [targets[e] for e in range(lo, hi) if h[targets[e]] < h_current]
+            if not better and flat < sideways:
+                better = [targets[e] for e in range(lo, hi) if h[targets[e]] == h_current]
+            if not better:
+                break
+            nxt = rng.choice(better)
+        elif method == "first_choice":
+            for _ in range(tries):
+                nxt = targets[rng.randrange(lo, hi)]
+                if h[nxt] < h_current:
+                    break
+            # Without an improving sample the last one may still be a sideways move
+        else:
+            nxt = targets[rng.randrange(lo, hi)]
+            delta = h[nxt] - h_current
+            t = temperature * cooling ** step
+            if delta > 0 and (t <= 1e-12 or rng.random() >= exp(-delta / t)):
+                continue
+            current = nxt
+            walk.append(current)
+            stats.pushes += 1
+            if h[current] < best_h:
+                best_at, best_h = len(walk) - 1, h[current]
+            continue
+
+        if h[nxt] < h_current:
+            flat = 0
+        elif h[nxt] == h_current and flat < sideways:
+            flat += 1
+        else:
+            break
+        current = nxt
+        walk.append(current)
+        stats.pushes += 1
+
+    if method == "annealing" and not _is_goal(h, current, goal_id):
+        del walk[best_at + 1:]
+    return walk
+
+
+def _result(graph, walk, goal_id, stats):
+    stats.peak_frontier = max(stats.peak_frontier, 1)
+    path, cost = graph.path_labels(walk), graph.h[walk[-1]]
+    if _is_goal(graph.h, walk[-1], goal_id):
+        return SearchResult.success(path, cost, stats)
+    return SearchResult("FAIL", path, cost, stats.stop())
+
+
+def steepest_successors(graph, np=None):
+    """
+    Best neighbor of every node at once: ``best[i]`` is the first neighbor of ``i``
+    with the lowest h, or -1 for a node without out-edges. Vectorized with NumPy.
+    """
+    np = np or _load_numpy()
+    offsets, targets, h = _arrays(graph, np)
+    n = graph.num_nodes
+    best = np.full(n, -1, dtype=np.int64)
+    degree = np.diff(offsets)
+    rows = np.flatnonzero(degree)
+    if not len(rows):
+        return best
+    scores = h[targets]
+    lowest = np.full(n, np.inf)
+    lowest[rows] = np.minimum.reduceat(scores, offsets[rows])
+    # Edges scoring their row's minimum; the first of each row wins, as in `_walk`
+    hits = np.flatnonzero(scores == np.repeat(lowest, degree))
+    owners, first = np.unique(np.repeat(np.arange(n), degree)[hits], return_index=True)
+    best[owners] = targets[hits[first]]
+    return best
+
+
+def _arrays(graph, np):
+    return (np.frombuffer(graph.offsets, dtype=np.int64), np.frombuffer(graph.targets, dtype=np.int64),
+            np.frombuffer(graph.h, dtype=np.float64))
+
+
+def _walk_many(graph, starts, goal_id, method, sideways, max_steps, temperature, cooling, tries, seed, deadline,
+               stats, np, best_next=None):
+    """
+    Vectorized engine: one walker per start, all advanced together each step.
+
+    Returns the best walk as a list of ids. Steepest walks are deterministic, so only the winner is replayed to recover
+    its path; the random methods keep the position history of every walker.
+    """
+    offsets, targets, h = _arrays(graph, np)
+    rng = np.random.default_rng(seed)
+    current = np.asarray(starts, dtype=np.int64)
+    walkers = len(current)
+    degree = offsets[current + 1] - offsets[current]
+    flat = np.zeros(walkers, dtype=np.int64)
+    # Moves made so far, and up to the best state: the walk lengths that break ties
+    moves, best_moves = np.zeros(walkers, dtype=np.int64), np.zeros(walkers, dtype=np.int64)
+    best_h, best_step = h[current].copy(), np.zeros(walkers, dtype=np.int64)
+    goal = (current == goal_id) if goal_id >= 0 else (h[current] <= 0)
+    active = ~goal & (degree > 0)
+    id_type = np.int32 if graph.num_nodes < 2 ** 31 else np.int64
+    history = None if method == "steepest" else [current.astype(id_type)]
+    stats.peak_frontier = max(stats.peak_frontier, walkers)
+
+    if method == "steepest" and best_next is None:
+        best_next = steepest_successors(graph, np)
+
+    def sample():
+        pick = offsets[current] + (rng.random(walkers) * np.maximum(degree, 1)).astype(np.int64)
+        return np.where(degree > 0, targets[np.minimum(pick, len(targets) - 1)], current)
+
+    step = 0
+    while step < max_steps and active.any() and not _expired(deadline):
+        step += 1
+        stats.expansions += int(active.sum())
+        h_current = h[current]
+        degree = offsets[current + 1] - offsets[current]
+        if method == "steepest":
+            candidate = np.where(degree > 0, best_next[current], current)
+        elif method == "first_choice":
+            # Up to ``tries`` samples per step, keeping each walker's first improving
+            # one, else its last, as `_walk` does
+            candidate = sample()
+            found = h[candidate] < h_current
+            for _ in range(tries - 1):
+                if (found | ~active).all():
+                    break
+                other = sample()
+                candidate = np.where(found, candidate, other)
+                found |= h[other] < h_current
+        else:
+            candidate = sample()
+        delta = h[candidate] - h_current
+        better = delta < 0
+
+        if method == "annealing":
+            t = temperature * cooling ** (step - 1)
+            with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+                accept = better | ((t > 1e-12) & (rng.random(walkers) < np.exp(-delta / max(t, 1e-300))))
+            move = active & accept
+            stop = np.zeros(walkers, dtype=bool)
+        else:
+            sideways_ok = (delta == 0) & (flat < sideways)
+            move = active & (better | sideways_ok)
+            flat = np.where(move, np.where(better, 0, flat + 1), flat)
+            stop = ~move
+
+        current = np.where(move, candidate, current)
+        moves += move
+        stats.pushes += int(move.sum())
+        reached = (current == goal_id) if goal_id >= 0 else (h[current] <= 0)
+        # A walker that reached the goal keeps it as its best state
+        improved = (h[current] < best_h) | reached
+        best_step = np.where(improved, step, best_step)
+        best_moves = np.where(improved, moves, best_moves)
+        best_h = np.where(improved, h[current], best_h)
+        goal |= reached
+        active &= ~reached & ~stop & (offsets[current + 1] > offsets[current])
+        if history is not None:
+            history.append(current.astype(id_type))
+
+    if method == "annealing":
+        final_h, final_step, length = best_h, best_step, best_moves
+    else:
+        final_h, final_step, length = h[current], None, moves
+    # Same order as `_rank`: goals first, then the lowest h, then the shortest walk
+    winner = int(np.lexsort((np.arange(walkers), length, final_h, ~goal))[0])
+
+    if history is None:
+        walk = _replay(graph, best_next, int(starts[winner]), goal_id, sideways, step)
+    else:
+        last = len(history) - 1 if final_step is None else int(final_step[winner])
+        walk = [int(history[0][winner])]
+        for positions in history[1:last + 1]:
+            if positions[winner] != walk[-1]:
+                walk.append(int(positions[winner]))
+    return walk
+
+
+def _replay(graph, best_next, start, goal_id, sideways, steps):
+    h = graph.h
+    current, walk, flat = start, [start], 0
+    for _ in range(steps):
+        if _is_goal(h, current, goal_id) or best_next[current] < 0:
+            break
+        nxt = int(best_next[current])
+        if h[nxt] < h[current]:
+            flat = 0
+        elif h[nxt] == h[current] and flat < sideways:
+            flat += 1
+        else:
+            break
+        current = nxt
+        walk.append(current)
+    return walk
+
+
+def _run_restarts(graph, starts, goal_id, method, options, seed, deadline, vectorize, best_next=None):
+    """
+    Run one chunk of restarts; returns (best walk, stats dict).
+
+    ``starts`` is a list of node ids, or a count of random starts to draw here
+    so that large restart counts never have to be pickled. ``best_next`` caches
+    `steepest_successors` across chunks.
+    """
+    stats = SearchStats()
+    rng = random.Random(seed)
+    if isinstance(starts, int):
+        starts = [rng.randrange(graph.num_nodes) for _ in range(starts)]
+    np = _load_numpy() if vectorize and method != "stochastic" else None
+    if np is not None:
+        walk = _walk_many(graph, starts, goal_id, method, options["sideways"], options["max_steps"],
+                          options["temperature"], options["cooling"], options["tries"], seed, deadline, stats, np,
+                          best_next)
+        return walk, stats.stop().as_dict()
+
+    best, best_key = None, None
+    for start in starts:
+        if _expired(deadline) and best is not None:
+            break
+        walk = _walk(graph, start, goal_id, method, options["sideways"], options["max_steps"],
+                     options["temperature"], options["cooling"], options["tries"], rng, deadline, stats)
+        key = _rank(graph, walk, goal_id)
+        if best_key is None or key < best_key:
+            best, best_key = walk, key
+    stats.peak_frontier = 1
+    return best, stats.stop().as_dict()
+
+
+def _rank(graph, walk, goal_id):
+    """Sort key for finished walks: goals first, then the lowest h, then the shortest."""
+    return not _is_goal(graph.h, walk[-1], goal_id), graph.h[walk[-1]], len(walk)
+
+
+# Per-worker state set by _init_worker
+_worker_graph = None
+_worker_blocks = None
+_worker_best_next = None
+_worker_stop = None
+
+
+def _init_worker(spec, stop):
+    global _worker_graph, _worker_blocks, _worker_stop
+    from core.batch import attach
+
+    _worker_graph, _worker_blocks = attach(spec)
+    _worker_stop = stop
+
+
+def _run_chunk(*args):
+    global _worker_best_next
+    _worker_best_next = _best_next(_worker_graph, args[2], args[-1], _worker_best_next)
+    return _run_restarts(_worker_graph, *args, _worker_best_next)
+
+
+def _best_next(graph, method, vectorize, cached=None):
+    """`steepest_successors` when the vectorized steepest engine will need it."""
+    if cached is not None or method != "steepest" or not vectorize:
+        return cached
+    np = _load_numpy()
+    return None if np is None else steepest_successors(graph, np)
+
+
+def random_restart(graph, heuristic=None, goal=None, restarts=100, method="steepest", starts=None, workers=1,
+                   time_budget=None, chunk_size=None, seed=None, vectorize=True, sideways=0, max_steps=10000,
+                   temperature=1.0, cooling=0.995, tries=20):
+    """
+    Run `local_search` from many random starts and return the best outcome.
+
+    Restarts are split into chunks. With ``workers > 1`` the chunks run on a
+    process pool over one shared-memory copy of the compiled graph (see
+    `core.batch.SharedGraph`), with at most two chunks queued per worker;
+    otherwise they run in this process. Inside a chunk, NumPy (when installed
+    and ``vectorize`` is true) advances all of the chunk's walkers together,
+    except for "stochastic", which stays scalar.
+
+    The search stops as soon as a chunk reaches the goal, when ``time_budget``
+    seconds have passed, or when all restarts are done. Chunks still running
+    on other workers then stop too, at their walkers' next deadline check.
+
+    Args:
+        graph: Adjacency list or `CompiledGraph`.
+        heuristic: Objective to minimize (see `prepare`).
+        goal: Optional goal node; without one, a state with h = 0 is a goal.
+        restarts: Number of random starts (ignored if ``starts`` is given).
+        method: One of ``METHODS``.
+        starts: Optional explicit start nodes.
+        workers: Number of processes; None for the CPU count.
+        time_budget: Optional wall-clock limit in seconds.
+        chunk_size: Restarts per chunk; defaults to four chunks per worker, and
+            at most ``MAX_CHUNK`` since the vectorized engine keeps the position
+            history of every walker in a chunk.
+        seed: Seed for the starts and the random choices.
+        vectorize: Whether to use the NumPy engine when available.
+        sideways, max_steps, temperature, cooling, tries: See `local_search`.
+
+    Returns:
+        SearchResult: the best walk (a goal first, then the lowest final h, then
+        the shortest walk); counters are summed over all chunks and the peak
+        frontier is the largest batch of simultaneous walkers.
+    """
+    deadline = inf if time_budget is None else time.time() + time_budget
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+    graph = prepare(graph, heuristic)
+    goal_id = -1 if goal is None else graph.id_of(goal)
+    if starts is not None:
+        starts = [graph.id_of(start) for start in starts]
+        restarts = len(starts)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or min(MAX_CHUNK, max(1, -(-restarts // (4 * workers))))
+    options = dict(sideways=sideways, max_steps=max_steps, temperature=temperature, cooling=cooling, tries=tries)
+    rng = random.Random(seed)
+
+    def chunks():
+        for i in range(0, restarts, chunk_size):
+            chunk = min(chunk_size, restarts - i) if starts is None else starts[i:i + chunk_size]
+            yield chunk, goal_id, method, options, rng.getrandbits(32), deadline, vectorize
+
+    stats = SearchStats()
+    best, best_key = None, None
+
+    def merge(outcome):
+        nonlocal best, best_key
+        walk, counters = outcome
+        stats.expansions += counters["expansions"]
+        stats.pushes += counters["pushes"]
+        stats.peak_frontier = max(stats.peak_frontier, counters["peak_frontier"])
+        if walk is None:
+            return False
+        key = _rank(graph, walk, goal_id)
+        if best_key is None or key < best_key:
+            best, best_key = walk, key
+        return not key[0]
+
+    if workers == 1:
+        best_next = _best_next(graph, method, vectorize)
+        for args in chunks():
+            if merge(_run_restarts(graph, *args, best_next)) or time.time() >= deadline:
+                break
+    else:
+        # The process-pool machinery is only imported when it is used
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        from multiprocessing import RawValue
+        from core.batch import SharedGraph
+
+        # Set once the search is decided; running chunks poll it like their deadline
+        stop = RawValue('b', 0)
+        with SharedGraph(graph) as shared, \
+                ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared.spec, stop)) as pool:
+            queue = chunks()
+            pending = {pool.submit(_run_chunk, *args) for args in islice(queue, 2 * workers)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                finished = False
+                for future in done:
+                    finished |= merge(future.result())
+                if finished or time.time() >= deadline:
+                    stop.value = 1
+                    for future in pending:
+                        future.cancel()
+                    break
+                pending |= {pool.submit(_run_chunk, *args) for args in islice(queue, len(done))}
+
+    if best is None:
+        return SearchResult.failure(stats)
+    return _result(graph, best, goal_id, stats)
+
+
+if __name__ == '__main__':
+    # 100x100 grid whose only h = 0 cell is the far corner, dotted with pits: local
+    # minima with a positive floor that trap a single climb from most cells
+    side = 100
+    grid = {(r, c): [(r + dr, c + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                     if 0 <= r + dr < side and 0 <= c + dc < side] for r in range(side) for c in range(side)}
+    rng = random.Random(0)
+    corner = (side - 1, side - 1)
+    pits = [((rng.randrange(side), rng.randrange(side)), rng.randint(5, 20)) for _ in range(12)]
+    distance = lambda a, b: abs(a[0] - b[0]) + abs(a[1] - b[1])
+    landscape = {cell: min([distance(cell, corner)] + [distance(cell, pit) + floor for pit, floor in pits])
+                 for cell in grid}
+
+    for method in METHODS:
+        result = local_search(grid, landscape, (0, 0), method=method, sideways=5, max_steps=5000, seed=1)
+        print(f"{method:<13}{result.status:<8}{len(result.path) - 1} moves to {result.path[-1]}, h={result.cost}")
+    for label, options in (("vectorized", {}), ("scalar", dict(vectorize=False)), ("2 workers", dict(workers=2))):
+        result = random_restart(grid, landscape, restarts=50, sideways=5, seed=1, **options)
+        print(f"50 restarts, {label}: {result.status} from {result.path[0]} in {len(result.path) - 1} moves, "
+              f"{result.stats.expansions} expansions")
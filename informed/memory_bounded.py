@@ -0,0 +1,390 @@
+"""
+Informed searches with a hard memory bound: beam search and SMA*.
+
+`best_first_search` and `a_star` keep every generated node, so on large
+instances their frontier grows until the process runs out of memory. The
+searches here cap it instead and report through ``SearchResult.optimal``
+whether the cap cost them the optimality guarantee (assuming an admissible
+heuristic):
+
+- `beam_search` keeps at most ``width`` nodes per layer. It is optimal only if
+  no layer ever overflowed.
+- `sma_star` (Simplified Memory-bounded A*) keeps at most ``max_nodes`` nodes in
+  its search tree. When memory is full it forgets the shallowest leaf with the
+  highest f, and it backs that f-value up into the leaf's parent, so the subtree
+  is regenerated only if it becomes the most promising again. It is optimal
+  unless the depth the memory allows cut off a path.
+
+Both accept the same graphs as `a_star`: an adjacency list with ``g_costs``, a
+`CompiledGraph`, or a `core.problem.Problem`.
+"""
+import heapq
+from collections.abc import Mapping
+from itertools import count
+from math import inf
+
+from core.problem import Problem
+from core.results import SearchResult, SearchStats
+from graphs import graph7
+from graphs.compiled import CompiledGraph
+from graphs.heuristics import heuristics7
+from graphs.path_costs import g_costs7
+
+
+def _space(graph, heuristics, start, goal, g_costs):
+    """(start, edges, h, is_goal, to_labels) for any of the supported graph forms."""
+    if isinstance(graph, Problem):
+        h = graph.heuristic if heuristics is None else _estimator(heuristics, goal)
+        return graph.initial if start is None else start, graph.successors, h, graph.is_goal, list
+    if isinstance(graph, CompiledGraph):
+        if start not in graph or goal not in graph:
+            # An edgeless space: the search fails, as on a dict graph without the node
+            return start, lambda node: (), lambda node: 0, lambda node: False, list
+        if heuristics is None:
+            h = graph.h.__getitem__
+        else:
+            estimate, labels = _estimator(heuristics, goal), graph.labels
+            h = lambda i: estimate(labels[i])
+        t = graph.id_of(goal)
+        return graph.id_of(start), graph.edges, h, lambda i: i == t, graph.path_labels
+    g_costs = g_costs or {}
+    edges = lambda node: ((child, g_costs.get((node, child), 1)) for child in graph.get(node, []))
+    return start, edges, _estimator(heuristics, goal), lambda node: node == goal, list
+
+
+def _estimator(heuristics, goal):
+    if heuristics is None:
+        return lambda node: 0
+    if callable(heuristics) and not isinstance(heuristics, Mapping):
+        return lambda node: heuristics(node, goal)
+    return lambda node: heuristics.get(node, 0)
+
+
+def _unlink(link):
+    # Paths are stored as shared (node, parent link) chains
+    path = []
+    while link is not None:
+        node, link = link
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def beam_search(graph, heuristics, start, goal, width, g_costs=None, greedy=False, budget=None):
+    """
+    Layered beam search: expand a whole layer, keep the ``width`` best children.
+
+    Children are ranked by f = g + h (or by h alone with ``greedy=True``). The
+    search keeps going after the first goal, pruning every node whose f cannot
+    beat the best goal found, until the beam is empty; the greedy variant stops
+    at the first goal instead. Each layer holds at most ``width`` nodes and at
+    most ``2 * width`` while it is being built. Paths share their prefixes, and
+    a state is only requeued with a cheaper g than any layer gave it before, so
+    memory is O(width * depth) whatever the branching factor.
+
+    Args:
+        graph: Adjacency list, `CompiledGraph` or `core.problem.Problem`.
+        heuristics: Dict node -> h(n), a callable h(n, goal), or None (0 for an
+            adjacency list; the compiled or problem heuristic otherwise).
+        start: Starting node; for a problem, None starts from its initial state.
+        goal: Target node (ignored for a problem).
+        width: Beam width, the most nodes kept per layer.
+        g_costs: Dict mapping (u, v) -> edge cost for an adjacency list; missing edges cost 1.
+        greedy: Rank by h and stop at the first goal, as `best_first_search` does.
+        budget: Optional `core.results.Budget`; the search stops with "CUTOFF" when spent.
+
+    Returns:
+        SearchResult: the cheapest path found and its cost, "FAIL" or "CUTOFF";
+        ``optimal`` is True only if the beam never dropped a node and the
+        search was not greedy.
+    """
+    if width < 1:
+        raise ValueError("Beam width must be at least 1")
+    stats = SearchStats()
+    start, edges, h, is_goal, to_labels = _space(graph, heuristics, start, goal, g_costs)
+    if is_goal(start):
+        return SearchResult.success(to_labels([start]), 0, stats, optimal=True)
+
+    best_link, best_cost = None, inf
+    pruned = False
+    # state -> (rank, g, path link)
+    layer = {start: (h(start), 0, (start, None))}
+    # state -> cheapest g it entered a layer with
+    seen = {start: 0}
+    stats.pushes = stats.peak_frontier = 1
+
+    while layer:
+        children = {}
+        for state, (_, g, link) in layer.items():
+            if budget is not None and budget.exceeded(stats.expansions):
+                return _beam_result(best_link, best_cost, to_labels, stats, "CUTOFF", False)
+            stats.expansions += 1
+            for child, cost in edges(state):
+                child_g = g + cost
+                child_h = h(child)
+                if child_g + child_h >= best_cost:
+                    continue
+                if is_goal(child):
+                    best_link, best_cost = (child, link), child_g
+                    continue
+                if child_g >= seen.get(child, inf):
+                    continue
+                known = children.get(child)
+                if known is None or child_g < known[1]:
+                    children[child] = (child_h if greedy else child_g + child_h, child_g, (child, link))
+                    stats.pushes += 1
+                    if len(children) >= 2 * width:
+                        children = _trim(children, width)
+                        pruned = True
+        if greedy and best_link is not None:
+            break
+        if len(children) > width:
+            children = _trim(children, width)
+            pruned = True
+        # The bound may have tightened while the layer was built
+        layer = {state: entry for state, entry in children.items() if entry[1] + h(state) < best_cost}
+        for state, entry in layer.items():
+            seen[state] = entry[1]
+        stats.peak_frontier = max(stats.peak_frontier, len(layer))
+
+    status = "SUCCESS" if best_link is not None else "FAIL"
+    return _beam_result(best_link, best_cost, to_labels, stats, status, not pruned and not greedy)
+
+
+def _trim(children, width):
+    kept = heapq.nsmallest(width, children.items(), key=lambda item: item[1][0])
+    return dict(kept)
+
+
+def _beam_result(link, cost, to_labels, stats, status, optimal):
+    if link is None:
+        return SearchResult.failure(stats, status=status, optimal=False)
+    return SearchResult.success(to_labels(_unlink(link)), cost, stats, optimal=optimal)
+
+
+class _Node:
+    """
+    A node of the SMA* tree. ``children`` maps a successor index to the child in
+    memory, ``forgotten`` to the backed-up f of a child that was dropped.
+    """
+    __slots__ = ("state", "parent", "index", "g", "f", "depth", "children", "successors", "next",
+                 "completed", "forgotten", "open", "version")
+
+    def __init__(self, state, parent, index, g, f, depth):
+        self.state = state
+        self.parent = parent
+        self.index = index
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.children = {}
+        self.successors = None
+        self.next = 0
+        self.completed = False
+        self.forgotten = {}
+        self.open = False
+        self.version = 0
+
+
+def sma_star(graph, heuristics, start, goal, max_nodes, g_costs=None, budget=None):
+    """
+    Simplified Memory-bounded A* (SMA*).
+
+    Works like A*, except that the search tree never holds more than
+    ``max_nodes`` nodes. It generates one successor at a time from the deepest
+    node with the lowest f. When memory is full, it drops the shallowest leaf
+    with the highest f. The parent remembers the f of each forgotten child, so
+    its own f, backed up from its children, stays a valid lower bound, and a
+    regenerated child starts again from the value it had. Paths are tree paths: a successor that is already an ancestor is
+    skipped.
+
+    A node at depth ``max_nodes - 1`` cannot have a child in memory. If it is
+    not a goal, its f becomes inf. The result is then still the best solution
+    within that depth, but ``optimal`` is False because a deeper and cheaper
+    path may have been cut.
+
+    Args:
+        graph: Adjacency list, `CompiledGraph` or `core.problem.Problem`.
+        heuristics: Dict node -> h(n), a callable h(n, goal), or None (0 for an
+            adjacency list; the compiled or problem heuristic otherwise).
+        start: Starting node; for a problem, None starts from its initial state.
+        goal: Target node (ignored for a problem).
+        max_nodes: Most nodes kept in memory at once (at least 2).
+        g_costs: Dict mapping (u, v) -> edge cost for an adjacency list; missing edges cost 1.
+        budget: Optional `core.results.Budget`; the search stops with "CUTOFF" when spent.
+
+    Returns:
+        SearchResult: status "SUCCESS" with the path and its cost, "FAIL" or
+        "CUTOFF". ``optimal`` reports whether the memory bound cut any path
+        (given an admissible heuristic). Each of ``stats.expansions`` generates
+        a single successor; ``stats.pushes`` counts generated nodes, including
+        regenerations, and ``stats.peak_frontier`` the most nodes held at once.
+    """
+    if max_nodes < 2:
+        raise ValueError("SMA* needs room for at least two nodes")
+    stats = SearchStats()
+    start, edges, h, is_goal, to_labels = _space(graph, heuristics, start, goal, g_costs)
+    seq = count()
+    best_heap, worst_heap = [], []
+    root = _Node(start, None, -1, 0, h(start), 0)
+    used, depth_cut = 1, False
+
+    def push(node):
+        # Re-queue ``node`` after a change; stale heap entries are skipped by version
+        node.version += 1
+        if node.open:
+            heapq.heappush(best_heap, (node.f, -node.depth, next(seq), node.version, node))
+        if not node.children and node is not root:
+            heapq.heappush(worst_heap, (-node.f, node.depth, next(seq), node.version, node))
+        if len(best_heap) + len(worst_heap) > 8 * max_nodes:
+            _compact(best_heap, worst_heap)
+
+    def backup(node):
+        while node is not None and node.completed:
+            lowest = min([child.f for child in node.children.values()] + list(node.forgotten.values()), default=inf)
+            if lowest == node.f:
+                break
+            node.f = lowest
+            push(node)
+            node = node.parent
+
+    root.open = True
+    push(root)
+    stats.pushes = stats.peak_frontier = 1
+
+    while best_heap:
+        _, _, _, version, best = heapq.heappop(best_heap)
+        if version != best.version or not best.open:
+            stats.stale_pops += 1
+            continue
+        if best.f == inf:
+            break
+        if is_goal(best.state):
+            path = []
+            node = best
+            while node is not None:
+                path.append(node.state)
+                node = node.parent
+            path.reverse()
+            return SearchResult.success(to_labels(path), best.g, stats, optimal=not depth_cut)
+        if budget is not None and budget.exceeded(stats.expansions):
+            return SearchResult.failure(stats, status="CUTOFF", optimal=False)
+
+        stats.expansions += 1
+        if best.successors is None:
+            ancestors = set()
+            node = best
+            while node is not None:
+                ancestors.add(node.state)
+                node = node.parent
+            best.successors = [(child, cost) for child, cost in edges(best.state) if child not in ancestors]
+        successors = best.successors
+        index = _next_successor(best)
+        if index is None:
+            # Dead end, or nothing left worth regenerating
+            best.open = False
+            if not successors:
+                best.f = inf
+                push(best)
+                backup(best.parent)
+            else:
+                backup(best)
+            continue
+
+        child_state, cost = successors[index]
+        child = _Node(child_state, best, index, best.g + cost, 0, best.depth + 1)
+        if not is_goal(child_state) and child.depth >= max_nodes - 1:
+            child.f = inf
+            depth_cut = True
+        else:
+            # Pathmax: a child is never more promising than its parent
+            child.f = max(best.f, child.g + h(child_state), best.forgotten.get(index, 0))
+
+        if used >= max_nodes and not _forget_worst(worst_heap, best, push):
+            # Memory holds nothing but the path to ``best``: the child cannot be kept
+            best.forgotten[index] = inf
+            best.open = _can_generate(best)
+            push(best)
+            backup(best)
+            depth_cut = True
+            continue
+        if used < max_nodes:
+            used += 1
+
+        best.children[index] = child
+        best.forgotten.pop(index, None)
+        best.open = _can_generate(best)
+        child.open = True
+        push(child)
+        push(best)
+        backup(best)
+        stats.pushes += 1
+        stats.peak_frontier = max(stats.peak_frontier, used)
+
+    return SearchResult.failure(stats, optimal=False)
+
+
+def _next_successor(node):
+    """
+    Index of the successor ``node`` should generate next: the next new one, then
+    the forgotten one with the lowest backed-up f. None if no successor is left
+    that could still lead to a goal.
+    """
+    if not node.completed:
+        index = node.next
+        node.next += 1
+        node.completed = node.next >= len(node.successors)
+        if index < len(node.successors):
+            return index
+    if node.forgotten:
+        index = min(node.forgotten, key=node.forgotten.get)
+        if node.forgotten[index] < inf:
+            return index
+    return None
+
+
+def _can_generate(node):
+    return not node.completed or any(f < inf for f in node.forgotten.values())
+
+
+def _forget_worst(worst_heap, keep, push):
+    """Drop the shallowest highest-f leaf other than ``keep``; False if there is none."""
+    skipped = []
+    dropped = False
+    while worst_heap:
+        entry = heapq.heappop(worst_heap)
+        node = entry[4]
+        if entry[3] != node.version or node.children or node.parent is None \
+                or node.parent.children.get(node.index) is not node:
+            continue
+        if node is keep:
+            skipped.append(entry)
+            continue
+        parent = node.parent
+        del parent.children[node.index]
+        node.open = False
+        parent.forgotten[node.index] = node.f
+        parent.open = _can_generate(parent)
+        push(parent)
+        dropped = True
+        break
+    for entry in skipped:
+        heapq.heappush(worst_heap, entry)
+    return dropped
+
+
+def _compact(best_heap, worst_heap):
+    best_heap[:] = [entry for entry in best_heap if entry[3] == entry[4].version and entry[4].open]
+    worst_heap[:] = [entry for entry in worst_heap if entry[3] == entry[4].version and not entry[4].children
+                     and entry[4].parent.children.get(entry[4].index) is entry[4]]
+    heapq.heapify(best_heap)
+    heapq.heapify(worst_heap)
+
+
+if __name__ == '__main__':
+    for width in (1, 2, 8):
+        result = beam_search(graph7, heuristics7, 'S', 'M', width, g_costs7)
+        print(f"beam width {width}: {result.path} cost {result.cost} optimal {result.optimal}")
+    for max_nodes in (3, 4, 8):
+        result = sma_star(graph7, heuristics7, 'S', 'M', max_nodes, g_costs7)
+        print(f"SMA* {max_nodes} nodes: {result.status} {result.path} cost {result.cost} optimal {result.optimal}")
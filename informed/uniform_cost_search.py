@@ -1,43 +1,290 @@
 import heapq
+from array import array
+from itertools import count
+from math import inf
 
+from core.problem import Problem
+from core.results import SearchResult, SearchStats
+from graphs.compiled import CompiledGraph
 
-def uniform_cost_search(graph, start, goal):
+
+def uniform_cost_search(graph, start, goal, budget=None):
     """
     Uniform Cost Search on a weighted graph (non-negative edge costs).
 
+    The queue holds (cost, node) entries only; the path is rebuilt from parent
+    pointers once the goal is popped, so memory stays O(V + E) however deep the
+    path is.
+
     Args:
-        graph: Adjacency list mapping a node -> list of neighbors.
+        graph: Adjacency list mapping a node -> list of (neighbor, cost) pairs,
+            a `CompiledGraph`, or a `core.problem.Problem` (its goal test replaces
+            ``goal``; a None ``start`` means its initial state).
         start: Starting node.
         goal: Target node to find.
+        budget: Optional `core.results.Budget`; the search stops with "CUTOFF" when spent.
+
+    Returns:
+        SearchResult: status "SUCCESS" with the cheapest path from start to goal and
+        its cost, "FAIL", or "CUTOFF".
+    """
+    if isinstance(graph, Problem):
+        return _dijkstra_problem(graph, graph.initial if start is None else start, budget)
+    if isinstance(graph, CompiledGraph):
+        if start not in graph or goal not in graph:
+            return SearchResult.failure(SearchStats())
+        return _ucs_compiled(graph, graph.id_of(start), graph.id_of(goal), budget)
+    tree = _dijkstra(graph, start, goal, budget=budget)
+    path = tree.path(goal)
+    if path is None:
+        return SearchResult.failure(tree.stats, status="CUTOFF" if tree.cutoff else "FAIL")
+    return SearchResult.success(path, tree.cost(goal), tree.stats)
+
+
+def shortest_path_tree(graph, source, max_cost=None):
+    """
+    One-to-all Uniform Cost Search (Dijkstra): run until the queue is exhausted,
+    or until every node within ``max_cost`` of ``source`` is settled.
+
+    One run answers any number of goal queries from the same origin through
+    `ShortestPathTree.cost` and `ShortestPathTree.path`.
+
+    Args:
+        graph: Adjacency list mapping a node -> list of (neighbor, cost) pairs,
+            or a `CompiledGraph`.
+        source: Node to grow the tree from.
+        max_cost: Optional cost bound; nodes farther than this stay unreached.
 
     Returns:
-        (total_cost, found_path) where a found_path includes start to goal
-        If no found_path exists: (float('inf'), None)
+        ShortestPathTree: ``dist``/``pred`` are dicts keyed by node for a dict graph
+        and flat arrays indexed by node id for a `CompiledGraph`.
+    """
+    if isinstance(graph, CompiledGraph):
+        return _dijkstra_compiled(graph, graph.id_of(source), max_cost)
+    return _dijkstra(graph, source, None, max_cost)
+
+
+class ShortestPathTree:
     """
-    # Priority p_queue of (g_cost, current_node, found_path)
-    p_queue = [(0.0, start, [start])]
-    best_cost = {start: 0.0}
+    Distances and predecessors from a single source.
+
+    ``dist[n]`` is the cost of the cheapest path to ``n`` and ``pred[n]`` the node
+    before it on that path (None / -1 for the source). Unreached nodes are absent
+    from the dicts, or hold inf / -1 in the arrays of a compiled graph. ``stats``
+    holds the `SearchStats` of the run that built the tree; ``cutoff`` is True
+    when a budget stopped it early.
+    """
+    __slots__ = ("source", "dist", "pred", "graph", "stats", "cutoff")
+
+    def __init__(self, source, dist, pred, graph=None, stats=None, cutoff=False):
+        self.source = source
+        self.dist = dist
+        self.pred = pred
+        self.graph = graph
+        self.stats = stats
+        self.cutoff = cutoff
+
+    def cost(self, goal):
+        if self.graph is None:
+            return self.dist.get(goal, float('inf'))
+        if goal not in self.graph:
+            return float('inf')
+        return self.dist[self.graph.id_of(goal)]
+
+    def path(self, goal):
+        """Path from the source to ``goal``, or None if it was not reached."""
+        if self.cost(goal) == float('inf'):
+            return None
+        pred = self.pred
+        if self.graph is None:
+            path = [goal]
+            while pred[path[-1]] is not None:
+                path.append(pred[path[-1]])
+        else:
+            path = [self.graph.id_of(goal)]
+            while pred[path[-1]] != -1:
+                path.append(pred[path[-1]])
+            path = self.graph.path_labels(path)
+        path.reverse()
+        return path
+
+
+# With a goal the loop stops as soon as it is settled, so the returned tree is
+# only exact for the goal (and for every node when the goal is unreachable).
+def _dijkstra(graph, source, goal=None, max_cost=None, budget=None):
+    stats = SearchStats()
+    cutoff = False
+    limit = float('inf') if max_cost is None else max_cost
+    best_cost = {source: 0.0}
+    pred = {source: None}
+    dist = {}
+    counter = count()
+    # Priority p_queue of (g_cost, tie-breaker, node)
+    p_queue = [(0.0, next(counter), source)]
+    stats.pushes = stats.peak_frontier = 1
 
     while p_queue:
-        g_cost, node, found_path = heapq.heappop(p_queue)
+        g_cost, _, node = heapq.heappop(p_queue)
 
-        # Skip if this found_path isn't the best known
-        if g_cost > best_cost.get(node, float('inf')):
+        # Skip if this entry isn't the best known
+        if node in dist:
+            stats.stale_pops += 1
             continue
+        dist[node] = g_cost
 
         if node == goal:
-            return g_cost, found_path
+            break
+        if budget is not None and budget.exceeded(stats.expansions):
+            cutoff = True
+            break
+
+        stats.expansions += 1
 
         for neighbor, h_cost in graph.get(node, []):
             if h_cost < 0:
                 raise ValueError("Uniform Cost Search requires non-negative edge costs.")
 
             f_cost = g_cost + h_cost
+            if f_cost < best_cost.get(neighbor, float('inf')) and f_cost <= limit:
+                best_cost[neighbor] = f_cost
+                pred[neighbor] = node
+                heapq.heappush(p_queue, (f_cost, next(counter), neighbor))
+                stats.pushes += 1
+        if len(p_queue) > stats.peak_frontier:
+            stats.peak_frontier = len(p_queue)
+
+    return ShortestPathTree(source, dist, pred, stats=stats.stop(), cutoff=cutoff)
+
+
+def _dijkstra_compiled(graph, source, max_cost=None):
+    stats = SearchStats()
+    limit = float('inf') if max_cost is None else max_cost
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    if graph.min_weight < 0:
+        raise ValueError("Uniform Cost Search requires non-negative edge costs.")
+
+    n = graph.num_nodes
+    best_cost = array('d', [float('inf')]) * n
+    pred = array('q', [-1]) * n
+    settled = bytearray(n)
+    best_cost[source] = 0.0
+    p_queue = [(0.0, source)]
+    heappush, heappop = heapq.heappush, heapq.heappop
+    pushes, stale_pops, peak = 1, 0, 1
+
+    while p_queue:
+        g_cost, node = heappop(p_queue)
+        if settled[node]:
+            stale_pops += 1
+            continue
+        settled[node] = 1
+        stats.expansions += 1
+
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            f_cost = g_cost + weights[e]
+            if f_cost < best_cost[neighbor] and f_cost <= limit:
+                best_cost[neighbor] = f_cost
+                pred[neighbor] = node
+                heappush(p_queue, (f_cost, neighbor))
+                pushes += 1
+        if len(p_queue) > peak:
+            peak = len(p_queue)
+
+    stats.pushes, stats.stale_pops, stats.peak_frontier = pushes, stale_pops, peak
+    return ShortestPathTree(graph.labels[source], best_cost, pred, graph, stats.stop())
+
+
+def _ucs_compiled(graph, source, goal, budget=None):
+    # Point-to-point: state lives in dicts sized by the nodes touched rather than
+    # n-sized arrays, so a query that settles a few nodes does a few nodes' work
+    stats = SearchStats()
+    if graph.min_weight < 0:
+        raise ValueError("Uniform Cost Search requires non-negative edge costs.")
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    best_cost = {source: 0.0}
+    pred = {source: -1}
+    settled = set()
+    p_queue = [(0.0, source)]
+    heappush, heappop = heapq.heappush, heapq.heappop
+    expansions, pushes, stale_pops, peak = 0, 1, 0, 1
+    status = "FAIL"
+
+    while p_queue:
+        g_cost, node = heappop(p_queue)
+        if node in settled:
+            stale_pops += 1
+            continue
+        settled.add(node)
+
+        if node == goal:
+            path = [node]
+            while pred[path[-1]] != -1:
+                path.append(pred[path[-1]])
+            path.reverse()
+            stats.expansions, stats.pushes, stats.stale_pops, stats.peak_frontier = expansions, pushes, stale_pops, peak
+            return SearchResult.success(graph.path_labels(path), g_cost, stats)
+        if budget is not None and budget.exceeded(expansions):
+            status = "CUTOFF"
+            break
+
+        expansions += 1
+
+        for e in range(offsets[node], offsets[node + 1]):
+            neighbor = targets[e]
+            f_cost = g_cost + weights[e]
+            if f_cost < best_cost.get(neighbor, inf):
+                best_cost[neighbor] = f_cost
+                pred[neighbor] = node
+                heappush(p_queue, (f_cost, neighbor))
+                pushes += 1
+        if len(p_queue) > peak:
+            peak = len(p_queue)
+
+    stats.expansions, stats.pushes, stats.stale_pops, stats.peak_frontier = expansions, pushes, stale_pops, peak
+    return SearchResult.failure(stats, status=status)
+
+def _dijkstra_problem(problem, source, budget=None):
+    stats = SearchStats()
+    is_goal, successors = problem.is_goal, problem.successors
+    best_cost = {source: 0.0}
+    pred = {source: None}
+    settled = set()
+    counter = count()
+    p_queue = [(0.0, next(counter), source)]
+    stats.pushes = stats.peak_frontier = 1
+
+    while p_queue:
+        g_cost, _, node = heapq.heappop(p_queue)
+        if node in settled:
+            stats.stale_pops += 1
+            continue
+        settled.add(node)
+
+        if is_goal(node):
+            path = [node]
+            while pred[path[-1]] is not None:
+                path.append(pred[path[-1]])
+            path.reverse()
+            return SearchResult.success(path, g_cost, stats)
+        if budget is not None and budget.exceeded(stats.expansions):
+            return SearchResult.failure(stats, status="CUTOFF")
+
+        stats.expansions += 1
+
+        for neighbor, step_cost in successors(node):
+            if step_cost < 0:
+                raise ValueError("Uniform Cost Search requires non-negative edge costs.")
+            f_cost = g_cost + step_cost
             if f_cost < best_cost.get(neighbor, float('inf')):
                 best_cost[neighbor] = f_cost
-                heapq.heappush(p_queue, (f_cost, neighbor, found_path + [neighbor]))
+                pred[neighbor] = node
+                heapq.heappush(p_queue, (f_cost, next(counter), neighbor))
+                stats.pushes += 1
+        if len(p_queue) > stats.peak_frontier:
+            stats.peak_frontier = len(p_queue)
 
-    return float('inf'), None
+    return SearchResult.failure(stats)
 
 
 if __name__ == "__main__":
@@ -57,5 +304,9 @@ if __name__ == "__main__":
         'F': [('G', 2)],
         'G': []
     }
-    cost, path = uniform_cost_search(graph1, "A", "G")
-    print(f"Optimal path: {path}\nTotal cost: {cost}")
\ No newline at end of file
+    result = uniform_cost_search(graph1, "A", "G")
+    print(f"Optimal path: {result.path}\nTotal cost: {result.cost}\nStats: {result.stats}")
+
+    tree = shortest_path_tree(graph2, "A")
+    for node in graph2:
+        print(f"A -> {node}: cost {tree.cost(node)}, path {tree.path(node)}")
\ No newline at end of file
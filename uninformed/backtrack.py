@@ -1,30 +1,34 @@
-from tabulate import tabulate
-
+from core.results import SearchResult, SearchStats
+from core.tracing import TableTracer
 from graphs import graph2, graph6
 
 
-def backtrack(graph, goal, start = None):
+def backtrack(graph, goal, start = None, tracer = None):
     """
-    Perform Depth-First Search (DFS) on a graph while logging each iteration.
+    Perform Depth-First Search (DFS) on a graph, optionally tracing each iteration.
 
     This implementation is a variation of DFS that keeps track of:
     - SL (Search List): Tracks the current path from start to goal. Used for backtracking.
     - NSL (Next Search List): Queue of states to explore next. Maintains a search frontier.
     - DE (Dead Ends): States that have been fully explored and found unproductive.
     - CS (Current State): The node being processed at the current step.
-    - Iteration: Each iteration is recorded and displayed in a table.
+    - Iteration: Each iteration is reported to ``tracer`` when one is given.
 
     Args:
         graph (dict): Adjacency list representation of the graph.
                       Example: {"A": ["B", "C"], "B": ["D"]}
         goal: The target node to search for.
         start: The start node. If not provided, the first node in the graph is used.
+        tracer (Tracer): Optional `core.tracing.Tracer`, e.g. `TableTracer(sep="")`
+                         for the original grid table.
 
     Returns:
-        str|list: A list representation of the path found (`[nodes...]`)
-             or string "FAIL" if the goal cannot be reached.
+        SearchResult: status "SUCCESS" with the path found (start first; SL is
+                      the same path reversed), or status "FAIL" if the goal cannot
+                      be reached.
     """
-    if not graph.keys(): return "FAIL"
+    stats = SearchStats()
+    if not graph.keys(): return SearchResult.failure(stats)
     if not start: start = list(graph.keys())[0]
 
     SL = [start]
@@ -32,20 +36,19 @@ def backtrack(graph, goal, start = None):
     DE = []
     CS = start
     iteration = 0
-    log = []
-    
-    def states(s): return "[" + "".join(s) + "]"
+    stats.pushes = stats.peak_frontier = 1
 
     while NSL:
-        log.append([iteration, CS, states(SL), states(NSL), states(DE)])
+        if tracer is not None: tracer.record(iteration, CS=CS, SL=SL, NSL=NSL, DE=DE)
         iteration += 1
 
         if CS == goal:
-            print(tabulate(log, headers=["Iter", "CS", "SL", "NSL", "DE"], tablefmt="grid"))
-            print("Path:", " -> ".join(SL[::-1]))
-            return SL
+            result = SearchResult.success(SL[::-1], len(SL) - 1, stats)
+            if tracer is not None: tracer.finish(result)
+            return result
 
         # Children of CS excluding nodes already on DE, SL, and NSL
+        stats.expansions += 1
         children = []
         for child in graph.get(CS, []):
             if child not in SL and child not in NSL and child not in DE:
@@ -62,12 +65,18 @@ def backtrack(graph, goal, start = None):
             NSL = children + NSL
             CS = NSL[0]
             SL.insert(0, CS)
+            stats.pushes += len(children)
+            stats.peak_frontier = max(stats.peak_frontier, len(NSL))
 
-    log.append([iteration, '', states(SL), states(NSL), states(DE)])
-    print(tabulate(log, headers=["Iter", "CS", "SL", "NSL", "DE"], tablefmt="grid"))
-    return "FAIL"
+    result = SearchResult.failure(stats)
+    if tracer is not None:
+        tracer.record(iteration, CS='', SL=SL, NSL=NSL, DE=DE)
+        tracer.finish(result)
+    return result
 
 
 if __name__ == '__main__':
-    result = backtrack(graph6, 'P')
-    print("Result:", result)
+    result = backtrack(graph6, 'P', tracer=TableTracer(sep=""))
+    print("Result:", result.status)
+    if result.found:
+        print("Path:", " -> ".join(result.path))
@@ -0,0 +1,184 @@
+import heapq
+from itertools import count
+
+from core.results import SearchResult, SearchStats
+from graphs import graph2, graph8
+from graphs.compiled import CompiledGraph
+from graphs.path_costs import g_costs8
+from graphs.reverse import reverse_adjacency
+
+
+def bidirectional_search(graph, start, goal):
+    """
+    Bidirectional breadth-first search on an unweighted directed graph.
+
+    Grows one BFS layer at a time from whichever side has the smaller frontier,
+    forward from ``start`` over ``graph`` and backward from ``goal`` over its
+    (cached) reverse adjacency. When a layer touches the other side the whole
+    layer is finished and the shortest meeting is kept, so the path returned has
+    the fewest edges. Explores roughly O(b^(d/2)) nodes instead of O(b^d).
+
+    Args:
+        graph (dict | CompiledGraph): Adjacency list mapping a node -> list of neighbors.
+        start: The start node.
+        goal: The goal node.
+
+    Returns:
+        SearchResult: status "SUCCESS" with the path from start to goal and its length
+        in edges, or status "FAIL"; expansions count nodes of both searches.
+    """
+    stats = SearchStats()
+    if start == goal: return SearchResult.success([start], 0, stats)
+    if start not in graph: return SearchResult.failure(stats)
+
+    if isinstance(graph, CompiledGraph):
+        if goal not in graph: return SearchResult.failure(stats)
+        forward, backward = graph.neighbors, graph.reverse().neighbors
+        s, t = graph.id_of(start), graph.id_of(goal)
+    else:
+        reverse = reverse_adjacency(graph)
+        forward = lambda node: graph.get(node, [])
+        backward = lambda node: reverse.get(node, [])
+        s, t = start, goal
+
+    # parent pointers double as visited sets; depth is needed to rank meetings
+    parent_f, parent_b = {s: None}, {t: None}
+    depth_f, depth_b = {s: 0}, {t: 0}
+    frontier_f, frontier_b = [s], [t]
+    stats.pushes = stats.peak_frontier = 2
+
+    while frontier_f and frontier_b:
+        stats.peak_frontier = max(stats.peak_frontier, len(frontier_f) + len(frontier_b))
+        if len(frontier_f) <= len(frontier_b):
+            stats.expansions += len(frontier_f)
+            frontier_f, meet = _expand_layer(frontier_f, forward, parent_f, depth_f, depth_b)
+            stats.pushes += len(frontier_f)
+        else:
+            stats.expansions += len(frontier_b)
+            frontier_b, meet = _expand_layer(frontier_b, backward, parent_b, depth_b, depth_f)
+            stats.pushes += len(frontier_b)
+        if meet is not None:
+            path = _join(parent_f, parent_b, meet)
+            if isinstance(graph, CompiledGraph):
+                path = graph.path_labels(path)
+            return SearchResult.success(path, len(path) - 1, stats)
+
+    return SearchResult.failure(stats)
+
+
+def _expand_layer(frontier, neighbors, parent, depth, other_depth):
+    next_frontier = []
+    meet, best = None, None
+    for node in frontier:
+        d = depth[node] + 1
+        for child in neighbors(node):
+            if child in parent:
+                continue
+            parent[child] = node
+            depth[child] = d
+            next_frontier.append(child)
+            if child in other_depth and (best is None or d + other_depth[child] < best):
+                meet, best = child, d + other_depth[child]
+    return next_frontier, meet
+
+
+def bidirectional_uniform_cost_search(graph, start, goal):
+    """
+    Bidirectional Uniform Cost Search (Dijkstra) on a graph with non-negative edge costs.
+
+    Alternates between a forward search from ``start`` and a backward search from
+    ``goal`` over the (cached) reverse adjacency, always advancing the side whose
+    queue top is cheaper. ``mu`` tracks the cheapest start-goal path seen through
+    any edge joining the two searches; the search stops once the two queue tops
+    together cost at least ``mu``, at which point no cheaper path can exist.
+
+    Args:
+        graph: Adjacency list mapping a node -> list of (neighbor, cost) pairs,
+            or a `CompiledGraph`.
+        start: Starting node.
+        goal: Target node to find.
+
+    Returns:
+        SearchResult: status "SUCCESS" with the cheapest path and its cost, or "FAIL".
+    """
+    stats = SearchStats()
+    if start == goal: return SearchResult.success([start], 0.0, stats)
+    if start not in graph: return SearchResult.failure(stats)
+
+    if isinstance(graph, CompiledGraph):
+        if goal not in graph: return SearchResult.failure(stats)
+        forward, backward = graph.edges, graph.reverse().edges
+        s, t = graph.id_of(start), graph.id_of(goal)
+    else:
+        reverse = reverse_adjacency(graph, weighted=True)
+        forward = lambda node: graph.get(node, [])
+        backward = lambda node: reverse.get(node, [])
+        s, t = start, goal
+
+    counter = count()
+    dist_f, dist_b = {s: 0.0}, {t: 0.0}
+    parent_f, parent_b = {s: None}, {t: None}
+    settled_f, settled_b = set(), set()
+    queue_f, queue_b = [(0.0, next(counter), s)], [(0.0, next(counter), t)]
+    mu, meet = float('inf'), None
+    stats.pushes = stats.peak_frontier = 2
+
+    while queue_f and queue_b:
+        if queue_f[0][0] + queue_b[0][0] >= mu:
+            break
+
+        if queue_f[0][0] <= queue_b[0][0]:
+            queue, neighbors, dist, parent, settled, other = queue_f, forward, dist_f, parent_f, settled_f, dist_b
+        else:
+            queue, neighbors, dist, parent, settled, other = queue_b, backward, dist_b, parent_b, settled_b, dist_f
+
+        g_cost, _, node = heapq.heappop(queue)
+        if node in settled:
+            stats.stale_pops += 1
+            continue
+        settled.add(node)
+        stats.expansions += 1
+
+        for neighbor, edge_cost in neighbors(node):
+            if edge_cost < 0:
+                raise ValueError("Uniform Cost Search requires non-negative edge costs.")
+
+            new_cost = g_cost + edge_cost
+            if new_cost < dist.get(neighbor, float('inf')):
+                dist[neighbor] = new_cost
+                parent[neighbor] = node
+                heapq.heappush(queue, (new_cost, next(counter), neighbor))
+                stats.pushes += 1
+            if neighbor in other and dist[neighbor] + other[neighbor] < mu:
+                mu, meet = dist[neighbor] + other[neighbor], neighbor
+        stats.peak_frontier = max(stats.peak_frontier, len(queue_f) + len(queue_b))
+
+    if meet is None:
+        return SearchResult.failure(stats)
+    path = _join(parent_f, parent_b, meet)
+    if isinstance(graph, CompiledGraph):
+        path = graph.path_labels(path)
+    return SearchResult.success(path, mu, stats)
+
+
+def _join(parent_f, parent_b, meet):
+    """Path start -> meet from forward parents followed by meet -> goal from backward parents."""
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = parent_f[node]
+    path.reverse()
+    node = parent_b[meet]
+    while node is not None:
+        path.append(node)
+        node = parent_b[node]
+    return path
+
+
+if __name__ == '__main__':
+    print("Bidirectional BFS:", bidirectional_search(graph2, 'A', 'U').path)
+
+    weighted8 = {node: [(child, g_costs8[(node, child)]) for child in children] for node, children in graph8.items()}
+    result = bidirectional_uniform_cost_search(weighted8, 'A', 'J')
+    print(f"Bidirectional UCS: {result.path} (cost {result.cost})")
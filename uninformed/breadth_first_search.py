@@ -1,57 +1,209 @@
-from tabulate import tabulate
+from array import array
+from collections import deque
 
+from core.problem import Problem
+from core.results import SearchResult, SearchStats
+from core.tracing import TableTracer
 from graphs import graph2
+from graphs.compiled import CompiledGraph
 
 
-def breadth_first_search(graph, goal, start = None):
+def breadth_first_search(graph, goal, start = None, tracer = None):
     """
     Performs a breadth-first search on a graph to find a path from a start node to a goal node.
 
     Args:
-        graph (dict): The graph to search, represented as an adjacency list.
+        graph (dict | Problem): The graph to search, represented as an adjacency list,
+            or a `core.problem.Problem`, which is searched with `breadth_first_path`
+            (goal ignored, no tracing).
         goal: The goal node.
         start: The start node. If not provided, the first node in the graph is used.
+        tracer (Tracer): Optional `core.tracing.Tracer` receiving the X/Open/Closed
+            lists every iteration, e.g. `TableTracer()` for the grid table.
 
     Returns:
-        tuple: A tuple containing the status ("SUCCESS" or "FAIL") and the path from the start to the goal node as a list. If the goal is not found, the path is None.
+        SearchResult: status "SUCCESS" or "FAIL", the path from start to goal, its
+        length in edges, the counters, and the closed list as ``visited_order``.
     """
-    if not graph.keys(): return "FAIL"
+    if isinstance(graph, Problem): return breadth_first_path(graph, goal, start)
+    stats = SearchStats()
+    if not graph.keys(): return SearchResult.failure(stats)
     if not start: start = list(graph.keys())[0]
     
     open_list = [start] # queue
     closed_list = []
+    parent = {start: None}
     X = None
     iteration = 0
-    log = []
-    status = "FAIL"
-
-    def states(s): return "[" + ",".join(s[::-1]) + "]"
+    result = None
+    stats.pushes = stats.peak_frontier = 1
 
     while open_list:
-        log.append([iteration, X, states(open_list), states(closed_list)])
+        if tracer is not None: tracer.record(iteration, X=X, Open=open_list, Closed=closed_list)
         iteration += 1
         X = open_list.pop(0)
 
         closed_list.append(X)
 
         if X == goal:
-            status = "SUCCESS"
+            path = _walk_parents(parent, X)
+            result = SearchResult.success(path, len(path) - 1, stats, visited_order=closed_list)
             break
 
+        stats.expansions += 1
         children = []
         for child in graph.get(X, []):
             if child not in open_list and child not in closed_list:
                 children.append(child)
+                parent[child] = X
 
         open_list.extend(children)
+        stats.pushes += len(children)
+        stats.peak_frontier = max(stats.peak_frontier, len(open_list))
+
+    if result is None:
+        result = SearchResult.failure(stats, visited_order=closed_list)
+    if tracer is not None:
+        tracer.record(iteration + 1, X=X, Open=open_list, Closed=closed_list)
+        tracer.finish(result)
+    return result
+
+
+def breadth_first_path(graph, goal, start = None, budget=None):
+    """
+    Production breadth-first search: O(V + E) time, no logging.
+
+    Uses a deque as the FIFO queue and parent pointers as the visited set, so each
+    node is enqueued at most once and the shortest (fewest edges) path is rebuilt
+    by walking parents back from the goal. A `CompiledGraph` is searched on its
+    integer arrays with a bytearray visited bitmap.
+
+    Args:
+        graph (dict | CompiledGraph | Problem): The graph to search, represented as an
+            adjacency list, or a `core.problem.Problem` whose states are generated as
+            they are expanded; its ``is_goal`` replaces ``goal``.
+        goal: The goal node.
+        start: The start node. If not provided, the first node in the graph (or the
+            problem's initial state) is used.
+        budget: Optional `core.results.Budget`; the search stops with "CUTOFF" when spent.
+
+    Returns:
+        SearchResult: status "SUCCESS", "FAIL" or "CUTOFF", the path from start to goal
+        and its length in edges, with the counters.
+    """
+    stats = SearchStats()
+    if isinstance(graph, Problem):
+        return _breadth_first_problem(graph, graph.initial if start is None else start, stats, budget)
+    if not graph.keys(): return SearchResult.failure(stats)
+    if start is None: start = list(graph.keys())[0]
+    if start == goal: return SearchResult.success([start], 0, stats)
+
+    if isinstance(graph, CompiledGraph):
+        if start not in graph or goal not in graph: return SearchResult.failure(stats)
+        status, path = _breadth_first_ids(graph, graph.id_of(start), graph.id_of(goal), stats, budget)
+        if path is None: return SearchResult.failure(stats, status=status)
+        return SearchResult.success(graph.path_labels(path), len(path) - 1, stats)
+
+    parent = {start: None}
+    queue = deque([start])
+    pushes, peak = 1, 1
+    while queue:
+        if len(queue) > peak: peak = len(queue)
+        if budget is not None and budget.exceeded(stats.expansions):
+            stats.pushes, stats.peak_frontier = pushes, peak
+            return SearchResult.failure(stats, status="CUTOFF")
+        X = queue.popleft()
+        stats.expansions += 1
+        for child in graph.get(X, []):
+            if child in parent:
+                continue
+            parent[child] = X
+            if child == goal:
+                stats.pushes, stats.peak_frontier = pushes, peak
+                path = _walk_parents(parent, goal)
+                return SearchResult.success(path, len(path) - 1, stats)
+            queue.append(child)
+            pushes += 1
+    stats.pushes, stats.peak_frontier = pushes, peak
+    return SearchResult.failure(stats)
+
+
+def _breadth_first_ids(graph, start, goal, stats, budget=None):
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.num_nodes)
+    parent = array('q', bytes(8 * graph.num_nodes))
+    visited[start] = 1
+    queue = deque([start])
+    expansions, pushes, peak = 0, 1, 1
+    status, path = "FAIL", None
+    while queue:
+        if len(queue) > peak: peak = len(queue)
+        if budget is not None and budget.exceeded(expansions):
+            status = "CUTOFF"
+            break
+        X = queue.popleft()
+        expansions += 1
+        for e in range(offsets[X], offsets[X + 1]):
+            child = targets[e]
+            if visited[child]:
+                continue
+            visited[child] = 1
+            parent[child] = X
+            if child == goal:
+                path = [goal]
+                while child != start:
+                    child = parent[child]
+                    path.append(child)
+                path.reverse()
+                status = "SUCCESS"
+                queue.clear()
+                break
+            queue.append(child)
+            pushes += 1
+    stats.expansions, stats.pushes, stats.peak_frontier = expansions, pushes, peak
+    return status, path
+
+
+def _breadth_first_problem(problem, start, stats, budget=None):
+    if problem.is_goal(start): return SearchResult.success([start], 0, stats)
+    is_goal, successors = problem.is_goal, problem.successors
+    parent = {start: None}
+    queue = deque([start])
+    pushes, peak = 1, 1
+    while queue:
+        if len(queue) > peak: peak = len(queue)
+        if budget is not None and budget.exceeded(stats.expansions):
+            stats.pushes, stats.peak_frontier = pushes, peak
+            return SearchResult.failure(stats, status="CUTOFF")
+        X = queue.popleft()
+        stats.expansions += 1
+        for child, _ in successors(X):
+            if child in parent:
+                continue
+            parent[child] = X
+            if is_goal(child):
+                stats.pushes, stats.peak_frontier = pushes, peak
+                path = _walk_parents(parent, child)
+                return SearchResult.success(path, len(path) - 1, stats)
+            queue.append(child)
+            pushes += 1
+    stats.pushes, stats.peak_frontier = pushes, peak
+    return SearchResult.failure(stats)
+
 
-    log.append([iteration + 1, X, states(open_list), states(closed_list)])
-    print(tabulate(log, headers=["Iter", "X", "Open", "Closed"], tablefmt="grid"))
-    if status == 'SUCCESS':
-        print("Path:", " -> ".join(closed_list))
-    return status, None if status == "FAIL" else closed_list
+def _walk_parents(parent, node):
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
 
 
 if __name__ == '__main__':
-    status, _ = breadth_first_search(graph2, 'G')
-    print("Result:", status)
\ No newline at end of file
+    result = breadth_first_search(graph2, 'G', tracer=TableTracer())
+    print("Result:", result.status)
+    print("Expanded:", " -> ".join(result.visited_order))
+    print("Path:", result.path)
+    shortest = breadth_first_path(graph2, 'U')
+    print("Shortest path:", shortest.path, shortest.stats)
@@ -0,0 +1,415 @@
+import random
+from collections import deque
+
+from core.results import SearchResult, SearchStats
+
+
+class CSP:
+    """
+    Binary constraint satisfaction problem with bitset domains.
+
+    Every variable draws its values from one shared ``values`` list; a domain is
+    an int whose bit i is set while ``values[i]`` is still possible, so removing
+    values, testing for a wipe-out and counting what is left are single integer
+    operations. A constraint between x and y is stored as a pair of *conflict
+    functions*: ``conflict_xy(i)`` returns the bitmask of y's values that are
+    incompatible with x = values[i] (and ``conflict_yx`` the other way round).
+    Forward checking is then ``domain[y] &= ~conflict_xy(i)``.
+
+    Build a problem with `add_variable` and `add_constraint` / `all_different`
+    (or `add_conflict` for a hand-written mask function), then call `solve`.
+    """
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.index = {value: i for i, value in enumerate(self.values)}
+        self.variables = []
+        self.var_index = {}
+        self.domains = []
+        self.neighbors = []  # neighbors[x] = [(y, conflict_xy, conflict_yx), ...]
+        self._different = set()
+
+    def add_variable(self, name, domain=None):
+        """Add ``name`` with the given subset of ``values`` (all of them by default)."""
+        if name in self.var_index:
+            raise ValueError(f"Duplicate variable {name!r}")
+        if domain is None:
+            bits = (1 << len(self.values)) - 1
+        else:
+            bits = 0
+            for value in domain:
+                bits |= 1 << self.index[value]
+        self.var_index[name] = len(self.variables)
+        self.variables.append(name)
+        self.domains.append(bits)
+        self.neighbors.append([])
+
+    def add_conflict(self, x, y, conflict_xy, conflict_yx):
+        """Constrain x and y by conflict functions value index -> bitmask (see the class docstring)."""
+        i, j = self.var_index[x], self.var_index[y]
+        if i == j:
+            raise ValueError("Constraints must relate two different variables")
+        self.neighbors[i].append((j, conflict_xy, conflict_yx))
+        self.neighbors[j].append((i, conflict_yx, conflict_xy))
+
+    def add_constraint(self, x, y, predicate):
+        """Allow only the pairs for which ``predicate(value_of_x, value_of_y)`` is true."""
+        values, n = self.values, len(self.values)
+        table_xy = [0] * n
+        table_yx = [0] * n
+        for a in range(n):
+            for b in range(n):
+                if not predicate(values[a], values[b]):
+                    table_xy[a] |= 1 << b
+                    table_yx[b] |= 1 << a
+        self.add_conflict(x, y, table_xy.__getitem__, table_yx.__getitem__)
+
+    def all_different(self, names):
+        """Pairwise x != y over ``names``; pairs that are already constrained this way are skipped."""
+        names = list(names)
+        for k, x in enumerate(names):
+            for y in names[k + 1:]:
+                pair = (x, y) if self.var_index[x] < self.var_index[y] else (y, x)
+                if pair not in self._different:
+                    self._different.add(pair)
+                    self.add_conflict(x, y, _same_value, _same_value)
+
+    def solve(self, variable_order="mrv", value_order="lcv", inference="forward", budget=None, seed=None,
+              restart_after=None):
+        """
+        Backtracking search for one complete consistent assignment.
+
+        Runs on an explicit stack of (variable, remaining values, trail mark)
+        frames. Every domain change is pushed on a trail, so undoing a failed
+        choice just restores entries down to the frame's mark.
+
+        Args:
+            variable_order: "mrv" picks the variable with the fewest remaining
+                values, breaking ties by the most unassigned neighbors (degree);
+                "static" takes them in the order they were added.
+            value_order: "lcv" tries first the value that rules out the fewest
+                values of unassigned neighbors; "static" keeps ``values`` order.
+            inference: "none" only checks a value against assigned neighbors
+                (plain chronological backtracking); "forward" prunes neighbor
+                domains after each assignment (forward checking); "ac3" also
+                propagates those prunings to arc consistency (MAC), and
+                establishes it once before the search.
+            budget: Optional `core.results.Budget` on the number of assignments.
+            seed: Seed for breaking MRV ties at random (lowest index otherwise).
+            restart_after: With a seed and "mrv", start over with fresh tie-breaking
+                after this many assignments without a solution, allowing 1.5 times
+                as many on each restart. This cuts off the heavy tail of runs that
+                got stuck below an early bad choice (e.g. N-queens). Ignored for
+                the "static" order, where a restart would replay the same search.
+
+        Returns:
+            SearchResult: status "SUCCESS", "FAIL" (no solution) or "CUTOFF"; the
+            path is the list of (variable, value) assignments, so ``dict(result.path)``
+            is the solution. Expansions count assignments tried, stale pops count
+            backtracks and peak frontier is the deepest stack, over all restarts.
+        """
+        if variable_order not in ("mrv", "static"):
+            raise ValueError(f"Unknown variable order {variable_order!r}")
+        if value_order not in ("lcv", "static"):
+            raise ValueError(f"Unknown value order {value_order!r}")
+        if inference not in ("none", "forward", "ac3"):
+            raise ValueError(f"Unknown inference {inference!r}")
+
+        stats = SearchStats()
+        root = _Solver(self, list(self.domains))
+        if any(d == 0 for d in root.domains) or (inference == "ac3" and not root.ac3(range(len(self.variables)))):
+            return SearchResult.failure(stats)
+
+        rng = None if seed is None else random.Random(seed)
+        limit = restart_after if rng is not None and variable_order == "mrv" else None
+        while True:
+            solver = _Solver(self, list(root.domains), rng)
+            status, path = solver.search(variable_order, value_order, inference, stats, budget, limit)
+            if status != "RESTART":
+                break
+            limit = int(limit * 1.5) + 1
+
+        if status != "SUCCESS":
+            return SearchResult.failure(stats, status=status)
+        path = [(self.variables[v], self.values[a]) for v, a in path]
+        return SearchResult.success(path, len(path), stats)
+
+
+def _same_value(a):
+    return 1 << a
+
+
+def _bits(d):
+    while d:
+        low = d & -d
+        yield low.bit_length() - 1
+        d ^= low
+
+
+class _Solver:
+    """Search state of one run of `CSP.solve`, with its ordering and inference steps."""
+
+    def __init__(self, csp, domains, rng=None):
+        self.neighbors = csp.neighbors
+        self.domains = domains
+        self.assignment = [-1] * len(domains)
+        self.free_degree = [len(neighbors) for neighbors in csp.neighbors]
+        self.trail = []
+        self.rng = rng
+
+    def search(self, variable_order, value_order, inference, stats, budget, limit):
+        """Returns (status, [(variable id, value index), ...]); status "RESTART" when ``limit`` ran out."""
+        domains, assignment, trail = self.domains, self.assignment, self.trail
+        select = self.select_mrv if variable_order == "mrv" else self.select_static
+        order = self.order_lcv if value_order == "lcv" else self.order_static
+        if inference == "none":
+            infer = self.check
+        elif inference == "forward":
+            infer = self.forward_check
+        else:
+            infer = self.maintain_arc_consistency
+        if limit is not None:
+            limit += stats.expansions
+
+        var = select()
+        if var is None:
+            return "SUCCESS", []
+        frames = [(var, iter(order(var)), len(trail))]
+        stats.pushes += 1
+        stats.peak_frontier = max(stats.peak_frontier, 1)
+
+        while frames:
+            var, values, mark = frames[-1]
+            if assignment[var] != -1:
+                self.unassign(var)
+                stats.stale_pops += 1
+            while len(trail) > mark:
+                y, old = trail.pop()
+                domains[y] = old
+
+            a = next(values, None)
+            if a is None:
+                frames.pop()
+                continue
+            if budget is not None and budget.exceeded(stats.expansions):
+                return "CUTOFF", None
+            if limit is not None and stats.expansions >= limit:
+                return "RESTART", None
+
+            stats.expansions += 1
+            self.assign(var, a)
+            if not infer(var, a):
+                continue
+
+            var = select()
+            if var is None:
+                return "SUCCESS", [(v, assignment[v]) for v, _, _ in frames]
+            frames.append((var, iter(order(var)), len(trail)))
+            stats.pushes += 1
+            if len(frames) > stats.peak_frontier:
+                stats.peak_frontier = len(frames)
+
+        return "FAIL", None
+
+    def assign(self, var, a):
+        domains = self.domains
+        self.trail.append((var, domains[var]))
+        domains[var] = 1 << a
+        self.assignment[var] = a
+        free_degree = self.free_degree
+        for y, _, _ in self.neighbors[var]:
+            free_degree[y] -= 1
+
+    def unassign(self, var):
+        self.assignment[var] = -1
+        free_degree = self.free_degree
+        for y, _, _ in self.neighbors[var]:
+            free_degree[y] += 1
+
+    def select_static(self):
+        assignment = self.assignment
+        for var in range(len(assignment)):
+            if assignment[var] == -1:
+                return var
+        return None
+
+    def select_mrv(self):
+        assignment, domains, free_degree, rng = self.assignment, self.domains, self.free_degree, self.rng
+        best, best_size, best_degree, ties = None, None, -1, 0
+        for var in range(len(assignment)):
+            if assignment[var] != -1:
+                continue
+            size = domains[var].bit_count()
+            if best is not None and size > best_size:
+                continue
+            degree = free_degree[var]
+            if best is None or size < best_size or degree > best_degree:
+                best, best_size, best_degree, ties = var, size, degree, 1
+                if size == 1:
+                    break  # forced: take it without looking further
+            elif rng is not None and degree == best_degree:
+                # Reservoir sampling: each tied variable is kept with equal probability
+                ties += 1
+                if rng.randrange(ties) == 0:
+                    best = var
+        return best
+
+    def order_static(self, var):
+        return list(_bits(self.domains[var]))
+
+    def order_lcv(self, var):
+        domains, assignment = self.domains, self.assignment
+        free = [(domains[y], conflict) for y, conflict, _ in self.neighbors[var] if assignment[y] == -1]
+        ruled_out = {a: sum((d & conflict(a)).bit_count() for d, conflict in free) for a in _bits(domains[var])}
+        return sorted(ruled_out, key=ruled_out.__getitem__)
+
+    def check(self, var, a):
+        """Consistency with assigned neighbors only."""
+        assignment = self.assignment
+        for y, conflict, _ in self.neighbors[var]:
+            b = assignment[y]
+            if b != -1 and conflict(a) >> b & 1:
+                return False
+        return True
+
+    def forward_check(self, var, a, changed=None):
+        domains, assignment, trail = self.domains, self.assignment, self.trail
+        for y, conflict, _ in self.neighbors[var]:
+            if assignment[y] != -1:
+                continue
+            d = domains[y]
+            pruned = d & ~conflict(a)
+            if pruned != d:
+                if not pruned:
+                    return False
+                trail.append((y, d))
+                domains[y] = pruned
+                if changed is not None:
+                    changed.append(y)
+        return True
+
+    def maintain_arc_consistency(self, var, a):
+        changed = []
+        return self.forward_check(var, a, changed) and self.ac3(changed)
+
+    def ac3(self, queue):
+        """
+        Make every arc into an unassigned variable consistent with the domains of
+        the variables in ``queue`` (and, transitively, of everything that shrinks).
+        """
+        domains, assignment, trail, neighbors = self.domains, self.assignment, self.trail, self.neighbors
+        queue = deque(queue)
+        queued = set(queue)
+        while queue:
+            y = queue.popleft()
+            queued.discard(y)
+            dy = domains[y]
+            for z, _, conflict_zy in neighbors[y]:
+                if assignment[z] != -1:
+                    continue
+                dz = domains[z]
+                revised = dz
+                for b in _bits(dz):
+                    # z = b needs some value of y it does not conflict with
+                    if not dy & ~conflict_zy(b):
+                        revised &= ~(1 << b)
+                if revised != dz:
+                    if not revised:
+                        return False
+                    trail.append((z, dz))
+                    domains[z] = revised
+                    if z not in queued:
+                        queue.append(z)
+                        queued.add(z)
+        return True
+
+
+def sudoku(puzzle):
+    """
+    CSP for a 9x9 Sudoku.
+
+    ``puzzle`` is an 81-character string read row by row (digits, with "0" or
+    "." for blanks) or a 9x9 list of ints with 0 for blanks. Variables are
+    (row, column) pairs.
+    """
+    if isinstance(puzzle, str):
+        cells = [0 if ch in "0." else int(ch) for ch in puzzle if not ch.isspace()]
+    else:
+        cells = [value for row in puzzle for value in row]
+    if len(cells) != 81:
+        raise ValueError("A Sudoku needs 81 cells")
+
+    csp = CSP(range(1, 10))
+    for k, given in enumerate(cells):
+        csp.add_variable(divmod(k, 9), [given] if given else None)
+    for i in range(9):
+        csp.all_different([(i, c) for c in range(9)])
+        csp.all_different([(r, i) for r in range(9)])
+        top, left = 3 * (i // 3), 3 * (i % 3)
+        csp.all_different([(top + r, left + c) for r in range(3) for c in range(3)])
+    return csp
+
+
+def solve_sudoku(puzzle, **options):
+    """Solved grid as a 9x9 list of ints, or None. ``options`` go to `CSP.solve`."""
+    result = sudoku(puzzle).solve(**options)
+    if not result.found:
+        return None
+    solution = dict(result.path)
+    return [[solution[(r, c)] for c in range(9)] for r in range(9)]
+
+
+def n_queens(n):
+    """CSP with one variable per row whose value is the column of that row's queen."""
+    csp = CSP(range(n))
+    for row in range(n):
+        csp.add_variable(row)
+    # Rows k apart clash on the same column and on both diagonals; one mask
+    # function per distance serves every pair and both directions
+    conflicts = [None] + [_queen_conflict(k) for k in range(1, n)]
+    for x in range(n):
+        for y in range(x + 1, n):
+            conflict = conflicts[y - x]
+            csp.add_conflict(x, y, conflict, conflict)
+    return csp
+
+
+def _queen_conflict(k):
+    return lambda a: (1 << a) | (1 << (a + k)) | ((1 << a) >> k)
+
+
+def solve_n_queens(n, **options):
+    """
+    Column of the queen in each row, or None.
+
+    Defaults to MRV with forward checking and randomized restarts, which keeps
+    N in the hundreds to roughly N assignments.
+    """
+    options.setdefault("value_order", "static")
+    options.setdefault("inference", "forward")
+    options.setdefault("seed", 0)
+    options.setdefault("restart_after", 2 * n)
+    result = n_queens(n).solve(**options)
+    if not result.found:
+        return None
+    solution = dict(result.path)
+    return [solution[row] for row in range(n)]
+
+
+if __name__ == '__main__':
+    puzzle = ("53..7...."
+              "6..195..."
+              ".98....6."
+              "8...6...3"
+              "4..8.3..1"
+              "7...2...6"
+              ".6....28."
+              "...419..5"
+              "....8..79")
+    result = sudoku(puzzle).solve()
+    print("Sudoku:", result.status, result.stats)
+    for row in solve_sudoku(puzzle):
+        print(" ".join(map(str, row)))
+
+    columns = solve_n_queens(12)
+    print("12 queens:", columns)
@@ -1,54 +1,153 @@
-from tabulate import tabulate
+from array import array
 
+from core.results import SearchResult, SearchStats
+from core.tracing import TableTracer
 from graphs import graph2
+from graphs.compiled import CompiledGraph
 
 
-def depth_first_search(graph, start, goal):
+def depth_first_search(graph, start, goal, tracer=None):
     """
     Performs a depth-first search (DFS) on a graph from a start node to a goal node.
     DFS is implemented using a stack (open_list) to explore nodes and a closed_list
-    to keep track of inspected nodes. The algorithm logs each iteration's state and
-    prints a tabulated representation of open and closed lists.
+    to keep track of inspected nodes. When a tracer is given, the state of the open
+    and closed lists is reported to it on every iteration.
 
     :param graph: A dictionary representing the graph where the keys are node identifiers
         and the values are lists of neighboring nodes.
     :param start: The starting node of the search.
     :param goal: The target node for the search.
-    :return: A tuple containing the status of the search ('SUCCESS' or 'FAIL') and the
-        path to the goal if found, or None if no path exists.
+    :param tracer: Optional `core.tracing.Tracer`, e.g. `TableTracer()` for the grid table.
+    :return: A `SearchResult` with status 'SUCCESS' or 'FAIL', the path from start to
+        goal and its length in edges, the counters, and the closed list as ``visited_order``.
     """
+    stats = SearchStats()
     open_list = [start] # stack
     closed_list = []
+    parent = {start: None}
     X = None
     iteration = 0
-    log = []
-    status = "FAIL"
-
-    def states(s): return "[" + ",".join(s) + "]"
+    result = None
+    stats.pushes = stats.peak_frontier = 1
 
     while open_list:
-        log.append([iteration, X, states(open_list), states(closed_list)])
+        if tracer is not None: tracer.record(iteration, X=X, Open=open_list, Closed=closed_list)
         iteration += 1
         X = open_list.pop(0)
 
         closed_list.append(X)
 
         if X == goal:
-            status = "SUCCESS"
+            path = []
+            node = X
+            while node is not None:
+                path.append(node)
+                node = parent[node]
+            path.reverse()
+            result = SearchResult.success(path, len(path) - 1, stats, visited_order=closed_list)
             break
 
+        stats.expansions += 1
         children = []
         for child in graph.get(X, []):
             if child not in open_list and child not in closed_list:
                 children.append(child)
+                parent[child] = X
 
         open_list = children + open_list
+        stats.pushes += len(children)
+        stats.peak_frontier = max(stats.peak_frontier, len(open_list))
+
+    if result is None:
+        result = SearchResult.failure(stats, visited_order=closed_list)
+    if tracer is not None:
+        tracer.record(iteration + 1, X=X, Open=open_list, Closed=closed_list)
+        tracer.finish(result)
+    return result
+
+
+def depth_first_path(graph, start, goal):
+    """
+    Production depth-first search: O(V + E) time, no logging.
+
+    Expands nodes in the same order as `depth_first_search` (first child first, a
+    node already on the frontier is not pushed again), but keeps the frontier as a
+    real LIFO stack and the visited set as parent pointers instead of rebuilding
+    lists. A `CompiledGraph` is searched on its integer arrays with a bytearray
+    visited bitmap.
+
+    :param graph: A dictionary (or `CompiledGraph`) mapping a node to its neighbors.
+    :param start: The starting node of the search.
+    :param goal: The target node for the search.
+    :return: A `SearchResult` with status 'SUCCESS' and the path from start to goal,
+        or status 'FAIL'.
+    """
+    stats = SearchStats()
+    if isinstance(graph, CompiledGraph):
+        if start not in graph or goal not in graph: return SearchResult.failure(stats)
+        path = _depth_first_ids(graph, graph.id_of(start), graph.id_of(goal), stats)
+        if path is None: return SearchResult.failure(stats)
+        return SearchResult.success(graph.path_labels(path), len(path) - 1, stats)
+
+    parent = {start: None}
+    stack = [start]
+    pushes, peak = 1, 1
+    while stack:
+        if len(stack) > peak: peak = len(stack)
+        X = stack.pop()
+        if X == goal:
+            stats.pushes, stats.peak_frontier = pushes, peak
+            path = []
+            while X is not None:
+                path.append(X)
+                X = parent[X]
+            path.reverse()
+            return SearchResult.success(path, len(path) - 1, stats)
+
+        stats.expansions += 1
+        children = []
+        for child in graph.get(X, []):
+            if child not in parent:
+                parent[child] = X
+                children.append(child)
+        stack.extend(reversed(children))
+        pushes += len(children)
+    stats.pushes, stats.peak_frontier = pushes, peak
+    return SearchResult.failure(stats)
+
+
+def _depth_first_ids(graph, start, goal, stats):
+    offsets, targets = graph.offsets, graph.targets
+    visited = bytearray(graph.num_nodes)
+    parent = array('q', bytes(8 * graph.num_nodes))
+    visited[start] = 1
+    stack = [start]
+    expansions, pushes, peak = 0, 1, 1
+    path = None
+    while stack:
+        if len(stack) > peak: peak = len(stack)
+        X = stack.pop()
+        if X == goal:
+            path = [X]
+            while X != start:
+                X = parent[X]
+                path.append(X)
+            path.reverse()
+            break
 
-    log.append([iteration + 1, X, states(open_list), states(closed_list)])
-    print(tabulate(log, headers=["Iter", "X", "Open", "Closed"], tablefmt="grid"))
-    print("Results:", status if status == "FAIL" else " -> ".join(closed_list))
-    return status, None if status == "FAIL" else closed_list
+        expansions += 1
+        for e in range(offsets[X + 1] - 1, offsets[X] - 1, -1):
+            child = targets[e]
+            if not visited[child]:
+                visited[child] = 1
+                parent[child] = X
+                stack.append(child)
+                pushes += 1
+    stats.expansions, stats.pushes, stats.peak_frontier = expansions, pushes, peak
+    return path
 
 
 if __name__ == '__main__':
-    result = depth_first_search(graph2, 'A', 'G')
+    result = depth_first_search(graph2, 'A', 'G', tracer=TableTracer())
+    print("Results:", result.status if not result.found else " -> ".join(result.visited_order))
+    print("Path:", depth_first_path(graph2, 'A', 'G').path)
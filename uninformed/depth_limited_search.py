@@ -0,0 +1,114 @@
+from core.results import SearchResult, SearchStats
+from graphs import graph2, graph6
+from graphs.compiled import CompiledGraph
+
+_DONE = object()
+
+
+def depth_limited_search(graph, start, goal, limit):
+    """
+    Depth-first search that never goes deeper than ``limit`` edges below ``start``.
+
+    Runs on an explicit stack of neighbor iterators rather than Python recursion,
+    and only avoids revisiting nodes on the current path, so memory is O(limit)
+    whatever the size of the graph.
+
+    :param graph: A dictionary (or `CompiledGraph`) mapping a node to its neighbors.
+    :param start: The starting node of the search.
+    :param goal: The target node for the search.
+    :param limit: Maximum depth; nodes at this depth are goal-tested but not expanded.
+    :return: A `SearchResult` whose status is 'SUCCESS' with the path from start to
+        goal, 'CUTOFF' if the limit stopped the search before the space was
+        exhausted, or 'FAIL' if the goal is unreachable.
+    """
+    stats = SearchStats()
+    if isinstance(graph, CompiledGraph):
+        if start not in graph or goal not in graph:
+            return SearchResult.success([start], 0, stats) if start == goal else SearchResult.failure(stats)
+        status, path = _depth_limited(graph.neighbors, graph.id_of(start), graph.id_of(goal), limit, stats)
+        if path is not None:
+            path = graph.path_labels(path)
+    else:
+        status, path = _depth_limited(lambda node: graph.get(node, []), start, goal, limit, stats)
+    if path is None:
+        return SearchResult.failure(stats, status=status)
+    return SearchResult.success(path, len(path) - 1, stats)
+
+
+def _depth_limited(neighbors, start, goal, limit, stats):
+    if start == goal:
+        return "SUCCESS", [start]
+    if limit <= 0:
+        return ("CUTOFF" if len(neighbors(start)) else "FAIL"), None
+
+    path = [start]
+    on_path = {start}
+    stack = [iter(neighbors(start))]
+    stats.expansions = stats.pushes = stats.peak_frontier = 1
+    cutoff = False
+
+    while stack:
+        child = next(stack[-1], _DONE)
+        if child is _DONE:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+        if child in on_path:
+            continue
+        if child == goal:
+            path.append(child)
+            return "SUCCESS", path
+
+        children = neighbors(child)
+        if len(path) < limit:
+            path.append(child)
+            on_path.add(child)
+            stack.append(iter(children))
+            stats.expansions += 1
+            stats.pushes += 1
+            stats.peak_frontier = max(stats.peak_frontier, len(stack))
+        elif len(children):
+            cutoff = True
+
+    return ("CUTOFF" if cutoff else "FAIL"), None
+
+
+def iterative_deepening_search(graph, start, goal, max_depth=None):
+    """
+    Iterative Deepening DFS: `depth_limited_search` with limits 0, 1, 2, ...
+
+    Finds the shallowest goal like BFS while keeping DFS's O(depth) memory. The
+    expansion count of each iteration is returned so the cost of re-expanding
+    the upper levels is visible.
+
+    :param graph: A dictionary (or `CompiledGraph`) mapping a node to its neighbors.
+    :param start: The starting node of the search.
+    :param goal: The target node for the search.
+    :param max_depth: Optional deepest limit to try; by default deepen until the
+        goal is found or a limit no longer cuts anything off.
+    :return: A `SearchResult` whose status is 'SUCCESS', 'CUTOFF' (max_depth reached)
+        or 'FAIL'; counters are summed over all iterations and ``iterations`` holds
+        the expansions of each one.
+    """
+    stats = SearchStats()
+    expansions_per_iteration = []
+    limit = 0
+    while max_depth is None or limit <= max_depth:
+        result = depth_limited_search(graph, start, goal, limit)
+        expansions_per_iteration.append(result.stats.expansions)
+        stats.expansions += result.stats.expansions
+        stats.pushes += result.stats.pushes
+        stats.peak_frontier = max(stats.peak_frontier, result.stats.peak_frontier)
+        if result.status == "SUCCESS":
+            return SearchResult.success(result.path, result.cost, stats, iterations=expansions_per_iteration)
+        if result.status != "CUTOFF":
+            return SearchResult.failure(stats, iterations=expansions_per_iteration)
+        limit += 1
+    return SearchResult.failure(stats, status="CUTOFF", iterations=expansions_per_iteration)
+
+
+if __name__ == '__main__':
+    print("DLS (limit 2):", depth_limited_search(graph2, 'A', 'P', 2))
+    print("DLS (limit 3):", depth_limited_search(graph2, 'A', 'P', 3))
+    result = iterative_deepening_search(graph6, 'A', 'P')
+    print("IDDFS:", result.status, result.path, "expansions per iteration:", result.iterations)